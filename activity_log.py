@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+from datetime import date, datetime, timedelta
+
+import metrics
+import store_utils
+
+# ---------------- Activity log config ----------------
+# Student activity (lessons viewed and completed, quizzes generated and submitted,
+# attendance) as an append-only event log with one segment per day:
+#   activity/segments/<YYYY-MM-DD>.jsonl
+# and a per-student index of fixed-size records (segment day, byte offset, length):
+#   activity/index/<2-hex shard>/<sha1(student)>.idx
+# A timeline page reads its records from the end of one index file and then exactly those
+# lines, so it costs the same however much activity the whole school has logged.
+ACTIVITY_DIR = "activity"
+LEGACY_FILE = "activity_log.json"
+PAGE_SIZE = 20
+RETENTION_DAYS = int(os.environ.get("ACTIVITY_RETENTION_DAYS", "365"))
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+RECORD = struct.Struct("<IQI")  # date ordinal of the segment, byte offset, line length
+
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+_legacy_checked = False
+
+
+def _segment_path(day):
+    return os.path.join(ACTIVITY_DIR, "segments", f"{day.isoformat()}.jsonl")
+
+
+def _index_path(student):
+    digest = hashlib.sha1(str(student).encode("utf-8")).hexdigest()
+    return os.path.join(ACTIVITY_DIR, "index", digest[:2], f"{digest}.idx")
+
+
+def _exclusive():
+    """Serialize writers across threads and (where flock exists) processes."""
+    return store_utils.exclusive(_lock, os.path.join(ACTIVITY_DIR, ".lock"))
+
+
+def _day(event):
+    """Date of the segment an event belongs to (from the first 10 characters of its timestamp)."""
+    return date.fromisoformat(str(event["timestamp"])[:10])
+
+
+def _write(events):
+    """Append events to their day segments and index them; the caller holds _exclusive()."""
+    by_day = {}
+    for event in events:
+        by_day.setdefault(_day(event), []).append(event)
+    records = {}  # student -> packed index records, in write order
+    for day, day_events in sorted(by_day.items()):
+        path = _segment_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            start = offset = f.seek(0, os.SEEK_END)
+            lines = []
+            for event in day_events:
+                line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+                records.setdefault(str(event["student_name"]), []).append(RECORD.pack(day.toordinal(), offset, len(line)))
+                lines.append(line)
+                offset += len(line)
+            f.write(b"".join(lines))
+        metrics.record_io("write", offset - start)
+    # Index records go after their lines, so a reader never finds a record without its event
+    for student, student_records in records.items():
+        path = _index_path(student)
+        try:
+            f = open(path, "ab")
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, "ab")
+        with f:
+            f.write(b"".join(student_records))
+        metrics.record_io("write", RECORD.size * len(student_records))
+
+
+def _import_legacy():
+    """Once per process: move the old activity_log.json array into the log, oldest first."""
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    if not os.path.exists(LEGACY_FILE):
+        _legacy_checked = True
+        return
+    with _exclusive():
+        if os.path.exists(LEGACY_FILE):
+            try:
+                with open(LEGACY_FILE, "r") as f:
+                    logs = json.load(f)
+            except (OSError, ValueError):
+                logs = []
+            logs = logs if isinstance(logs, list) else []
+            valid = []
+            for log in logs:
+                if not isinstance(log, dict) or not log.get("student_name") or not log.get("timestamp"):
+                    continue
+                try:
+                    _day(log)
+                except ValueError:
+                    continue
+                valid.append(log)
+            if len(valid) < len(logs):
+                logger.warning("skipped %d unreadable entries of %s", len(logs) - len(valid), LEGACY_FILE)
+            # Every kept entry has a valid day, so _write() cannot fail half-way on bad data
+            _write(sorted(valid, key=lambda log: str(log["timestamp"])))
+            os.remove(LEGACY_FILE)
+    _legacy_checked = True
+
+
+def emit_many(events):
+    """
+    Record events: dicts with "student_name", "activity" and optionally "timestamp" (default
+    now) plus any details. One append per day segment and one per student touched.
+    """
+    now = datetime.now().strftime(TIMESTAMP_FORMAT)
+    events = [{"timestamp": now, **event} for event in events]
+    if not events:
+        return
+    _import_legacy()
+    with _exclusive():
+        _write(events)
+
+
+def emit(student, activity, **details):
+    """Record one activity of a student, e.g. emit("ana", "Viewed lesson: Algebra.pdf", lesson="Algebra.pdf")."""
+    emit_many([{"student_name": student, "activity": activity, **details}])
+
+
+def count(student):
+    """Number of events recorded for a student."""
+    _import_legacy()
+    try:
+        return os.path.getsize(_index_path(student)) // RECORD.size
+    except OSError:
+        return 0
+
+
+def page(student, before=None, limit=PAGE_SIZE):
+    """
+    Up to limit events of a student recorded before the cursor `before` (None = newest),
+    newest first, and the cursor for the next older page (None when there are no more).
+    """
+    _import_legacy()
+    try:
+        f = open(_index_path(student), "rb")
+    except OSError:
+        return [], None
+    with f:
+        total = os.fstat(f.fileno()).st_size // RECORD.size
+        end = total if before is None else min(int(before), total)
+        start = max(end - limit, 0)
+        f.seek(start * RECORD.size)
+        records = list(RECORD.iter_unpack(f.read((end - start) * RECORD.size)))
+    events = []
+    segments = {}
+    nbytes = len(records) * RECORD.size
+    try:
+        for ordinal, offset, length in reversed(records):
+            if ordinal not in segments:
+                try:
+                    segments[ordinal] = open(_segment_path(date.fromordinal(ordinal)), "rb")
+                except OSError:
+                    # Pruned by retention (prune() trims the index too): nothing older is left
+                    start = 0
+                    break
+            segment = segments[ordinal]
+            segment.seek(offset)
+            line = segment.read(length)
+            nbytes += len(line)
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    finally:
+        for segment in segments.values():
+            segment.close()
+    metrics.record_io("read", nbytes)
+    return events, (start if start > 0 else None)
+
+
+def read_new(positions):
+    """
+    Events appended since positions ({segment file name: byte offset}), oldest segment first,
+    and the updated positions. Only whole lines are returned; a line still being written is
+    picked up by the next call. Segments removed by retention drop out of the positions.
+    """
+    _import_legacy()
+    seg_dir = os.path.join(ACTIVITY_DIR, "segments")
+    names = sorted(n for n in os.listdir(seg_dir) if n.endswith(".jsonl")) if os.path.isdir(seg_dir) else []
+    events = []
+    updated = {}
+    for name in names:
+        done = positions.get(name, 0)
+        path = os.path.join(seg_dir, name)
+        size = os.path.getsize(path)
+        if size < done:
+            done = 0  # cleared and started again
+        if size > done:
+            with open(path, "rb") as f:
+                f.seek(done)
+                tail = f.read(size - done)
+            end = tail.rfind(b"\n") + 1
+            metrics.record_io("read", end)
+            for line in tail[:end].splitlines():
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+            done += end
+        updated[name] = done
+    return events, updated
+
+
+class StudentTimeline:
+    """One student's events with the page(before, limit) interface of feed.Feed."""
+
+    def __init__(self, student):
+        self.student = student
+
+    def page(self, before=None, limit=PAGE_SIZE):
+        return page(self.student, before, limit)
+
+
+def _trim_index(path, cutoff):
+    """Drop the records of an index file that point into segments before cutoff (an ordinal)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    kept = [record for record in RECORD.iter_unpack(data) if record[0] >= cutoff]
+    if len(kept) * RECORD.size == len(data):
+        return
+    if not kept:
+        os.remove(path)
+        return
+    with open(path + ".tmp", "wb") as f:
+        f.write(b"".join(RECORD.pack(*record) for record in kept))
+    os.replace(path + ".tmp", path)
+
+
+def prune(retention_days=RETENTION_DAYS):
+    """
+    Delete day segments older than the retention window, and their records from the
+    per-student indexes. Returns the number of segments removed.
+    """
+    cutoff = date.today() - timedelta(days=retention_days)
+    seg_dir = os.path.join(ACTIVITY_DIR, "segments")
+    removed = 0
+    with _exclusive():
+        for name in os.listdir(seg_dir) if os.path.isdir(seg_dir) else []:
+            try:
+                day = date.fromisoformat(name[:-len(".jsonl")])
+            except ValueError:
+                continue
+            if day < cutoff:
+                os.remove(os.path.join(seg_dir, name))
+                removed += 1
+        if removed:
+            # Writers hold the same lock, so no index grows while it is rewritten
+            for shard, _, files in os.walk(os.path.join(ACTIVITY_DIR, "index")):
+                for name in files:
+                    if name.endswith(".idx"):
+                        _trim_index(os.path.join(shard, name), cutoff.toordinal())
+    return removed
+
+
+def clear():
+    """Delete the whole activity log."""
+    with _exclusive():
+        shutil.rmtree(os.path.join(ACTIVITY_DIR, "segments"), ignore_errors=True)
+        shutil.rmtree(os.path.join(ACTIVITY_DIR, "index"), ignore_errors=True)
+        if os.path.exists(LEGACY_FILE):
+            os.remove(LEGACY_FILE)
@@ -0,0 +1,226 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+import activity_log
+import data_store
+import store_utils
+
+# ---------------- Alert rules config ----------------
+# Parent alerts are derived from the activity log (attendance, quiz submissions, completed
+# lessons). evaluate() reads only the events appended since its checkpoint, updates the
+# rolling state the rules keep per student (absence streaks, inactivity deadlines) and
+# stores new alerts in the alerts table, indexed by (student, created) and trimmed to the
+# newest MAX_ALERTS_PER_STUDENT of each student, so a busy student never pushes out another
+# student's alerts. Checkpoint, state and alerts are one SQLite transaction, so a run costs
+# O(new events + due deadlines), not a rescan of the history, and a parent's page reads
+# only their child's rows.
+ALERTS_DB = "alerts.db"
+NOTIFICATIONS_FILE = "notifications.json"  # the old single alerts file, imported once
+MIGRATED_SUFFIX = ".migrated"
+MAX_ALERTS_PER_STUDENT = 200
+ABSENCE_STREAK = 3
+LOW_SCORE_PERCENT = 40
+INACTIVE_DAYS = 7
+ATTENDANCE_WINDOW = 30  # attendance days remembered per student for streaks
+PRACTICE_RESULTS = "local"  # quiz_results_store.LOCAL: self-generated practice quizzes, not assigned ones
+TIMESTAMP_FORMAT = activity_log.TIMESTAMP_FORMAT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    segment TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    student TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    inactive_due REAL
+);
+CREATE INDEX IF NOT EXISTS students_due ON students (inactive_due);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    created TEXT NOT NULL,
+    rule TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_student ON alerts (student, created);
+"""
+
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+_legacy_checked = False
+
+
+def _connect(db=ALERTS_DB):
+    # SQLite's default synchronous=FULL: a committed checkpoint survives a power cut
+    return store_utils.connect(db, SCHEMA, pragmas=("journal_mode=WAL",))
+
+
+def _exclusive(db=ALERTS_DB):
+    """One evaluation at a time across threads and (where flock exists) processes."""
+    return store_utils.exclusive(_lock, f"{db}.lock")
+
+
+def _store(conn, alerts):
+    """Insert alerts (dicts as returned by evaluate) and trim each affected student to MAX_ALERTS_PER_STUDENT."""
+    conn.executemany(
+        "INSERT INTO alerts (student, created, rule, message) VALUES (?, ?, ?, ?)",
+        [(a["student_name"], str(a["timestamp"]), a.get("rule"), a["message"]) for a in alerts],
+    )
+    conn.executemany(
+        "DELETE FROM alerts WHERE student = ? AND id NOT IN "
+        "(SELECT id FROM alerts WHERE student = ? ORDER BY created DESC, id DESC LIMIT ?)",
+        [(student, student, MAX_ALERTS_PER_STUDENT) for student in {a["student_name"] for a in alerts}],
+    )
+
+
+def _import_legacy(db=ALERTS_DB):
+    """
+    Once per process: move the alerts of the old notifications.json into the alerts table
+    and rename the file to notifications.json.migrated. The caller holds _exclusive(db).
+    """
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    try:
+        notifications = data_store.read_json(NOTIFICATIONS_FILE)
+    except ValueError:
+        logger.exception("could not read %s; kept for a manual fix", NOTIFICATIONS_FILE)
+        notifications = None
+    if isinstance(notifications, list):
+        valid = [n for n in notifications if isinstance(n, dict) and n.get("student_name") and n.get("message")]
+        if len(valid) < len(notifications):
+            logger.warning("skipped %d unreadable entries of %s, kept in %s%s",
+                           len(notifications) - len(valid), NOTIFICATIONS_FILE, NOTIFICATIONS_FILE, MIGRATED_SUFFIX)
+        with _connect(db) as conn:
+            _store(conn, [dict(n, timestamp=n.get("timestamp", "")) for n in valid])
+        os.replace(NOTIFICATIONS_FILE, NOTIFICATIONS_FILE + MIGRATED_SUFFIX)
+        data_store.invalidate(NOTIFICATIONS_FILE)
+    _legacy_checked = True
+
+
+# ---------- rules ----------
+def consecutive_absences(state, event):
+    """ABSENCE_STREAK or more attendance days in a row marked Absent; one alert per streak."""
+    if event.get("kind") != "attendance" or not event.get("date"):
+        return None
+    days = state.setdefault("attendance", {})
+    days[event["date"]] = event.get("status")
+    for day in sorted(days)[:-ATTENDANCE_WINDOW]:
+        del days[day]
+    # Days are keyed by date, so a correction or a day marked late lands in the right place
+    streak = []
+    for day in sorted(days, reverse=True):
+        if days[day] != "Absent":
+            break
+        streak.append(day)
+    if len(streak) >= ABSENCE_STREAK and state.get("absence_alerted") != streak[-1]:
+        state["absence_alerted"] = streak[-1]
+        return f"{len(streak)} consecutive absences ({streak[-1]} to {streak[0]})"
+    return None
+
+
+def low_assigned_score(state, event):
+    """An assigned quiz scored below LOW_SCORE_PERCENT."""
+    if event.get("kind") != "quiz_submitted" or event.get("results") in (None, PRACTICE_RESULTS) or not event.get("total"):
+        return None
+    percent = 100 * event["correct"] / event["total"]
+    if percent < LOW_SCORE_PERCENT:
+        return f"Scored {event['correct']}/{event['total']} ({percent:.0f}%) on assigned quiz {event.get('quiz', '')}"
+    return None
+
+
+EVENT_RULES = [consecutive_absences, low_assigned_score]
+
+
+def _parse_ts(ts):
+    try:
+        return datetime.strptime(str(ts)[:19], TIMESTAMP_FORMAT)
+    except ValueError:
+        return datetime.now()
+
+
+def evaluate(now=None, db=ALERTS_DB):
+    """
+    Run the rules over events appended since the last evaluation and over inactivity
+    deadlines that have passed (no lesson completed in INACTIVE_DAYS). Returns the new alerts.
+    """
+    now = now or datetime.now()
+    with _exclusive(db):
+        _import_legacy(db)
+        conn = _connect(db)
+        positions = dict(conn.execute("SELECT segment, offset FROM positions").fetchall())
+        events, updated = activity_log.read_new(positions)
+        alerts = []
+        touched = {}  # student -> [state, inactive_due]
+        for event in events:
+            student = event.get("student_name")
+            if not student:
+                continue
+            entry = touched.get(student)
+            if entry is None:
+                row = conn.execute("SELECT state, inactive_due FROM students WHERE student = ?", (student,)).fetchone()
+                entry = touched[student] = [json.loads(row[0]), row[1]] if row else [{}, None]
+            ts = _parse_ts(event["timestamp"])
+            # The inactivity clock starts at a student's first event and restarts with every completed lesson
+            if entry[1] is None or event.get("kind") == "lesson_done":
+                entry[1] = (ts + timedelta(days=INACTIVE_DAYS)).timestamp()
+                if event.get("kind") == "lesson_done":
+                    entry[0]["last_lesson"] = event["timestamp"]
+            for rule in EVENT_RULES:
+                message = rule(entry[0], event)
+                if message:
+                    alerts.append({"timestamp": event["timestamp"], "student_name": student, "message": message, "rule": rule.__name__})
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO students (student, state, inactive_due) VALUES (?, ?, ?) "
+                "ON CONFLICT(student) DO UPDATE SET state = excluded.state, inactive_due = excluded.inactive_due",
+                [(student, json.dumps(state), due) for student, (state, due) in touched.items()],
+            )
+            due_rows = conn.execute(
+                "SELECT student, state, inactive_due FROM students WHERE inactive_due <= ?", (now.timestamp(),)
+            ).fetchall()
+            for student, state, due in due_rows:
+                last = json.loads(state).get("last_lesson")
+                alerts.append({
+                    "timestamp": datetime.fromtimestamp(due).strftime(TIMESTAMP_FORMAT),
+                    "student_name": student,
+                    "message": f"No lesson completed in {INACTIVE_DAYS} days" + (f" (last one {last[:10]})" if last else ""),
+                    "rule": "inactivity",
+                })
+            # Remind again after another INACTIVE_DAYS without a completed lesson
+            conn.executemany(
+                "UPDATE students SET inactive_due = ? WHERE student = ?",
+                [((now + timedelta(days=INACTIVE_DAYS)).timestamp(), student) for student, _, _ in due_rows],
+            )
+            _store(conn, alerts)
+            if updated != positions:
+                conn.execute("DELETE FROM positions")
+                conn.executemany("INSERT INTO positions (segment, offset) VALUES (?, ?)", list(updated.items()))
+        return alerts
+
+
+def student_alerts(student, db=ALERTS_DB):
+    """Alerts of one student, newest first."""
+    if not _legacy_checked:
+        with _exclusive(db):
+            _import_legacy(db)
+    rows = _connect(db).execute(
+        "SELECT created, message, rule FROM alerts WHERE student = ? ORDER BY created DESC, id DESC", (student,)
+    ).fetchall()
+    return [{"timestamp": created, "student_name": student, "message": message, "rule": rule}
+            for created, message, rule in rows]
+
+
+def clear(db=ALERTS_DB):
+    """Forget all rule state, the checkpoint and the alerts (and the old notifications.json, if never imported)."""
+    with _exclusive(db):
+        with _connect(db) as conn:
+            conn.execute("DELETE FROM positions")
+            conn.execute("DELETE FROM students")
+            conn.execute("DELETE FROM alerts")
+        data_store.remove(NOTIFICATIONS_FILE)
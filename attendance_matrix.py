@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# ---------------- Attendance matrix config ----------------
+# Day-major bit matrix: each day is one row of ceil(capacity / 4) bytes, 2 bits per student.
+MATRIX_DIR = os.path.join("attendance", "matrix")
+STATUS_CODES = {"Present": 1, "Absent": 2}
+MIN_CAPACITY = 256
+
+
+def _ordinal(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+STATUS_LABELS = np.array(["", "Present", "Absent", ""], dtype=object)
+
+
+def day_labels(days):
+    """'YYYY-MM-DD' labels for an array of day ordinals."""
+    return np.array([date.fromordinal(int(d)).strftime("%Y-%m-%d") for d in days], dtype=object)
+
+
+def unpack(packed):
+    """(days, row_bytes) uint8 -> (days, row_bytes * 4) 2-bit codes."""
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    return ((packed[:, :, None] >> shifts) & 3).reshape(packed.shape[0], -1)
+
+
+class AttendanceMatrix:
+    """Compact student x day status codes kept next to the day partitions of attendance_store."""
+
+    def __init__(self, matrix_dir=MATRIX_DIR):
+        self.dir = matrix_dir
+        self.meta_path = os.path.join(matrix_dir, "meta.json")
+        self.bin_path = os.path.join(matrix_dir, "matrix.bin")
+        self.students_path = os.path.join(matrix_dir, "students.json")  # JSON list; position = matrix column
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self._reset()
+
+    def _reset(self):
+        self.base_day = None  # ordinal of the first column
+        self.n_days = 0
+        self.capacity = MIN_CAPACITY
+        self.students = []
+        self.student_ids = {}
+        self.partitions = {}  # date_str -> partition mtime_ns reflected in the matrix
+        self.data = None
+
+    @property
+    def row_bytes(self):
+        return self.capacity // 4
+
+    # ---------- persistence ----------
+    def _load(self):
+        """(Re)open the memory map if another writer changed the files since we last looked."""
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except OSError:
+            self._reset()
+            self._loaded_mtime = None
+            return
+        if mtime == self._loaded_mtime:
+            return
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        with open(self.students_path, encoding="utf-8") as f:
+            self.students = json.load(f)[:meta["n_students"]]
+        self.student_ids = {s: i for i, s in enumerate(self.students)}
+        self.base_day, self.n_days = meta["base_day"], meta["n_days"]
+        self.capacity, self.partitions = meta["capacity"], meta["partitions"]
+        self.data = None
+        if self.n_days:
+            self.data = np.memmap(self.bin_path, dtype=np.uint8, mode="r+", shape=(self.n_days, self.row_bytes))
+        self._loaded_mtime = mtime
+
+    def _save_meta(self, students_changed=True):
+        os.makedirs(self.dir, exist_ok=True)
+        if self.data is not None:
+            self.data.flush()
+        if students_changed or not os.path.exists(self.students_path):
+            tmp = self.students_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.students, f)
+            os.replace(tmp, self.students_path)
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "base_day": self.base_day, "n_days": self.n_days, "capacity": self.capacity,
+                "n_students": len(self.students), "partitions": self.partitions,
+            }, f)
+        os.replace(tmp, self.meta_path)
+        self._loaded_mtime = os.stat(self.meta_path).st_mtime_ns
+
+    def _resize(self, base_day, n_days, capacity):
+        """Rewrite the matrix file with a new day window and/or student capacity, keeping overlapping cells."""
+        os.makedirs(self.dir, exist_ok=True)
+        new = np.zeros((n_days, capacity // 4), dtype=np.uint8)
+        if self.data is not None and self.n_days:
+            lo = max(base_day, self.base_day)
+            hi = min(base_day + n_days, self.base_day + self.n_days)
+            if lo < hi:
+                new[lo - base_day:hi - base_day, :self.row_bytes] = self.data[lo - self.base_day:hi - self.base_day]
+        self.data = None
+        tmp = self.bin_path + ".tmp"
+        new.tofile(tmp)
+        os.replace(tmp, self.bin_path)
+        self.base_day, self.n_days, self.capacity = base_day, n_days, capacity
+        self.data = np.memmap(self.bin_path, dtype=np.uint8, mode="r+", shape=(n_days, self.row_bytes)) if n_days else None
+
+    def _ensure(self, day, n_students):
+        capacity = self.capacity
+        while capacity < n_students:
+            capacity *= 2
+        if self.base_day is None:
+            self._resize(day, 1, capacity)
+            return
+        base = min(self.base_day, day)
+        last = max(self.base_day + self.n_days - 1, day)
+        if base != self.base_day or capacity != self.capacity:
+            # Grow the day window in blocks so a new day rarely forces a rewrite
+            self._resize(base, last - base + 1 + 31, capacity)
+        elif last >= self.base_day + self.n_days:
+            n_days = last - base + 1 + 31
+            with open(self.bin_path, "ab") as f:
+                f.truncate(n_days * self.row_bytes)
+            self.n_days = n_days
+            self.data = np.memmap(self.bin_path, dtype=np.uint8, mode="r+", shape=(n_days, self.row_bytes))
+
+    # ---------- writes ----------
+    def update_day(self, date_str, statuses, partition_mtime=None):
+        """Set the codes for one day from {student: status}; called after each partition write."""
+        with self._lock:
+            self._load()
+            n_before = len(self.students)
+            for student in statuses:
+                if student not in self.student_ids:
+                    self.student_ids[student] = len(self.students)
+                    self.students.append(student)
+            day = _ordinal(date_str)
+            self._ensure(day, len(self.students))
+            ids = np.fromiter((self.student_ids[s] for s in statuses), dtype=np.int64, count=len(statuses))
+            codes = np.fromiter((STATUS_CODES.get(v, 0) for v in statuses.values()), dtype=np.uint8, count=len(statuses))
+            row = self.data[day - self.base_day]
+            byte_idx, shift = ids // 4, ((ids % 4) * 2).astype(np.uint8)
+            # Clear then set the 2-bit cells; ufunc.at handles several students in one byte
+            np.bitwise_and.at(row, byte_idx, ~(np.uint8(3) << shift))
+            np.bitwise_or.at(row, byte_idx, codes << shift)
+            if partition_mtime is not None:
+                self.partitions[date_str] = partition_mtime
+            self._save_meta(len(self.students) != n_before)
+
+    def drop_before(self, cutoff_date):
+        """Forget days before cutoff_date (mirrors partition retention)."""
+        with self._lock:
+            self._load()
+            cutoff = _ordinal(cutoff_date)
+            self.partitions = {d: m for d, m in self.partitions.items() if _ordinal(d) >= cutoff}
+            if self.base_day is not None and cutoff > self.base_day:
+                end = self.base_day + self.n_days
+                if cutoff >= end:
+                    self._resize(cutoff, 1, self.capacity)
+                else:
+                    self._resize(cutoff, end - cutoff, self.capacity)
+            self._save_meta(False)
+
+    def sync(self, partitions):
+        """
+        Reconcile with the partition files: {date_str: (mtime_ns, loader)}. Days whose
+        partition changed outside update_day (or disappeared) are re-applied.
+        """
+        with self._lock:
+            self._load()
+            for date_str in [d for d in self.partitions if d not in partitions]:
+                self._clear_day(date_str)
+            for date_str, (mtime, loader) in partitions.items():
+                if self.partitions.get(date_str) != mtime:
+                    self._clear_day(date_str)
+                    self.update_day(date_str, loader(date_str), mtime)
+
+    def _clear_day(self, date_str):
+        day = _ordinal(date_str)
+        if self.data is not None and self.base_day <= day < self.base_day + self.n_days:
+            self.data[day - self.base_day] = 0
+        self.partitions.pop(date_str, None)
+        self._save_meta(False)
+
+    # ---------- reads ----------
+    def codes(self, start, end):
+        """Return (students, day ordinals, codes) with codes shaped (n_students, n_days) for [start, end]."""
+        with self._lock:
+            self._load()
+            first, last = _ordinal(start), _ordinal(end)
+            days = np.arange(first, last + 1)
+            n = len(self.students)
+            out = np.zeros((n, len(days)), dtype=np.uint8)
+            if self.data is not None and n:
+                lo = max(first, self.base_day)
+                hi = min(last, self.base_day + self.n_days - 1)
+                if lo <= hi:
+                    block = unpack(np.asarray(self.data[lo - self.base_day:hi - self.base_day + 1]))[:, :n]
+                    out[:, lo - first:hi - first + 1] = block.T
+            return np.array(self.students, dtype=object), days, out
+
+    def summary(self, start, end, student_mask=None):
+        """
+        Vectorized per-student summary for [start, end]: present/absent counts, attendance %,
+        latest marked date and status. Students never marked in the range are left out.
+        """
+        students, days, codes = self.codes(start, end)
+        if student_mask is not None:
+            students, codes = students[student_mask], codes[student_mask]
+        present = (codes == 1).sum(axis=1)
+        absent = (codes == 2).sum(axis=1)
+        marked = present + absent
+        keep = marked > 0
+        # Index of the last marked day per student
+        last_idx = codes.shape[1] - 1 - np.argmax(codes[:, ::-1] > 0, axis=1)
+        latest_code = codes[np.arange(len(codes)), last_idx]
+        return pd.DataFrame({
+            "Student": students[keep],
+            "Present": present[keep],
+            "Absent": absent[keep],
+            "Attendance %": np.round(100.0 * present[keep] / np.maximum(marked[keep], 1), 1),
+            "Latest Date": day_labels(days)[last_idx[keep]],
+            "Latest Status": STATUS_LABELS[latest_code[keep]],
+        })
+
+    def records(self, start, end, student_mask=None, statuses=None):
+        """Marked cells in [start, end] as a Date/Student/Status DataFrame, built from the non-zero cells only."""
+        students, days, codes = self.codes(start, end)
+        if student_mask is not None:
+            students, codes = students[student_mask], codes[student_mask]
+        wanted = np.isin(codes, [STATUS_CODES[s] for s in (statuses or STATUS_CODES)])
+        rows, cols = np.nonzero(wanted)
+        return pd.DataFrame({
+            "Date": day_labels(days)[cols],
+            "Student": students[rows],
+            "Status": STATUS_LABELS[codes[rows, cols]],
+        })
+
+    def student_records(self, student, start, end):
+        """One student's marked days in [start, end], reading a single byte column of the matrix."""
+        with self._lock:
+            self._load()
+            sid = self.student_ids.get(student)
+            first, last = _ordinal(start), _ordinal(end)
+            if sid is None or self.data is None:
+                return pd.DataFrame(columns=["Date", "Student", "Status"])
+            lo = max(first, self.base_day)
+            hi = min(last, self.base_day + self.n_days - 1)
+            if lo > hi:
+                return pd.DataFrame(columns=["Date", "Student", "Status"])
+            days = np.arange(lo, hi + 1)
+            codes = (np.asarray(self.data[lo - self.base_day:hi - self.base_day + 1, sid // 4]) >> ((sid % 4) * 2)) & 3
+        marked = codes > 0
+        return pd.DataFrame({
+            "Date": day_labels(days[marked]),
+            "Student": student,
+            "Status": STATUS_LABELS[codes[marked]],
+        })
+
+    def status_counts(self, start, end, student_mask=None):
+        """{status: count} over [start, end] with a single bincount."""
+        _, _, codes = self.codes(start, end)
+        if student_mask is not None:
+            codes = codes[student_mask]
+        counts = np.bincount(codes.ravel(), minlength=4)
+        return {status: int(counts[code]) for status, code in STATUS_CODES.items()}
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_matrix(matrix_dir=MATRIX_DIR):
+    """Process-wide matrix shared by every session."""
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None or _matrix.dir != matrix_dir:
+            _matrix = AttendanceMatrix(matrix_dir)
+        return _matrix
@@ -0,0 +1,190 @@
+import csv
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+import metrics
+from attendance_matrix import get_matrix
+
+# ---------------- Attendance store config ----------------
+ATT_DIR = "attendance"  # one CSV partition per day: attendance/YYYY-MM-DD.csv
+LEGACY_ATT_FILE = "attendance.csv"
+# The legacy file is never deleted while it holds rows that did not convert: it is renamed to
+# attendance.csv.migrated when some rows were skipped, or .unmigrated when the import failed.
+MIGRATED_SUFFIX = ".migrated"
+UNMIGRATED_SUFFIX = ".unmigrated"
+COLUMNS = ["Date", "Student", "Status"]
+
+logger = logging.getLogger(__name__)
+_lock = threading.RLock()
+
+
+def normalize_date(value):
+    """Return a 'YYYY-MM-DD' string for a date, datetime or date-like string."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return date.fromisoformat(str(value).strip()[:10]).strftime("%Y-%m-%d")
+
+
+def partition_path(date_str, att_dir=ATT_DIR):
+    return os.path.join(att_dir, f"{date_str}.csv")
+
+
+def list_partitions(att_dir=ATT_DIR):
+    """Sorted list of partition dates present on disk."""
+    if not os.path.isdir(att_dir):
+        return []
+    return sorted(name[:-4] for name in os.listdir(att_dir) if name.endswith(".csv") and len(name) == 14)
+
+
+def read_day(date_str, att_dir=ATT_DIR):
+    """Return {student: status} for one day (insertion ordered), empty if not marked."""
+    path = partition_path(date_str, att_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        metrics.record_io("read", os.fstat(f.fileno()).st_size)
+        return {row["Student"]: row["Status"] for row in csv.DictReader(f)}
+
+
+def _write_day(date_str, statuses, att_dir):
+    os.makedirs(att_dir, exist_ok=True)
+    path = partition_path(date_str, att_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows((date_str, student, status) for student, status in statuses.items())
+        metrics.record_io("write", f.tell())
+    os.replace(tmp, path)
+    return os.stat(path).st_mtime_ns
+
+
+def _matrix_dir(att_dir):
+    return os.path.join(att_dir, "matrix")
+
+
+def upsert_records(records, att_dir=ATT_DIR):
+    """
+    Insert or replace records [{'Date': 'YYYY-MM-DD', 'Student': 'Name', 'Status': 'Present'}],
+    keyed by (date, student). Each affected day is rewritten once; other days are untouched.
+    Returns {date: number of students whose status changed}.
+    """
+    by_day = {}
+    for rec in records:
+        by_day.setdefault(normalize_date(rec["Date"]), {})[str(rec["Student"]).strip()] = rec["Status"]
+    changed = {}
+    with _lock:
+        migrate_legacy(att_dir=att_dir)
+        for date_str, updates in by_day.items():
+            statuses = read_day(date_str, att_dir)
+            diff = {s: v for s, v in updates.items() if statuses.get(s) != v}
+            if diff:
+                statuses.update(diff)
+                mtime = _write_day(date_str, statuses, att_dir)
+                get_matrix(_matrix_dir(att_dir)).update_day(date_str, diff, mtime)
+            changed[date_str] = len(diff)
+    return changed
+
+
+def drop_expired(retention_days, today=None, att_dir=ATT_DIR):
+    """Delete whole day partitions older than the retention window. Returns the dropped dates."""
+    today = today or date.today()
+    cutoff = (today - timedelta(days=retention_days - 1)).strftime("%Y-%m-%d")
+    dropped = []
+    with _lock:
+        migrate_legacy(att_dir=att_dir)
+        for date_str in list_partitions(att_dir):
+            if date_str >= cutoff:
+                break
+            try:
+                os.remove(partition_path(date_str, att_dir))
+                dropped.append(date_str)
+            except OSError:
+                pass
+        if dropped:
+            get_matrix(_matrix_dir(att_dir)).drop_before(cutoff)
+    return dropped
+
+
+def load_df(start=None, end=None, students=None, att_dir=ATT_DIR):
+    """
+    Attendance rows as a DataFrame with Date ('YYYY-MM-DD'), Student and Status,
+    reading only the partitions between start and end (inclusive).
+    """
+    migrate_legacy(att_dir=att_dir)
+    start = normalize_date(start) if start else None
+    end = normalize_date(end) if end else None
+    frames = []
+    for date_str in list_partitions(att_dir):
+        if (start and date_str < start) or (end and date_str > end):
+            continue
+        path = partition_path(date_str, att_dir)
+        metrics.record_io("read", os.path.getsize(path))
+        with metrics.parse_timer("attendance_csv"):
+            frames.append(pd.read_csv(path, dtype=str))
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    if students is not None:
+        df = df[df["Student"].isin(students)]
+    return df
+
+
+def matrix(att_dir=ATT_DIR):
+    """
+    The student x day matrix for range queries, reconciled with the partitions first
+    (one stat per partition; only days changed behind its back are re-read).
+    """
+    migrate_legacy(att_dir=att_dir)
+    with _lock:
+        m = get_matrix(_matrix_dir(att_dir))
+        partitions = {d: os.stat(partition_path(d, att_dir)).st_mtime_ns for d in list_partitions(att_dir)}
+        m.sync({d: (mtime, lambda day: read_day(day, att_dir)) for d, mtime in partitions.items()})
+    return m
+
+
+def has_data(att_dir=ATT_DIR):
+    migrate_legacy(att_dir=att_dir)
+    return bool(list_partitions(att_dir))
+
+
+def migrate_legacy(legacy_file=LEGACY_ATT_FILE, att_dir=ATT_DIR):
+    """Split an old single-file attendance.csv into day partitions (last row per student/day wins)."""
+    if not os.path.exists(legacy_file):
+        return
+    with _lock:
+        if not os.path.exists(legacy_file):
+            return
+        try:
+            by_day = {}
+            skipped = []
+            with open(legacy_file, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    student = (row.get("Student") or "").strip()
+                    try:
+                        date_str = normalize_date(row.get("Date") or "")
+                    except ValueError:
+                        date_str = None
+                    if date_str is None or not student or not row.get("Status"):
+                        skipped.append(row)
+                        continue
+                    by_day.setdefault(date_str, {})[student] = row["Status"]
+            for date_str, updates in by_day.items():
+                statuses = read_day(date_str, att_dir)
+                statuses.update(updates)
+                _write_day(date_str, statuses, att_dir)
+        except Exception:
+            # Keep the records for a manual fix; the renamed file is not picked up again
+            logger.exception("could not migrate %s; kept as %s%s", legacy_file, legacy_file, UNMIGRATED_SUFFIX)
+            os.replace(legacy_file, legacy_file + UNMIGRATED_SUFFIX)
+            return
+        if skipped:
+            logger.warning("%s: skipped %d row(s) without a valid date, student and status, kept in %s%s: %s",
+                           legacy_file, len(skipped), legacy_file, MIGRATED_SUFFIX, skipped[:5])
+            os.replace(legacy_file, legacy_file + MIGRATED_SUFFIX)
+        else:
+            os.remove(legacy_file)
@@ -0,0 +1,77 @@
+"""
+Rerun latency of "Mark Attendance" for a large roster.
+
+    python benchmarks/bench_attendance_grid.py [--students 5000] [--reruns 5]
+
+Runs app.py headless (streamlit.testing AppTest) in a throwaway copy of the repo with a
+synthetic roster and times a rerun of the grid mode, of the per-student checkbox mode and
+of manual entry (the page without any roster widgets, as a baseline), then times a save that changes a handful of students in a fully marked day.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--changes", type=int, default=10)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="bench_att_grid_")
+    shutil.copytree(ROOT, work, dirs_exist_ok=True, ignore=shutil.ignore_patterns(".git", "benchmarks"))
+    os.chdir(work)
+    sys.path.insert(0, work)
+    from streamlit.testing.v1 import AppTest
+
+    roster = [f"Student {i:05d}" for i in range(args.students)]
+    with open("class_roster.csv", "w") as f:
+        f.write("Student\n" + "\n".join(roster) + "\n")
+
+    at = AppTest.from_file(os.path.join(work, "app.py"), default_timeout=600).run()
+    at.sidebar.radio[1].set_value("Teacher").run()
+    at.session_state["teacher_logged_in"] = True
+    at.sidebar.radio[2].set_value("Mark Attendance").run()
+
+    def timed_reruns(mode):
+        [r for r in at.radio if r.label == "Mode"][0].set_value(mode).run()
+        times = []
+        for _ in range(args.reruns):
+            t = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - t)
+        assert not at.exception, [e.value for e in at.exception]
+        return times
+
+    for mode in ["Manual entry (comma/newline)", "Roster grid (bulk edit)", "Roster (checkboxes)"]:
+        if mode == "Roster (checkboxes)" and args.students > 2000:
+            # Thousands of checkbox widgets: one rerun is enough to make the point
+            args.reruns = 1
+        times = timed_reruns(mode)
+        print(f"{mode:<30} rerun p50={statistics.median(times) * 1000:8.1f}ms  max={max(times) * 1000:8.1f}ms  ({len(times)} reruns)")
+
+    # Save with a fully marked day on disk: only the edited students should be written
+    import attendance_store
+    [r for r in at.radio if r.label == "Mode"][0].set_value("Roster grid (bulk edit)").run()
+    date_str = time.strftime("%Y-%m-%d")
+    attendance_store.upsert_records([{"Date": date_str, "Student": s, "Status": "Present"} for s in roster])
+    at.session_state["att_pending"] = {date_str: {s: "Absent" for s in roster[:args.changes]}}
+    save = [b for b in at.button if b.label == "✅ Save changes"][0]
+    t = time.perf_counter()
+    save.click().run()
+    elapsed = time.perf_counter() - t
+    assert not at.exception, [e.value for e in at.exception]
+    label = f"save ({args.changes} changed rows)"
+    print(f"{label:<30} {elapsed * 1000:8.1f}ms incl. rerun; "
+          f"{[s.value for s in at.success][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Login storm against the user directory: N students log in at the same moment.
+
+    python benchmarks/bench_auth.py [--users 500] [--threads 64] [--iterations 100000]
+
+Streamlit runs each session's script in its own thread, so the storm is simulated with
+a thread pool hitting user_directory.verify_user directly. Reports p50/p99/max latency
+for the cold storm (every login hashes) and a warm re-login wave, plus how many logins
+were turned away with DirectoryBusy.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def storm(user_directory, db, n_users, threads):
+    latencies, busy = [], 0
+    lock = threading.Lock()
+    start_gate = threading.Event()
+
+    def login(i):
+        nonlocal busy
+        start_gate.wait()
+        t = time.perf_counter()
+        try:
+            ok = user_directory.verify_user("student", f"student{i:05d}", f"pw-{i}", db=db)
+            assert ok
+        except user_directory.DirectoryBusy:
+            with lock:
+                busy += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - t)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(login, i) for i in range(n_users)]
+        t0 = time.perf_counter()
+        start_gate.set()
+        for f in futures:
+            f.result()
+        wall = time.perf_counter() - t0
+    return latencies, busy, wall
+
+
+def report(label, latencies, busy, wall):
+    ms = [x * 1000 for x in latencies]
+    print(f"{label:<6} ok={len(ms):>5}  busy={busy:>4}  wall={wall:6.2f}s  "
+          f"p50={statistics.median(ms):8.1f}ms  p99={percentile(ms, 99):8.1f}ms  max={max(ms):8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=None, help="PBKDF2 iterations (default: PASSWORD_HASH_ITERATIONS)")
+    args = parser.parse_args()
+    if args.iterations:
+        os.environ["PASSWORD_HASH_ITERATIONS"] = str(args.iterations)
+
+    workdir = tempfile.mkdtemp(prefix="bench_auth_")
+    os.chdir(workdir)
+    import user_directory
+
+    db = os.path.join(workdir, "users.db")
+    t = time.perf_counter()
+    for i in range(args.users):
+        user_directory.create_user("student", f"student{i:05d}", f"pw-{i}", db=db)
+    print(f"setup: {args.users} users in {time.perf_counter() - t:.2f}s "
+          f"(iterations={user_directory.HASH_ITERATIONS}, hash slots={user_directory.MAX_CONCURRENT_HASHES}, "
+          f"queue timeout={user_directory.LOGIN_QUEUE_TIMEOUT}s)")
+
+    report("cold", *storm(user_directory, db, args.users, args.threads))
+    report("warm", *storm(user_directory, db, args.users, args.threads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Vectorized grading and item analysis for one assigned quiz.
+
+    python benchmarks/bench_grading.py [--submissions 5000] [--questions 30] [--options 4]
+
+Writes synthetic submissions (with captured answer indices) into a throwaway results
+partition, then times: building the response matrix from Parquet, grading every
+submission, item statistics, and a persisted re-grade after changing one answer key entry.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(label, fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    print(f"{label:<34} {best * 1000:8.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--options", type=int, default=4)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_grading_"))
+    import grading
+    import quiz_results_store
+
+    rng = np.random.default_rng(0)
+    questions = [{"question": f"Q{i}", "options": [f"o{j}" for j in range(args.options)], "answer": "o0"}
+                 for i in range(args.questions)]
+    key, n_options = grading.answer_key(questions)
+    # Abler students pick the right option more often, so items discriminate
+    ability = rng.random(args.submissions)[:, None]
+    right = rng.random((args.submissions, args.questions)) < 0.3 + 0.6 * ability
+    responses = np.where(right, 0, rng.integers(1, args.options, (args.submissions, args.questions))).astype(np.int8)
+    rows = [{"student": f"s{i}", "quiz": "Bench", "correct": 0, "total": args.questions,
+             "timestamp": "2025-06-01 10:00:00", "answers": r.tolist()} for i, r in enumerate(responses)]
+    quiz_results_store.append("quiz-bench", rows)
+    print(f"{args.submissions} submissions x {args.questions} questions")
+
+    rows_idx, matrix = timed("response matrix from Parquet", lambda: grading.response_matrix("quiz-bench", args.questions))
+    assert len(rows_idx) == args.submissions
+    timed("grade all submissions", lambda: grading.grade(matrix, key))
+    timed("item statistics", lambda: grading.item_statistics(matrix, key, n_options))
+    questions[0]["answer"] = "o1"
+    changed = timed("re-grade + rewrite partition", lambda: grading.regrade("quiz-bench", questions), repeat=1)
+    print(f"{'':<34} {changed} scores changed")
+
+
+if __name__ == "__main__":
+    main()
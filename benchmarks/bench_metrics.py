@@ -0,0 +1,96 @@
+"""
+Overhead of the rerun/I-O instrumentation in metrics.py.
+
+    python benchmarks/bench_metrics.py [--reruns 20000] [--io 20]
+
+1. The bookkeeping of one instrumented script run: begin_rerun, the page context with
+   --io file reads/writes and two parse timers, and the sampled event. Reported in
+   microseconds per rerun and as a share of a 10 ms rerun (the fastest pages' median
+   in bench_startup.py).
+2. A real I/O-bound page operation (the attendance report's 31 day-partition reads plus
+   the cached JSON reads of a dashboard), timed with metrics on and off.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FAST_RERUN_SECONDS = 0.010
+
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=20000)
+    parser.add_argument("--io", type=int, default=20)
+    parser.add_argument("--students", type=int, default=2000)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="bench_metrics_")
+    os.chdir(work)
+    import attendance_store
+    import data_store
+    import metrics
+    metrics.METRICS_DIR = os.path.join(work, "metrics")
+
+    def rerun():
+        metrics.begin_rerun()
+        with metrics.page("Teacher / View Attendance Report"):
+            for _ in range(args.io):
+                metrics.record_io("read", 4096)
+            with metrics.parse_timer("csv"):
+                pass
+            with metrics.parse_timer("parquet"):
+                pass
+
+    t = time.perf_counter()
+    for _ in range(args.reruns):
+        rerun()
+    per_rerun = (time.perf_counter() - t) / args.reruns
+    print(f"bookkeeping per rerun ({args.io} file ops, 2 parses): {per_rerun * 1e6:6.1f}us "
+          f"= {per_rerun / FAST_RERUN_SECONDS:.2%} of a {FAST_RERUN_SECONDS * 1000:.0f} ms rerun")
+
+    students = [f"Student {i:05d}" for i in range(args.students)]
+    today = time.strftime("%Y-%m-%d")
+    days = [time.strftime("%Y-%m-%d", time.localtime(time.time() - d * 86400)) for d in range(31)]
+    for day in days:
+        attendance_store.upsert_records({"Date": day, "Student": s, "Status": "Present"} for s in students)
+    data_store.write_json("activity_log.json", [{"student_name": s, "activity": "x", "timestamp": today} for s in students])
+
+    def page_work():
+        metrics.begin_rerun()
+        with metrics.page("Parent / View Progress Dashboard"):
+            for day in days:
+                attendance_store.read_day(day)
+            data_store.read_json("activity_log.json")
+
+    results = {}
+    for enabled in (False, True, False, True):
+        metrics.METRICS_ENABLED = enabled
+        results.setdefault(enabled, []).append(timed(page_work, 30))
+    off, on = min(results[False]), min(results[True])
+    print(f"31 partition reads + cached JSON: off={off * 1000:7.2f}ms  on={on * 1000:7.2f}ms  "
+          f"overhead={(on - off) / off:+.2%}")
+    metrics.flush()
+    print(f"metrics written to {metrics.METRICS_DIR}:")
+    with open(os.path.join(metrics.METRICS_DIR, "metrics.prom")) as f:
+        for line in f.read().splitlines()[:12]:
+            print(f"  {line}")
+    shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
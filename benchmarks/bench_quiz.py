@@ -0,0 +1,93 @@
+"""
+Throughput of the streaming quiz generator on a large corpus.
+
+    python benchmarks/bench_quiz.py [--mb 200] [--questions 10] [--seed 7]
+
+The corpus is streamed chunk by chunk (extracted lesson text when available,
+synthetic sentences otherwise), so memory stays flat regardless of --mb.
+"""
+import argparse
+import os
+import random
+import sys
+import resource
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_generator import generate_ranked_quiz, iter_sentences, top_sentences  # noqa: E402
+
+VOCAB = (
+    "cloud computing virtualization hypervisor container storage network latency throughput "
+    "blockchain ledger consensus contract oracle replication partition scheduler memory cache "
+    "service platform infrastructure elastic tenant security encryption identity gateway"
+).split()
+FILLER = ["the", "and", "is", "of", "to", "a", "in", "for", "with", "on"]
+
+
+def sample_chunks(seed):
+    """Base chunks: cached lesson pages if any, else synthetic sentences."""
+    cache_dir = ".text_cache"
+    if os.path.isdir(cache_dir):
+        import json
+        pages = []
+        for name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, name), encoding="utf-8") as f:
+                pages.extend(json.load(f)["pages"])
+        if pages:
+            return pages
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(2000):
+        words = [rng.choice(VOCAB if rng.random() < 0.6 else FILLER) for _ in range(rng.randint(6, 24))]
+        chunks.append(" ".join(words).capitalize() + rng.choice([". ", "? ", "! "]))
+    return chunks
+
+
+def corpus(base_chunks, total_bytes):
+    """Yield base chunks repeatedly until total_bytes characters have been produced."""
+    produced = 0
+    while produced < total_bytes:
+        for chunk in base_chunks:
+            yield chunk
+            produced += len(chunk)
+            if produced >= total_bytes:
+                return
+
+
+class Counter:
+    def __init__(self, it):
+        self.it, self.n = it, 0
+
+    def __iter__(self):
+        for item in self.it:
+            self.n += 1
+            yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=50)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    base = sample_chunks(args.seed)
+    total = int(args.mb * 1024 * 1024)
+
+    sentences = Counter(iter_sentences(corpus(base, total)))
+    start = time.perf_counter()
+    best = top_sentences(sentences, args.questions, random.Random(args.seed))
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    quiz = generate_ranked_quiz(corpus(base, 256 * 1024), args.questions, seed=args.seed)
+    print(f"corpus:       {args.mb:.1f} MB, {sentences.n:,} sentences")
+    print(f"elapsed:      {elapsed:.2f} s")
+    print(f"throughput:   {sentences.n / elapsed:,.0f} sentences/s ({args.mb / elapsed:.1f} MB/s)")
+    print(f"peak RSS:     {peak_kib / 1024:.1f} MiB")
+    print(f"kept:         {len(best)} sentences, sample quiz has {len(quiz)} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Exam-time submission burst through the result writer.
+
+    python benchmarks/bench_result_writer.py [--students 400] [--per-student 5] [--threads 64]
+
+Every simulated student session submits its results through result_writer (bounded queue,
+group commit, fsync per batch) and waits for the durable acknowledgement. Reports sustained
+submissions/s, ack latency p50/p99, batch sizes, and, for comparison, the same burst with
+every session calling quiz_results_store.append(durable=True) itself.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def burst(submit, n, threads):
+    latencies = []
+    lock = threading.Lock()
+    gate = threading.Event()
+
+    def one(i):
+        row = {"student": f"student{i % 1000:04d}", "quiz": "Midterm", "correct": i % 6, "total": 5,
+               "timestamp": "2025-06-01 10:00:00"}
+        gate.wait()
+        t = time.perf_counter()
+        submit(row)
+        with lock:
+            latencies.append(time.perf_counter() - t)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(one, i) for i in range(n)]
+        t0 = time.perf_counter()
+        gate.set()
+        for f in futures:
+            f.result()
+        wall = time.perf_counter() - t0
+    return latencies, wall
+
+
+def report(label, latencies, wall):
+    ms = [x * 1000 for x in latencies]
+    print(f"{label:<22} {len(ms) / wall:8.0f} submissions/s  ack p50={statistics.median(ms):7.1f}ms  "
+          f"p99={percentile(ms, 99):7.1f}ms  max={max(ms):7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=64)
+    args = parser.parse_args()
+    n = args.students * args.per_student
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_result_writer_"))
+    import quiz_results_store
+    import result_writer
+
+    writer = result_writer.ResultWriter(results_dir="writer_results")
+    latencies, wall = burst(lambda row: writer.write(quiz_results_store.CUSTOM, row), n, args.threads)
+    writer.close()
+    report("result writer", latencies, wall)
+    s = writer.stats
+    print(f"{'':<22} {s['rows']} rows in {s['batches']} batches (avg {s['rows'] / s['batches']:.0f}, "
+          f"largest {s['largest_batch']}), {s['errors']} errors")
+    stored = len(quiz_results_store.read(quiz_results_store.CUSTOM, results_dir="writer_results"))
+    assert stored == n, (stored, n)
+
+    latencies, wall = burst(
+        lambda row: quiz_results_store.append(quiz_results_store.CUSTOM, [row], "direct_results", durable=True),
+        n, args.threads)
+    report("direct append", latencies, wall)
+
+
+if __name__ == "__main__":
+    main()
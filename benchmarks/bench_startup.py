@@ -0,0 +1,111 @@
+"""
+Cold start and rerun latency of app.py, optionally against an earlier revision.
+
+    python benchmarks/bench_startup.py [--ref HEAD~1] [--cold 5] [--reruns 20]
+
+Runs the app headless (streamlit.testing AppTest) in a throwaway copy of the working tree
+(and of --ref, exported with git archive). Cold start is the first script run in a fresh
+interpreter that has already imported streamlit, i.e. the app's own imports and module-level
+work plus the landing page; it is repeated in --cold new processes. Rerun latency is the
+median of --reruns reruns of each lightweight page once it is displayed.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["pandas", "altair", "PyPDF2", "pyarrow", "numpy"]
+# (role, menu) of pages that only show text, a form or a feed page
+LIGHT_PAGES = [
+    ("Teacher", "Login/Register"),
+    ("Teacher", "Post Announcement"),
+    ("Student", "View Announcements"),
+    ("Student", "View Lessons"),
+    ("Parent", "Curriculum Overview"),
+    ("Parent", "Communication Tools"),
+]
+
+
+def child(tree, mode, reruns):
+    os.chdir(tree)
+    sys.path.insert(0, tree)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(tree, "app.py"), default_timeout=120)
+    t = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - t
+    assert not at.exception, [e.value for e in at.exception]
+    out = {"cold": cold, "loaded": [m for m in HEAVY if m in sys.modules]}
+    if mode == "reruns":
+        out["pages"] = {}
+        for role, menu in LIGHT_PAGES:
+            at.sidebar.radio[1].set_value(role).run()
+            at.session_state[f"{role.lower()}_logged_in"] = True
+            at.session_state[f"{role.lower()}_username"] = "student1"
+            at.session_state["linked_student"] = "student1"
+            at.sidebar.radio[2].set_value(menu).run()
+            times = []
+            for _ in range(reruns):
+                t = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - t)
+            assert not at.exception, [e.value for e in at.exception]
+            out["pages"][f"{role} / {menu}"] = statistics.median(times)
+        out["loaded_after"] = [m for m in HEAVY if m in sys.modules]
+    print(json.dumps(out))
+
+
+def run_child(tree, mode, reruns):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", tree, "--mode", mode, "--reruns", str(reruns)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def export(ref):
+    tree = tempfile.mkdtemp(prefix="bench_startup_")
+    if ref is None:
+        shutil.copytree(ROOT, tree, dirs_exist_ok=True, ignore=shutil.ignore_patterns(".git", "benchmarks", "__pycache__"))
+    else:
+        archive = subprocess.run(["git", "-C", ROOT, "archive", ref], capture_output=True, check=True).stdout
+        subprocess.run(["tar", "-x", "-C", tree], input=archive, check=True)
+        shutil.rmtree(os.path.join(tree, "benchmarks"), ignore_errors=True)
+    return tree
+
+
+def report(label, tree, args):
+    colds = [run_child(tree, "cold", 0) for _ in range(args.cold)]
+    reruns = run_child(tree, "reruns", args.reruns)
+    print(f"{label}")
+    print(f"  cold start p50={statistics.median(c['cold'] for c in colds) * 1000:7.1f}ms  "
+          f"min={min(c['cold'] for c in colds) * 1000:7.1f}ms  ({args.cold} processes; "
+          f"heavy modules loaded: {', '.join(colds[0]['loaded']) or 'none'})")
+    for page, seconds in reruns["pages"].items():
+        print(f"  rerun p50 {page:<32} {seconds * 1000:7.1f}ms")
+    print(f"  median over light pages {statistics.median(reruns['pages'].values()) * 1000:7.1f}ms  "
+          f"(heavy modules loaded after visiting them: {', '.join(reruns['loaded_after']) or 'none'})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ref", help="also measure this git revision, e.g. HEAD~1")
+    parser.add_argument("--cold", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="cold", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.mode, args.reruns)
+    if args.ref:
+        report(f"{args.ref}:", export(args.ref), args)
+    report("working tree:", export(None), args)
+
+
+if __name__ == "__main__":
+    main()
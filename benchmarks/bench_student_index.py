@@ -0,0 +1,59 @@
+"""
+Parent dashboard reads: per-student index vs. filtering the whole results partition.
+
+    python benchmarks/bench_student_index.py [--students 2000] [--sizes 10000 100000 400000]
+
+For each school size, writes that many quiz results into a throwaway results store, then
+times one student's lookup through quiz_results_store.student_results (index shard) and
+through a full read + filter (what the dashboard did before), both in a fresh process
+state so neither benefits from the in-memory partition cache.
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 400_000])
+    parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_student_index_"))
+    import quiz_results_store as store
+    rng = random.Random(0)
+    students = [f"student{i:05d}" for i in range(args.students)]
+
+    for size in args.sizes:
+        shutil.rmtree(store.RESULTS_DIR, ignore_errors=True)
+        rows = [{"student": rng.choice(students), "quiz": f"Lesson {rng.randrange(50)}", "correct": rng.randrange(6),
+                 "total": 5, "timestamp": "2025-06-01 10:00:00"} for _ in range(size)]
+        store.append(store.LOCAL, rows)
+        t = time.perf_counter()
+        store.student_results(store.LOCAL, students[0])
+        build = time.perf_counter() - t
+
+        indexed, full = [], []
+        for student in rng.sample(students, args.lookups):
+            t = time.perf_counter()
+            store.student_results(store.LOCAL, student)
+            indexed.append(time.perf_counter() - t)
+            store._cache.clear()
+            t = time.perf_counter()
+            df = store.read(store.LOCAL)
+            df[df["student"] == student]
+            full.append(time.perf_counter() - t)
+        print(f"{size:>8} results: index p50={statistics.median(indexed) * 1000:7.2f}ms   "
+              f"full read+filter p50={statistics.median(full) * 1000:8.2f}ms   (one-off index build {build:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Benchmark suite: timed scenarios for every data helper and page-equivalent operation.
+
+    python benchmarks/run.py [--scale small] [--seed 1] [--only attendance] [--repeat 1.0]
+    python benchmarks/run.py --scale school --save-baseline
+    python benchmarks/run.py --scale school --fail-on-regression
+
+State comes from benchmarks/synth.py. It is generated once per (scale, seed, day) into
+--data (default: <tmp>/lms_bench/<scale>-<seed>) and reused on later runs. Every run works
+on a fresh copy of it, so scenarios that write never change what the next run sees.
+Scenarios run in-process against the stores and the view helpers in views/common.py,
+without Streamlit's runtime (see bench_startup.py for script and rerun cost).
+
+Results are compared with benchmarks/baseline.json for the same scale. A scenario counts
+as a regression when its p50 is more than --threshold (default 25%) and 1 ms slower than
+the baseline. Baselines are machine-specific: re-record them with --save-baseline on
+the machine that runs the comparison. Everything runs offline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synth  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 0.25
+MIN_REGRESSION_MS = 1.0
+
+SCENARIOS = []  # (name, func(ctx, i), setup(ctx, i) or None, repeat)
+
+
+def scenario(name, repeat=20, setup=None):
+    """Register func(ctx, i) as a timed scenario; setup(ctx, i) runs untimed before each call."""
+    def register(func):
+        SCENARIOS.append((name, func, setup, repeat))
+        return func
+    return register
+
+
+def _cold_data_cache(ctx, i):
+    import data_store
+    data_store.invalidate()
+
+
+def _cold_results_cache(ctx, i):
+    import quiz_results_store
+    quiz_results_store._cache.clear()
+
+
+# ---------- attendance ----------
+@scenario("attendance: append_attendance_records (whole roster, one day)", repeat=5)
+def _(ctx, i):
+    from views.common import append_attendance_records
+    status = "Absent" if i % 2 == 0 else "Present"
+    append_attendance_records([{"Date": ctx["today"], "Student": s, "Status": status} for s in ctx["students"]])
+
+
+@scenario("attendance: save_attendance_changes (10 edits)", repeat=10)
+def _(ctx, i):
+    from views.common import save_attendance_changes
+    status = "Absent" if i % 2 == 0 else "Present"
+    save_attendance_changes(ctx["today"], {s: status for s in ctx["students"][:10]})
+
+
+@scenario("attendance: cleanup_attendance (steady state)")
+def _(ctx, i):
+    from views.common import cleanup_attendance
+    cleanup_attendance()
+
+
+@scenario("attendance: read_day")
+def _(ctx, i):
+    import attendance_store
+    attendance_store.read_day(ctx["today"])
+
+
+@scenario("attendance: load_attendance_df (31 days)", repeat=3)
+def _(ctx, i):
+    from views.common import RETENTION_DAYS, load_attendance_df
+    today = date.fromisoformat(ctx["today"])
+    load_attendance_df(today - timedelta(days=RETENTION_DAYS - 1), today)
+
+
+@scenario("attendance: report records (30 days, both statuses)", repeat=5)
+def _(ctx, i):
+    import attendance_store
+    today = date.fromisoformat(ctx["today"])
+    attendance_store.matrix().records(today - timedelta(days=29), today, None, ["Present", "Absent"])
+
+
+@scenario("attendance: report summary per student (30 days)", repeat=5)
+def _(ctx, i):
+    import attendance_store
+    today = date.fromisoformat(ctx["today"])
+    attendance_store.matrix().summary(today - timedelta(days=29), today)
+
+
+@scenario("attendance: parent view student_records (31 days)")
+def _(ctx, i):
+    import attendance_store
+    today = date.fromisoformat(ctx["today"])
+    attendance_store.matrix().student_records(ctx["rng"].choice(ctx["students"]), today - timedelta(days=30), today)
+
+
+# ---------- roster and parent mapping ----------
+@scenario("roster: load_roster (cached)")
+def _(ctx, i):
+    from views.common import load_roster
+    load_roster()
+
+
+@scenario("roster: load_roster (cold)", repeat=5, setup=_cold_data_cache)
+def _(ctx, i):
+    from views.common import load_roster
+    load_roster()
+
+
+@scenario("parents: get_parent_student_mapping (cached)")
+def _(ctx, i):
+    from views.common import get_parent_student_mapping
+    get_parent_student_mapping()
+
+
+@scenario("parents: get_parent_student_mapping (cold)", repeat=5, setup=_cold_data_cache)
+def _(ctx, i):
+    from views.common import get_parent_student_mapping
+    get_parent_student_mapping()
+
+
+@scenario("parents: save_parent_student_mapping", repeat=3)
+def _(ctx, i):
+    from views.common import get_parent_student_mapping, save_parent_student_mapping
+    save_parent_student_mapping(get_parent_student_mapping())
+
+
+# ---------- auth ----------
+@scenario("auth: verify_user teacher (cold, full-strength hash)", repeat=synth.TEACHERS)
+def _(ctx, i):
+    import user_directory
+    assert user_directory.verify_user("teacher", f"teacher{i}", synth.TEACHER_PASSWORD.format(i))
+
+
+@scenario("auth: verify_user teacher (warm)")
+def _(ctx, i):
+    import user_directory
+    assert user_directory.verify_user("teacher", "teacher0", synth.TEACHER_PASSWORD.format(0))
+
+
+@scenario("auth: verify_user provisioned student (first login, re-hash)", repeat=5)
+def _(ctx, i):
+    import user_directory
+    username, password = ctx["credentials"][i]
+    assert user_directory.verify_user("student", username, password)
+
+
+@scenario("auth: get_user lookup (uncached)")
+def _(ctx, i):
+    import user_directory
+    user_directory.get_user("student", ctx["credentials"][100 + i][0])
+
+
+@scenario("auth: list_users student", repeat=5)
+def _(ctx, i):
+    import user_directory
+    user_directory.list_users("student")
+
+
+# ---------- quizzes and results ----------
+@scenario("quiz: generate_ranked_quiz (one lesson, distractor index)")
+def _(ctx, i):
+    from distractor_index import get_index
+    from quiz_generator import generate_ranked_quiz
+    with open(ctx["rng"].choice(ctx["lesson_paths"]), encoding="utf-8") as f:
+        generate_ranked_quiz(f.read(), 10, distractors=get_index())
+
+
+@scenario("quiz: generate_quiz (one lesson)")
+def _(ctx, i):
+    from quiz_generator import generate_quiz
+    with open(ctx["rng"].choice(ctx["lesson_paths"]), encoding="utf-8") as f:
+        generate_quiz(f.read())
+
+
+@scenario("quiz: list_quizzes (open only)")
+def _(ctx, i):
+    import quiz_catalog
+    quiz_catalog.list_quizzes(open_only=True)
+
+
+@scenario("results: read local partition (cached)")
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.read(quiz_results_store.LOCAL)
+
+
+@scenario("results: read local partition (cold)", repeat=3, setup=_cold_results_cache)
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.read(quiz_results_store.LOCAL)
+
+
+@scenario("results: read local partition this term (cold)", repeat=3, setup=_cold_results_cache)
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.read(quiz_results_store.LOCAL, since=quiz_results_store.hot_since())
+
+
+@scenario("results: archive (nothing due)", repeat=10)
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.archive_all()
+
+
+@scenario("results: student_results (per-student index)")
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.student_results(quiz_results_store.LOCAL, ctx["rng"].choice(ctx["students"]))
+
+
+@scenario("results: student_totals (all partitions)")
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.student_totals(ctx["rng"].choice(ctx["students"]))
+
+
+@scenario("results: to_csv local partition", repeat=3)
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.to_csv(quiz_results_store.LOCAL)
+
+
+@scenario("results: append one result (durable)", repeat=10)
+def _(ctx, i):
+    import quiz_results_store
+    quiz_results_store.append(quiz_results_store.LOCAL, [{
+        "student": ctx["students"][i], "quiz": "Benchmark", "correct": 3, "total": 5,
+        "timestamp": datetime.now().replace(microsecond=0),
+    }], durable=True)
+
+
+@scenario("grading: response_matrix + item_statistics (largest quiz)", repeat=5)
+def _(ctx, i):
+    import grading
+    kind, questions = ctx["largest_quiz"]
+    key, n_options = grading.answer_key(questions)
+    _, responses = grading.response_matrix(kind, len(questions))
+    grading.item_statistics(responses, key, n_options)
+
+
+@scenario("grading: regrade (largest quiz)", repeat=3)
+def _(ctx, i):
+    import grading
+    kind, questions = ctx["largest_quiz"]
+    grading.regrade(kind, questions)
+
+
+# ---------- lessons and progress ----------
+@scenario("lessons: search keyword")
+def _(ctx, i):
+    from lesson_index import search
+    search(ctx["rng"].choice(synth.VOCAB))
+
+
+@scenario("lessons: search phrase + keyword")
+def _(ctx, i):
+    from lesson_index import search
+    a, b = ctx["rng"].sample(synth.VOCAB, 2)
+    search(f'"the {a}" {b}')
+
+
+@scenario("lessons: re-upload an existing lesson (dedup + indexing)", repeat=10)
+def _(ctx, i):
+    import lesson_catalog
+    path = ctx["rng"].choice(ctx["lesson_paths"])
+    with open(path, "rb") as f:
+        lesson_catalog.store(f, f"Re-upload {i}{os.path.splitext(path)[1]}")
+    lesson_catalog.wait()
+
+
+@scenario("progress: completed_lessons (bitset)")
+def _(ctx, i):
+    from views.common import completed_lessons
+    completed_lessons(ctx["rng"].choice(ctx["students"]))
+
+
+@scenario("progress: is_done")
+def _(ctx, i):
+    import lesson_progress
+    lesson_progress.is_done(ctx["rng"].choice(ctx["students"]), ctx["rng"].choice(ctx["lessons"]))
+
+
+@scenario("progress: completion against the catalog")
+def _(ctx, i):
+    import lesson_progress
+    lesson_progress.completion(ctx["rng"].choice(ctx["students"]))
+
+
+@scenario("progress: mark_lesson_done", repeat=10)
+def _(ctx, i):
+    from views.common import mark_lesson_done
+    mark_lesson_done(ctx["rng"].choice(ctx["students"]), ctx["rng"].choice(ctx["lessons"]))
+
+
+# ---------- feeds and JSON state ----------
+@scenario("feeds: announcements newest page")
+def _(ctx, i):
+    from views.common import announcements_feed
+    announcements_feed().page(None)
+
+
+@scenario("feeds: parent messages, 50 pages deep")
+def _(ctx, i):
+    from views.common import messages_feed
+    feed, cursor = messages_feed(), None
+    for _ in range(50):
+        _, cursor = feed.page(cursor)
+
+
+@scenario("feeds: post announcement", repeat=10)
+def _(ctx, i):
+    from views.common import announcements_feed
+    announcements_feed().post({"message": "Benchmark", "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+
+@scenario("parent pages: activity timeline newest page (per-student index)")
+def _(ctx, i):
+    import activity_log
+    activity_log.page(ctx["rng"].choice(ctx["students"]))
+
+
+def _new_activity(ctx, i):
+    import activity_log
+    import alerts
+    alerts.evaluate()
+    activity_log.emit_many(
+        {"student_name": ctx["rng"].choice(ctx["students"]), "activity": "Attendance marked Absent", "kind": "attendance",
+         "date": ctx["today"], "status": "Absent"} for _ in range(100)
+    )
+
+
+@scenario("alerts: evaluate (nothing new)")
+def _(ctx, i):
+    import alerts
+    alerts.evaluate()
+
+
+@scenario("alerts: evaluate 100 new events", repeat=10, setup=_new_activity)
+def _(ctx, i):
+    import alerts
+    alerts.evaluate()
+
+
+@scenario("activity: emit one event", repeat=10)
+def _(ctx, i):
+    import activity_log
+    activity_log.emit(ctx["rng"].choice(ctx["students"]), "Benchmark event", kind="benchmark")
+
+
+def data_dir(args):
+    return args.data or os.path.join(tempfile.gettempdir(), "lms_bench", f"{args.scale}-{args.seed}")
+
+
+def prepare(args):
+    """Generate (or reuse) the synthetic state and return a fresh working copy of it."""
+    params = synth.params_for(args.scale, args.seed)
+    source = data_dir(args)
+    manifest = synth.load_manifest(source)
+    if manifest is None or any(manifest.get(k) != v for k, v in params.items()):
+        # In a separate process: the stores keep process-wide state keyed by relative paths
+        subprocess.run([sys.executable, synth.__file__, "--out", source, "--scale", args.scale, "--seed", str(args.seed)], check=True)
+        manifest = synth.load_manifest(source)
+    work = tempfile.mkdtemp(prefix="lms_bench_run_")
+    shutil.copytree(source, work, dirs_exist_ok=True)
+    return manifest, work
+
+
+def context(manifest):
+    import pandas as pd
+
+    import lesson_catalog
+    import quiz_catalog
+    from views.common import load_roster
+
+    creds = pd.read_csv(synth.CREDENTIALS, dtype=str)
+    students = creds[creds["Role"] == "student"]
+    largest = max(quiz_catalog.list_quizzes(), key=lambda q: q["n_questions"], default=None)
+    return {
+        "today": manifest["today"],
+        "students": load_roster(),
+        "credentials": list(zip(students["Username"], students["Initial Password"])),
+        "lessons": lesson_catalog.names(),
+        "lesson_paths": [lesson_catalog.path(name) for name in lesson_catalog.names()],
+        "largest_quiz": (quiz_catalog.results_kind(largest["id"]), quiz_catalog.get_questions(largest["id"])) if largest else None,
+        "rng": random.Random(manifest["seed"]),
+    }
+
+
+def run(args, manifest):
+    ctx = context(manifest)
+    results = {}
+    for name, func, setup, repeat in SCENARIOS:
+        if args.only and not any(o.lower() in name.lower() for o in args.only):
+            continue
+        if name.startswith("grading:") and ctx["largest_quiz"] is None:
+            continue
+        times = []
+        for i in range(max(1, round(repeat * args.repeat))):
+            if setup:
+                setup(ctx, i)
+            t = time.perf_counter()
+            func(ctx, i)
+            times.append(time.perf_counter() - t)
+        results[name] = {"p50_ms": round(statistics.median(times) * 1000, 3), "min_ms": round(min(times) * 1000, 3), "n": len(times)}
+        yield name, results[name]
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=synth.SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--data", help="directory for the generated state (reused across runs)")
+    parser.add_argument("--only", nargs="+", help="run scenarios whose name contains any of these")
+    parser.add_argument("--repeat", type=float, default=1.0, help="multiply every scenario's repetitions")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline for its scale")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    manifest, work = prepare(args)
+    os.chdir(work)
+    try:
+        baselines = json.load(open(args.baseline))
+    except (OSError, ValueError):
+        baselines = {}
+    baseline = baselines.get(args.scale, {}).get("results", {})
+    print(f"{args.scale} scale, seed {args.seed}: {manifest['students']:,} students, "
+          f"{manifest['students'] * manifest['attendance_days']:,} attendance rows, "
+          f"{manifest['quiz_results']:,} quiz results, {manifest['lessons']:,} lessons")
+    print(f"{'scenario':<66} {'p50 ms':>10} {'min ms':>10} {'baseline':>10} {'change':>8}")
+
+    results, regressions = {}, []
+    for name, r in run(args, manifest):
+        results[name] = r
+        base = baseline.get(name, {}).get("p50_ms")
+        change = ""
+        if base:
+            change = f"{(r['p50_ms'] - base) / base:+.0%}"
+            if r["p50_ms"] > base * (1 + args.threshold) and r["p50_ms"] - base > MIN_REGRESSION_MS:
+                regressions.append(name)
+                change += " !"
+        print(f"{name:<66} {r['p50_ms']:>10.2f} {r['min_ms']:>10.2f} {base if base else '-':>10} {change:>8}", flush=True)
+    shutil.rmtree(work, ignore_errors=True)
+
+    if args.save_baseline:
+        baselines[args.scale] = {
+            "recorded": datetime.now().strftime("%Y-%m-%d"),
+            "machine": machine(),
+            "data": {k: v for k, v in manifest.items() if k not in ("today", "seconds")},
+            "results": dict(sorted({**baseline, **results}.items())),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline for {args.scale} saved to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: " + "; ".join(regressions))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
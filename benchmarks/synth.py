@@ -0,0 +1,252 @@
+"""
+Seeded generator of realistic app state for the benchmark suite.
+
+    python benchmarks/synth.py --out DIR [--scale small] [--seed 1] [--students N ...]
+
+Writes everything the app reads into DIR through the app's own stores: roster, student and
+linked parent accounts, day-partitioned attendance, quiz results (practice quizzes and
+catalog quizzes with recorded answers, plus earlier years of practice results in the
+archive tier), text lessons with their search and distractor indexes, feeds, lesson
+completions, activity event log and notifications. The same scale, seed and date give
+the same data. A manifest (synth.json) records the parameters so
+benchmarks/run.py can reuse a generated directory instead of rebuilding it.
+
+Scales (attendance rows = students x attendance_days):
+    tiny    200 students,     8k attendance rows,   5k quiz results (+10k archived),    20 lessons
+    small   1k students,    100k attendance rows,  50k quiz results (+100k archived),  100 lessons
+    school  10k students,    1M attendance rows,  500k quiz results (+1M archived),    1k lessons
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCALES = {
+    "tiny": dict(students=200, attendance_days=40, quiz_results=5_000, history_results=10_000, lessons=20, quizzes=3,
+                 announcements=200, messages=500, progress=2_000, activity=1_000),
+    "small": dict(students=1_000, attendance_days=100, quiz_results=50_000, history_results=100_000, lessons=100, quizzes=10,
+                  announcements=1_000, messages=5_000, progress=20_000, activity=5_000),
+    "school": dict(students=10_000, attendance_days=100, quiz_results=500_000, history_results=1_000_000, lessons=1_000, quizzes=20,
+                   announcements=2_000, messages=20_000, progress=200_000, activity=50_000),
+}
+LAYOUT = 5  # bumped when the app's on-disk layout changes, so older generated data is rebuilt
+MANIFEST = "synth.json"
+CREDENTIALS = "synth_credentials.csv"
+TEACHERS = 8  # accounts with full-strength password hashes, for cold login timings
+TEACHER_PASSWORD = "teacher-pass-{}"
+ASSIGNED_SHARE = 0.4  # share of quiz results that come from catalog quizzes
+HISTORY_YEARS = 3  # history_results are spread over this many years before the hot window
+CHUNK = 100_000
+
+FIRST = ("Amara Ben Chen Diego Elif Farah Gita Hugo Ines Jonas Kofi Lena Mateo Nia Omar Priya "
+         "Quinn Rosa Sami Tara Uma Viktor Wen Xavi Yara Zane").split()
+LAST = ("Okafor Silva Nguyen Kowalski Haddad Larsen Mensah Ito Rossi Novak Adeyemi Fischer "
+        "Moreau Petrov Santos Tanaka Varga Weber Yilmaz Zhou").split()
+VOCAB = (
+    "photosynthesis chlorophyll membrane nucleus mitochondria enzyme protein molecule atom electron "
+    "gravity velocity acceleration momentum friction energy voltage current resistance magnet "
+    "equation fraction integer polynomial triangle theorem probability variable function graph "
+    "empire revolution treaty parliament colony dynasty constitution republic migration trade "
+    "ecosystem climate erosion volcano glacier continent latitude river delta population"
+).split()
+FILLER = "the a of and in to is that with for which by as are from during".split()
+
+
+def params_for(scale, seed, **overrides):
+    params = dict(SCALES[scale], scale=scale, seed=seed, today=date.today().isoformat(), layout=LAYOUT)
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    return params
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def student_names(n, rng):
+    return [f"{rng.choice(FIRST)} {rng.choice(LAST)} {i:05d}" for i in range(n)]
+
+
+def sentence(rng):
+    words = [rng.choice(VOCAB if rng.random() < 0.45 else FILLER) for _ in range(rng.randint(9, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def _log(msg, started):
+    print(f"  {msg:<48} {time.perf_counter() - started:7.1f}s", flush=True)
+
+
+def generate(out_dir, params):
+    """Generate state for params into out_dir (which is emptied first). Returns the manifest."""
+    import shutil
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    os.chdir(out_dir)
+    # Imported after the chdir: the stores resolve their default paths against the working directory
+    import numpy as np
+    import pandas as pd
+
+    import activity_log
+    import attendance_store
+    import data_store
+    import distractor_index
+    import grading
+    import lesson_catalog
+    import lesson_progress
+    import quiz_catalog
+    import quiz_results_store
+    import user_directory
+    from feed import get_feed
+    from views.common import ROSTER_FILE, provision_accounts
+
+    rng = random.Random(params["seed"])
+    np_rng = np.random.default_rng(params["seed"])
+    today = date.fromisoformat(params["today"])
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=8)
+    started = time.perf_counter()
+    print(f"generating {params['scale']} data (seed {params['seed']}) in {out_dir}")
+
+    students = student_names(params["students"], rng)
+    data_store.write_csv(ROSTER_FILE, pd.DataFrame({"Student": students}))
+    creds, _, _ = provision_accounts(students)
+    for i in range(TEACHERS):
+        user_directory.create_user("teacher", f"teacher{i}", TEACHER_PASSWORD.format(i))
+    creds.to_csv(CREDENTIALS, index=False)
+    _log(f"roster + {len(creds) + TEACHERS} accounts", started)
+
+    # Attendance: each student has their own attendance rate
+    rates = np_rng.uniform(0.7, 0.99, len(students))
+    for d in range(params["attendance_days"]):
+        present = np_rng.random(len(students)) < rates
+        day = (today - timedelta(days=d)).isoformat()
+        attendance_store.upsert_records(
+            {"Date": day, "Student": s, "Status": "Present" if p else "Absent"} for s, p in zip(students, present)
+        )
+    _log(f"{len(students) * params['attendance_days']:,} attendance rows", started)
+
+    # Lessons: plain-text modules with shared vocabulary, uploaded through the catalog
+    lessons = [f"Lesson {i:04d} {rng.choice(VOCAB)}.txt" for i in range(params["lessons"])]
+    for name in lessons:
+        text = "\n".join(sentence(rng) for _ in range(rng.randint(30, 80)))
+        lesson_catalog.store(io.BytesIO(text.encode("utf-8")), name)
+    lesson_catalog.wait()
+    deadline = time.monotonic() + 900
+    while distractor_index.get_index() is None and time.monotonic() < deadline:
+        time.sleep(0.2)
+    _log(f"{len(lessons)} lessons indexed", started)
+
+    # Quiz results: ability per student drives scores; catalog quizzes also record answers
+    ability = dict(zip(students, np_rng.beta(5, 2, len(students))))
+    n_assigned = int(params["quiz_results"] * ASSIGNED_SHARE) if params["quizzes"] else 0
+    n_local = params["quiz_results"] - n_assigned
+    span = params["attendance_days"] * 86400
+
+    def timestamps(n):
+        return [now - timedelta(seconds=int(s)) for s in np_rng.integers(0, span, n)]
+
+    for start in range(0, n_local, CHUNK):
+        n = min(CHUNK, n_local - start)
+        who = [students[i] for i in np_rng.integers(0, len(students), n)]
+        total = np_rng.integers(3, 11, n)
+        correct = np_rng.binomial(total, [ability[s] for s in who])
+        quiz_results_store.append(quiz_results_store.LOCAL, (
+            {"student": s, "quiz": rng.choice(lessons), "correct": int(c), "total": int(t), "timestamp": ts}
+            for s, c, t, ts in zip(who, correct, total, timestamps(n))
+        ))
+    for q in range(params["quizzes"]):
+        n_questions = rng.randint(5, 15)
+        questions = [{"question": sentence(rng), "options": [rng.choice(VOCAB) + str(k) for k in range(3)]}
+                     for _ in range(n_questions)]
+        for item in questions:
+            item["answer"] = rng.choice(item["options"])
+        quiz_id = quiz_catalog.create_quiz(f"Quiz {q + 1}: {rng.choice(VOCAB)}", questions,
+                                           section=rng.choice(["", "A", "B"]), quiz_id=f"{rng.getrandbits(40):010x}")
+        key, _ = grading.answer_key(questions)
+        n_rows = n_assigned // params["quizzes"]
+        for start in range(0, n_rows, CHUNK):
+            n = min(CHUNK, n_rows - start)
+            who = [students[i] for i in np_rng.integers(0, len(students), n)]
+            knows = np_rng.random((n, n_questions)) < np.array([ability[s] for s in who])[:, None]
+            answers = np.where(knows, key, np_rng.integers(0, 3, (n, n_questions))).astype(np.int8)
+            answers[np_rng.random((n, n_questions)) < 0.02] = grading.UNANSWERED
+            correct = grading.grade(answers, key)
+            quiz_results_store.append(quiz_catalog.results_kind(quiz_id), (
+                {"student": s, "quiz": f"Quiz {q + 1}", "correct": int(c), "total": n_questions, "timestamp": ts, "answers": a.tolist()}
+                for s, c, ts, a in zip(who, correct, timestamps(n), answers)
+            ))
+    # Earlier school years of practice results, moved to the archive tier as maintenance would
+    for start in range(0, params["history_results"], CHUNK):
+        n = min(CHUNK, params["history_results"] - start)
+        who = [students[i] for i in np_rng.integers(0, len(students), n)]
+        total = np_rng.integers(3, 11, n)
+        correct = np_rng.binomial(total, [ability[s] for s in who])
+        quiz_results_store.append(quiz_results_store.LOCAL, (
+            {"student": s, "quiz": rng.choice(lessons), "correct": int(c), "total": int(t),
+             "timestamp": now - timedelta(days=quiz_results_store.HOT_DAYS + 1, seconds=int(ago))}
+            for s, c, t, ago in zip(who, correct, total, np_rng.integers(0, HISTORY_YEARS * 365 * 86400, n))
+        ))
+    quiz_results_store.archive_all()
+    for kind in quiz_results_store.partitions():
+        quiz_results_store.compact(kind)
+    _log(f"{params['quiz_results']:,} quiz results ({params['quizzes']} catalog quizzes), "
+         f"{params['history_results']:,} archived", started)
+
+    # Feeds: posts spread over the attendance window, oldest first
+    announcements = get_feed("announcements")
+    for i in range(params["announcements"]):
+        ts = now - timedelta(seconds=span * (1 - i / params["announcements"]))
+        announcements.post({"message": " ".join(sentence(rng) for _ in range(3)), "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S")}, ts)
+    messages = get_feed("parent_messages")
+    for i in range(params["messages"]):
+        ts = now - timedelta(seconds=span * (1 - i / params["messages"]))
+        messages.post({"timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"), "student_name": rng.choice(students),
+                       "message": sentence(rng)}, ts)
+    _log(f"{params['announcements']:,} announcements, {params['messages']:,} messages", started)
+
+    # Lesson completions, activity log and notifications
+    lesson_progress.mark_many((rng.choice(students), rng.choice(lessons)) for _ in range(params["progress"]))
+    activities = ["Completed a lesson", "Took a quiz", "Viewed announcements", "Logged in"]
+    activity_log.emit_many(sorted((
+        {"timestamp": (now - timedelta(seconds=rng.randrange(span))).strftime("%Y-%m-%d %H:%M:%S"),
+         "student_name": rng.choice(students), "activity": rng.choice(activities)}
+        for _ in range(params["activity"])
+    ), key=lambda e: e["timestamp"]))
+    data_store.write_json("notifications.json", [
+        {"timestamp": (now - timedelta(seconds=rng.randrange(span))).strftime("%Y-%m-%d %H:%M:%S"),
+         "student_name": rng.choice(students), "message": "Missed a quiz deadline"}
+        for _ in range(params["activity"] // 10)
+    ])
+    _log(f"{params['progress']:,} lesson completions, {params['activity']:,} activity entries", started)
+
+    manifest = dict(params, seconds=round(time.perf_counter() - started, 1))
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name)
+    args = parser.parse_args()
+    overrides = {name: getattr(args, name) for name in SCALES["small"]}
+    manifest = generate(os.path.abspath(args.out), params_for(args.scale, args.seed, **overrides))
+    print(f"done in {manifest['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import copy
+import json
+import os
+import threading
+
+import metrics
+
+# ---------------- Cached data access ----------------
+# Parsed JSON/CSV state shared by every session of the process. Entries are keyed by
+# path (+ read options) and validated against the file's mtime and size on each read,
+# so a write from anywhere (this process, another process, a text editor) invalidates them.
+
+_cache = {}  # (kind, path, options) -> (mtime_ns, size, value)
+_stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached(kind, path, options, parse):
+    key = (kind, path, options)
+    sig = _signature(path)
+    if sig is None:
+        with _lock:
+            _cache.pop(key, None)
+        return None
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[:2] == sig:
+            _stats["hits"] += 1
+            return entry[2]
+        _stats["misses"] += 1
+    with metrics.parse_timer(kind):
+        value = parse()
+    metrics.record_io("read", sig[1])
+    with _lock:
+        _cache[key] = (*sig, value)
+    return value
+
+
+def read_json(path, default=None, mutable=False):
+    """
+    Parsed contents of a JSON file, or default if it does not exist.
+    The cached object is shared; pass mutable=True to get a private copy to edit.
+    """
+    def parse():
+        with open(path, "r") as f:
+            return json.load(f)
+    value = _cached("json", path, None, parse)
+    if value is None:
+        return copy.deepcopy(default)
+    return copy.deepcopy(value) if mutable else value
+
+
+def read_csv(path, **kwargs):
+    """
+    Cached pd.read_csv(path, **kwargs), or None if the file does not exist.
+    The DataFrame is shared between sessions: filter or copy it, never modify it in place.
+    """
+    import pandas as pd  # only pages that read CSV state pay for the import
+
+    options = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+    return _cached("csv", path, options, lambda: pd.read_csv(path, **kwargs))
+
+
+def write_json(path, obj, indent=2):
+    """Atomically replace a JSON file and drop its cache entries."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, indent=indent)
+        metrics.record_io("write", f.tell())
+    os.replace(tmp, path)
+    invalidate(path)
+
+
+def append_csv(path, df):
+    """Append DataFrame rows to a CSV, writing the header only for a new file."""
+    exists = os.path.exists(path)
+    before = os.path.getsize(path) if exists else 0
+    df.to_csv(path, mode="a", header=not exists, index=False)
+    metrics.record_io("write", os.path.getsize(path) - before)
+    invalidate(path)
+
+
+def append_lines(path, lines):
+    """Append raw text lines (e.g. header-less CSV rows) to a file."""
+    with open(path, "a") as f:
+        start = f.tell()
+        f.writelines(f"{line}\n" for line in lines)
+        metrics.record_io("write", f.tell() - start)
+    invalidate(path)
+
+
+def write_csv(path, df):
+    df.to_csv(path, index=False)
+    metrics.record_io("write", os.path.getsize(path))
+    invalidate(path)
+
+
+def remove(path):
+    """Delete a state file if present."""
+    if os.path.exists(path):
+        os.remove(path)
+    invalidate(path)
+
+
+def invalidate(path=None):
+    """Forget cached parses of path (or of everything)."""
+    with _lock:
+        for key in [k for k in _cache if path is None or k[1] == path]:
+            del _cache[key]
+
+
+def cache_stats():
+    """Hit/miss counters and number of cached parses for this process."""
+    with _lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "hit_rate": _stats["hits"] / total if total else 0.0,
+            "entries": len(_cache),
+        }
+
+
+metrics.register_collector(lambda: [
+    ("lms_cache_requests_total", {"cache": "data_store", "result": "hit"}, _stats["hits"]),
+    ("lms_cache_requests_total", {"cache": "data_store", "result": "miss"}, _stats["misses"]),
+])
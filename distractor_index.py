@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lesson_catalog import is_blob
+from pdf_text import extract_pages, file_sha256
+from quiz_generator import iter_sentences, tokenize
+
+# ---------------- Distractor index config ----------------
+INDEX_ROOT = ".distractor_index"
+CONTENT_DIR = "content"
+COOC_WINDOW = 3  # keywords this close together in a sentence count as co-occurring
+COOC_TOP_K = 8
+SUFFIXES = ("tion", "sion", "ment", "ness", "ity", "ing", "ed", "ly", "al", "er", "es", "s")
+
+_current = {}  # "signature" / "index" of the latest loaded index, shared by every session in the process
+_building = set()
+_failed = set()  # signatures whose build raised; not retried until the corpus changes again
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="distractor-index")
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+
+
+def lesson_paths(content_dir=CONTENT_DIR):
+    """
+    One path per distinct lesson content, sorted. A file adopted into the lesson catalog is
+    kept next to its content/<sha256> blob and would otherwise be indexed twice.
+    """
+    if not os.path.exists(content_dir):
+        return []
+    by_sha = {}
+    # Blobs first, so they win over the loose originals they were copied from
+    for name in sorted(os.listdir(content_dir), key=lambda n: (not is_blob(n), n)):
+        path = os.path.join(content_dir, name)
+        if name.lower().endswith((".pdf", ".txt")) and os.path.isfile(path):
+            by_sha.setdefault(file_sha256(path), path)
+    return sorted(by_sha.values())
+
+
+def corpus_signature(paths):
+    """Hash of the lesson contents; changes whenever any lesson is added, removed or edited."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(file_sha256(path).encode())
+    return h.hexdigest()[:16]
+
+
+def shape_bucket(term, freq):
+    """Word-shape bucket: length band, log2 frequency band and suffix class."""
+    suffix = next((i for i, s in enumerate(SUFFIXES) if term.endswith(s)), len(SUFFIXES))
+    return min(len(term), 15) * 1000 + min(int(math.log2(max(freq, 1))), 15) * 20 + suffix
+
+
+def _csr(groups, n):
+    """Pack a list of n id lists into (offsets, values) arrays."""
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(g) for g in groups])
+    values = np.fromiter((v for g in groups for v in g), dtype=np.int32, count=int(offsets[-1]))
+    return offsets, values
+
+
+def build(paths, out_dir):
+    """Scan the lessons once and write the term, bucket and co-occurrence arrays to out_dir."""
+    freq = Counter()
+    pairs = Counter()
+    for path in paths:
+        for sentence in iter_sentences(extract_pages(path)):
+            terms = tokenize(sentence)
+            freq.update(terms)
+            for i, a in enumerate(terms):
+                for b in terms[i + 1:i + 1 + COOC_WINDOW]:
+                    if a != b:
+                        pairs[(a, b)] += 1
+                        pairs[(b, a)] += 1
+
+    terms = sorted(freq)
+    ids = {t: i for i, t in enumerate(terms)}
+    counts = np.array([freq[t] for t in terms], dtype=np.int32)
+    buckets = np.array([shape_bucket(t, freq[t]) for t in terms], dtype=np.int32)
+
+    # Terms of each bucket, most frequent first
+    by_bucket = defaultdict(list)
+    for tid in np.argsort(-counts, kind="stable"):
+        by_bucket[int(buckets[tid])].append(int(tid))
+    bucket_keys = np.array(sorted(by_bucket), dtype=np.int32)
+    bucket_offsets, bucket_terms = _csr([by_bucket[int(k)] for k in bucket_keys], len(bucket_keys))
+    # Position of each term inside its bucket, so lookups can start from its frequency neighbours
+    bucket_rank = np.zeros(len(terms), dtype=np.int32)
+    for members in by_bucket.values():
+        for rank, tid in enumerate(members):
+            bucket_rank[tid] = rank
+
+    neighbours = defaultdict(list)
+    for (a, b), n in pairs.items():
+        neighbours[a].append((n, b))
+    cooc = [
+        [ids[b] for _, b in sorted(neighbours[t], reverse=True)[:COOC_TOP_K]]
+        for t in terms
+    ]
+    cooc_offsets, cooc_terms = _csr(cooc, len(terms))
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    with open(os.path.join(tmp_dir, "terms.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(terms))
+    arrays = {
+        "freq": counts, "bucket": buckets, "bucket_rank": bucket_rank,
+        "bucket_keys": bucket_keys, "bucket_offsets": bucket_offsets, "bucket_terms": bucket_terms,
+        "cooc_offsets": cooc_offsets, "cooc_terms": cooc_terms,
+    }
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), arr)
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump({"lessons": [os.path.basename(p) for p in paths], "terms": len(terms)}, f)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+class DistractorIndex:
+    """Read-only view of a built index; the arrays are memory-mapped, not copied."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "terms.txt"), encoding="utf-8") as f:
+            self.terms = f.read().split("\n")
+        self.ids = {t: i for i, t in enumerate(self.terms)}
+        load = lambda name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        self.freq = load("freq")
+        self.bucket = load("bucket")
+        self.bucket_rank = load("bucket_rank")
+        self.bucket_offsets = load("bucket_offsets")
+        self.bucket_terms = load("bucket_terms")
+        self.cooc_offsets = load("cooc_offsets")
+        self.cooc_terms = load("cooc_terms")
+        self.bucket_slot = {int(k): i for i, k in enumerate(load("bucket_keys"))}
+
+    def __contains__(self, word):
+        return word.lower() in self.ids
+
+    def suggest(self, word, k=3, exclude=(), rng=random):
+        """
+        Up to k plausible wrong answers for word: topical neighbours of similar length
+        first, then terms of the same shape and frequency band. Constant work per call.
+        """
+        tid = self.ids.get(word.lower())
+        if tid is None:
+            return []
+        skip = {w.lower() for w in exclude} | {word.lower()}
+        picked = []
+
+        def take(candidate_id):
+            term = self.terms[candidate_id]
+            if term not in skip:
+                skip.add(term)
+                picked.append(term)
+
+        start, end = self.cooc_offsets[tid], self.cooc_offsets[tid + 1]
+        for cid in self.cooc_terms[start:end]:
+            if len(picked) >= k:
+                break
+            if abs(len(self.terms[cid]) - len(word)) <= 3:
+                take(int(cid))
+
+        slot = self.bucket_slot[int(self.bucket[tid])]
+        start, end = int(self.bucket_offsets[slot]), int(self.bucket_offsets[slot + 1])
+        # Sample from a small window of frequency neighbours inside the bucket
+        rank = start + int(self.bucket_rank[tid])
+        window = list(range(max(start, rank - 4 * k), min(end, rank + 4 * k + 1)))
+        rng.shuffle(window)
+        for pos in window:
+            if len(picked) >= k:
+                break
+            take(int(self.bucket_terms[pos]))
+
+        return [match_case(t, word) for t in picked]
+
+
+def match_case(term, like):
+    """Spell term with the capitalization pattern of like, so options don't give the answer away."""
+    if like.isupper():
+        return term.upper()
+    if like[:1].isupper():
+        return term.capitalize()
+    return term
+
+
+def _build_and_load(paths, signature, root):
+    out_dir = os.path.join(root, signature)
+    try:
+        if not os.path.exists(os.path.join(out_dir, "manifest.json")):
+            build(paths, out_dir)
+        index = DistractorIndex(out_dir)
+        with _lock:
+            _current.update(signature=signature, index=index)
+        # Older corpus versions are no longer needed
+        for name in os.listdir(root):
+            if name != signature:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    except Exception:
+        logger.exception("distractor index build for corpus %s failed", signature)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        with _lock:
+            _failed.add(signature)
+    finally:
+        with _lock:
+            _building.discard(signature)
+
+
+def get_index(content_dir=CONTENT_DIR, root=INDEX_ROOT):
+    """
+    Return the distractor index for the current lessons. After the corpus changes it is
+    rebuilt in the background; until then the previous index (or None) is returned. A corpus
+    whose build failed keeps the previous index until the lessons change again.
+    """
+    paths = lesson_paths(content_dir)
+    if not paths:
+        return None
+    signature = corpus_signature(paths)
+    with _lock:
+        index = _current.get("index")
+        if _current.get("signature") == signature or signature in _building or signature in _failed:
+            return index
+        _building.add(signature)
+    os.makedirs(root, exist_ok=True)
+    _builder.submit(_build_and_load, paths, signature, root)
+    return index
@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+import store_utils
+
+# ---------------- Feed config ----------------
+# Each feed is an append-only JSONL log (one post per line, ids strictly increasing in file
+# order) plus a small sidecar log of deleted ids. Reads seek from the end or binary-search
+# by id, so a page costs the same however many posts the feed holds.
+FEED_DIR = "feeds"
+PAGE_SIZE = 20
+COMPACT_AFTER_DELETES = 64  # rewrite the log once this many tombstones pile up
+READ_BLOCK = 64 * 1024
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _to_id(ts):
+    """Microsecond epoch id for a datetime or 'YYYY-MM-DD HH:MM:SS' string."""
+    if not isinstance(ts, datetime):
+        ts = datetime.strptime(str(ts)[:19], TIMESTAMP_FORMAT)
+    return round(ts.timestamp() * 1_000_000)
+
+
+def _parse(line):
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return None  # torn write at the tail, or a line being appended right now
+    return item if isinstance(item, dict) and "id" in item else None
+
+
+class Feed:
+    """Newest-first feed of dict posts with cursor paging and tombstone deletes."""
+
+    def __init__(self, name, feed_dir=FEED_DIR):
+        self.name = name
+        self.dir = feed_dir
+        self.log_path = os.path.join(feed_dir, f"{name}.jsonl")
+        self.deleted_path = os.path.join(feed_dir, f"{name}.deleted")
+        self.lock_path = os.path.join(feed_dir, f"{name}.lock")
+        self._lock = threading.Lock()
+        self._deleted = (None, frozenset())  # (signature of the sidecar file, ids)
+
+    # ---------- locking ----------
+    def _exclusive(self):
+        """Serialize writers across threads and (where flock exists) processes."""
+        return store_utils.exclusive(self._lock, self.lock_path)
+
+    # ---------- writes ----------
+    def post(self, data, ts=None):
+        """Append a post (a dict) and return its id. ts (datetime) defaults to now."""
+        ts = ts or datetime.now()
+        with self._exclusive():
+            last = self._last_id()
+            item_id = max(_to_id(ts), last + 1)
+            line = json.dumps({"id": item_id, **data}, ensure_ascii=False) + "\n"
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+        return item_id
+
+    def delete(self, item_id):
+        """Tombstone a post; the log is compacted once enough tombstones accumulate."""
+        with self._exclusive():
+            with open(self.deleted_path, "a") as f:
+                f.write(f"{int(item_id)}\n")
+            if len(self._deleted_ids()) >= COMPACT_AFTER_DELETES:
+                self._compact()
+
+    def compact(self):
+        """Rewrite the log without deleted posts and clear the tombstones."""
+        with self._exclusive():
+            self._compact()
+
+    def _compact(self):
+        deleted = self._deleted_ids()
+        if os.path.exists(self.log_path):
+            tmp = self.log_path + ".tmp"
+            with open(self.log_path, "rb") as src, open(tmp, "wb") as dst:
+                for line in src:
+                    item = _parse(line)
+                    if item is not None and item["id"] not in deleted:
+                        dst.write(line)
+            os.replace(tmp, self.log_path)
+        if os.path.exists(self.deleted_path):
+            os.remove(self.deleted_path)
+
+    # ---------- reads ----------
+    def _deleted_ids(self):
+        try:
+            st = os.stat(self.deleted_path)
+            sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return frozenset()
+        if self._deleted[0] != sig:
+            with open(self.deleted_path) as f:
+                self._deleted = (sig, frozenset(int(x) for x in f.read().split() if x.isdigit()))
+        return self._deleted[1]
+
+    def _last_id(self):
+        for _, item in self._backward(None):
+            return item["id"]
+        return 0
+
+    def _backward(self, end):
+        """Yield (offset, item) from the line ending at byte offset end (None = EOF) towards the start."""
+        try:
+            f = open(self.log_path, "rb")
+        except OSError:
+            return
+        with f:
+            pos = f.seek(0, os.SEEK_END) if end is None else end
+            tail = b""
+            while pos > 0:
+                size = min(READ_BLOCK, pos)
+                pos -= size
+                f.seek(pos)
+                chunk = f.read(size) + tail
+                lines = chunk.split(b"\n")
+                # The first piece may be the second half of a line that starts in an earlier block
+                tail = lines[0]
+                offset = pos + len(tail) + 1
+                complete = []
+                for line in lines[1:]:
+                    complete.append((offset, line))
+                    offset += len(line) + 1
+                for start, line in reversed(complete):
+                    item = _parse(line) if line else None
+                    if item is not None:
+                        yield start, item
+            if tail:
+                item = _parse(tail)
+                if item is not None:
+                    yield 0, item
+
+    def _offset_of(self, target_id):
+        """Byte offset of the first post with id >= target_id (binary search over line starts)."""
+        try:
+            f = open(self.log_path, "rb")
+        except OSError:
+            return 0
+        with f:
+            hi = f.seek(0, os.SEEK_END)
+            lo = 0  # always a line start; every post before it has id < target_id
+            while hi - lo > READ_BLOCK:
+                mid = (lo + hi) // 2
+                f.seek(mid)
+                f.readline()
+                pos = f.tell()
+                if pos >= hi:
+                    break
+                item = _parse(f.readline())
+                if item is not None and item["id"] < target_id:
+                    lo = f.tell()
+                else:
+                    hi = pos
+            f.seek(lo)
+            while lo < hi:
+                line = f.readline()
+                if not line:
+                    break
+                item = _parse(line)
+                if item is not None and item["id"] >= target_id:
+                    return lo
+                lo += len(line)
+            return lo
+
+    def page(self, before=None, limit=PAGE_SIZE):
+        """
+        Up to limit posts older than the cursor `before` (an id; None = newest), newest first,
+        and the cursor for the next older page (None when there are no more).
+        """
+        deleted = self._deleted_ids()
+        end = None if before is None else self._offset_of(before)
+        items = []
+        for _, item in self._backward(end):
+            if item["id"] in deleted:
+                continue
+            if len(items) == limit:
+                return items, items[-1]["id"]
+            items.append(item)
+        return items, None
+
+    def since(self, ts, limit=PAGE_SIZE):
+        """Posts at or after ts (datetime or timestamp string), newest first, at most limit."""
+        deleted = self._deleted_ids()
+        start = self._offset_of(_to_id(ts))
+        items = []
+        for offset, item in self._backward(None):
+            if offset < start or len(items) == limit:
+                break
+            if item["id"] not in deleted:
+                items.append(item)
+        return items
+
+    def is_empty(self):
+        return self.page(limit=1)[0] == []
+
+    def clear(self):
+        with self._exclusive():
+            for path in (self.log_path, self.deleted_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def import_json(self, json_path):
+        """
+        One-off migration of a legacy JSON array of posts with a 'timestamp' field:
+        appended oldest first so ids follow the original order, then the file is removed.
+        """
+        if not os.path.exists(json_path):
+            return
+        with self._exclusive():
+            if not os.path.exists(json_path):
+                return
+            try:
+                with open(json_path, "r") as f:
+                    posts = json.load(f)
+            except (OSError, ValueError):
+                posts = []
+            last = self._last_id()
+            rows = []
+            for post in sorted((p for p in posts if isinstance(p, dict)), key=lambda p: str(p.get("timestamp", ""))):
+                try:
+                    item_id = _to_id(post["timestamp"])
+                except (KeyError, ValueError):
+                    item_id = 0
+                last = max(item_id, last + 1)
+                rows.append(json.dumps({"id": last, **post}, ensure_ascii=False) + "\n")
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.writelines(rows)
+            os.remove(json_path)
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(name, legacy_json=None, feed_dir=FEED_DIR):
+    """Process-wide Feed for name, importing legacy_json on first use if it still exists."""
+    with _feeds_lock:
+        feed = _feeds.get((feed_dir, name))
+        if feed is None:
+            feed = _feeds[(feed_dir, name)] = Feed(name, feed_dir)
+    if legacy_json:
+        feed.import_json(legacy_json)
+    return feed
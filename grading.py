@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import quiz_results_store
+
+# ---------------- Grading config ----------------
+# Answer keys and responses are int8 option indices: key[q] is the correct option of
+# question q, responses[s, q] the option submission s chose (-1 = unanswered).
+UNANSWERED = -1
+DISCRIMINATION_GROUP = 0.27  # share of top/bottom scorers compared for the discrimination index
+
+
+def answer_key(questions):
+    """(key, n_options) int8/int16 arrays for a list of {"question", "options", "answer"} dicts."""
+    key = np.array([q["options"].index(q["answer"]) if q["answer"] in q["options"] else UNANSWERED
+                    for q in questions], dtype=np.int8)
+    n_options = np.array([len(q["options"]) for q in questions], dtype=np.int16)
+    return key, n_options
+
+
+def encode_answers(questions, selected):
+    """Option indices for one submission; selected maps question index -> chosen option text."""
+    return [q["options"].index(selected[i]) if selected.get(i) in q["options"] else UNANSWERED
+            for i, q in enumerate(questions)]
+
+
+def grade(responses, key):
+    """Correct answers per submission: responses (n_submissions, n_questions) against key."""
+    responses = np.atleast_2d(responses)
+    return ((responses == key) & (key != UNANSWERED)).sum(axis=1).astype(np.int32)
+
+
+def response_matrix(kind, n_questions, results_dir=quiz_results_store.RESULTS_DIR):
+    """
+    (rows, responses) for a results partition: rows are the positions of submissions that
+    captured answers for exactly n_questions questions, responses their (n, n_questions) int8 matrix.
+    """
+    answers = quiz_results_store.read_table(kind, ["answers"], results_dir).column("answers").combine_chunks()
+    lengths = answers.value_lengths().fill_null(0).to_numpy(zero_copy_only=False)
+    rows = np.flatnonzero(lengths == n_questions)
+    if not len(rows):
+        return rows, np.empty((0, n_questions), dtype=np.int8)
+    flat = answers.take(pa.array(rows)).flatten().to_numpy(zero_copy_only=False)
+    return rows, flat.astype(np.int8).reshape(len(rows), n_questions)
+
+
+def item_statistics(responses, key, n_options):
+    """
+    Per-question statistics for the teacher view:
+    difficulty (share correct), discrimination (top minus bottom DISCRIMINATION_GROUP by total
+    score), point-biserial correlation with the rest of the test, unanswered rate and
+    the selection rate of every option.
+    """
+    n_sub, n_q = responses.shape
+    correct = (responses == key) & (key != UNANSWERED)
+    totals = correct.sum(axis=1)
+    difficulty = correct.mean(axis=0) if n_sub else np.zeros(n_q)
+
+    order = np.argsort(totals, kind="stable")
+    group = max(1, int(round(n_sub * DISCRIMINATION_GROUP))) if n_sub else 0
+    if n_sub >= 2:
+        discrimination = correct[order[-group:]].mean(axis=0) - correct[order[:group]].mean(axis=0)
+    else:
+        discrimination = np.full(n_q, np.nan)
+
+    # Corrected item-total correlation: each item against the score on the other items
+    rest = totals[:, None] - correct
+    item = correct - correct.mean(axis=0)
+    rest_c = rest - rest.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        point_biserial = (item * rest_c).sum(axis=0) / np.sqrt((item ** 2).sum(axis=0) * (rest_c ** 2).sum(axis=0))
+
+    # Option counts for all questions in one bincount: bucket 0 is "unanswered"
+    width = int(n_options.max()) + 1 if len(n_options) else 1
+    buckets = np.arange(n_q) * width + (responses.astype(np.int64) + 1)
+    counts = np.bincount(buckets.ravel(), minlength=n_q * width).reshape(n_q, width)
+    rates = counts / max(n_sub, 1)
+
+    stats = pd.DataFrame({
+        "Question": np.arange(1, n_q + 1),
+        "Difficulty (p)": difficulty.round(3),
+        "Discrimination (D)": np.round(discrimination, 3),
+        "Item-rest r": np.round(point_biserial, 3),
+        "Unanswered": rates[:, 0].round(3),
+    })
+    option_rates = pd.DataFrame(rates[:, 1:].round(3), columns=[f"Option {i + 1}" for i in range(width - 1)])
+    # Options a question does not have are blank rather than 0
+    option_rates = option_rates.mask(np.arange(width - 1)[None, :] >= n_options[:, None])
+    return pd.concat([stats, option_rates], axis=1)
+
+
+def regrade(kind, questions, results_dir=quiz_results_store.RESULTS_DIR):
+    """
+    Re-score every submission of a partition against the current answer key and persist the
+    new correct counts. Submissions without captured answers keep their score. Returns the
+    number of submissions whose score changed.
+    """
+    key, _ = answer_key(questions)
+    changed = 0
+
+    def transform(table):
+        nonlocal changed
+        answers = table.column("answers").combine_chunks()
+        lengths = answers.value_lengths().fill_null(0).to_numpy(zero_copy_only=False)
+        rows = np.flatnonzero(lengths == len(key))
+        correct = table.column("correct").to_numpy().copy()
+        if len(rows):
+            flat = answers.take(pa.array(rows)).flatten().to_numpy(zero_copy_only=False).astype(np.int8)
+            scores = grade(flat.reshape(len(rows), len(key)), key)
+            changed = int((correct[rows] != scores).sum())
+            correct[rows] = scores
+        idx = table.schema.get_field_index("correct")
+        return table.set_column(idx, "correct", pa.array(correct, type=pa.int32()))
+
+    quiz_results_store.rewrite(kind, transform, results_dir)
+    return changed
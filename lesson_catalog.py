@@ -0,0 +1,260 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+import data_store
+import metrics
+
+# ---------------- Lesson catalog config ----------------
+# Lesson files are stored once per distinct content as content/<sha256>.<ext>, so the same
+# PDF uploaded under several names takes the space (and the extraction work) of one. The
+# display names teachers see map to those blobs in lesson_catalog.json, which also keeps
+# what post-processing found out about each blob (pages, words, status). Lesson files put into
+# content/ by hand (or uploaded before the catalog existed) are adopted by the maintenance
+# thread: copied into a blob and left where they are, so a checkout's own lessons stay intact.
+CONTENT_DIR = "content"
+CATALOG_FILE = "lesson_catalog.json"
+INCOMING_DIR = os.path.join(CONTENT_DIR, ".incoming")
+LESSON_TYPES = (".pdf", ".txt")
+CHUNK_SIZE = 1024 * 1024
+POSTPROCESS_WORKERS = int(os.environ.get("POSTPROCESS_WORKERS", "2"))
+BLOB_RE = re.compile(r"^[0-9a-f]{64}\.(pdf|txt)$")
+EMPTY = {"lessons": {}, "blobs": {}, "adopted": {}}
+INCOMING_MAX_AGE = 3600  # seconds after which an unfinished upload in .incoming/ is abandoned
+
+_pool = ThreadPoolExecutor(max_workers=POSTPROCESS_WORKERS, thread_name_prefix="lesson-postprocess")
+_jobs = {}  # blob -> Future of its post-processing
+_stages = {}  # blob -> step a running job is at
+_again = set()  # blobs that got another name while their job was running
+_lock = threading.RLock()
+_started = False
+
+
+def is_blob(filename):
+    """True for content-addressed file names (<sha256>.pdf / .txt)."""
+    return bool(BLOB_RE.match(filename))
+
+
+def _load(mutable=False):
+    return data_store.read_json(CATALOG_FILE, EMPTY, mutable=mutable)
+
+
+def _start():
+    """Once per process: resume post-processing that a previous process did not finish."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+        for blob, info in _load()["blobs"].items():
+            if info["status"] not in ("ready", "failed"):
+                _submit(blob)
+
+
+def adopt_loose_files():
+    """
+    Store lesson files lying in content/ under their file name (maintenance task). The
+    originals are kept; each is adopted again only when its size or mtime changes.
+    Returns the number adopted.
+    """
+    if not os.path.isdir(CONTENT_DIR):
+        return 0
+    adopted = 0
+    for name in sorted(os.listdir(CONTENT_DIR)):
+        path = os.path.join(CONTENT_DIR, name)
+        if is_blob(name) or not name.lower().endswith(LESSON_TYPES) or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        version = [stat.st_mtime_ns, stat.st_size]
+        if _load().get("adopted", {}).get(name) == version:
+            continue
+        with open(path, "rb") as f:
+            store(f, name)
+        with _lock:
+            catalog = _load(mutable=True)
+            catalog.setdefault("adopted", {})[name] = version
+            data_store.write_json(CATALOG_FILE, catalog)
+        adopted += 1
+    return adopted
+
+
+def sweep_incoming(max_age=INCOMING_MAX_AGE):
+    """Delete partial uploads left in content/.incoming by interrupted copies (maintenance task)."""
+    cutoff = time.time() - max_age
+    removed = 0
+    for name in os.listdir(INCOMING_DIR) if os.path.isdir(INCOMING_DIR) else []:
+        path = os.path.join(INCOMING_DIR, name)
+        try:
+            if name.endswith(".part") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue  # finished (or swept) meanwhile
+    return removed
+
+
+def lessons():
+    """Display name -> {"blob", "size", "uploaded"} of every lesson."""
+    _start()
+    return _load()["lessons"]
+
+
+def names():
+    """Display names of all lessons, sorted."""
+    return sorted(lessons(), key=str.lower)
+
+
+def path(name, content_dir=CONTENT_DIR):
+    """File holding the lesson called name, or None if there is no such lesson."""
+    entry = lessons().get(name)
+    return os.path.join(content_dir, entry["blob"]) if entry else None
+
+
+def store(stream, name, process=True):
+    """
+    Copy a lesson from a binary file object into content-addressed storage, chunk by chunk,
+    and map name to it (replacing what name pointed to before). Returns (entry, duplicate);
+    duplicate is True when the same content was already stored. Unless process is False,
+    the lesson is queued for post-processing.
+    """
+    name = os.path.basename(name)
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in LESSON_TYPES:
+        raise ValueError(f"Unsupported lesson file type: {name}")
+    os.makedirs(INCOMING_DIR, exist_ok=True)
+    tmp = os.path.join(INCOMING_DIR, f"{uuid.uuid4().hex}.part")
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    metrics.record_io("write", size)
+    blob = h.hexdigest() + ext
+    blob_path = os.path.join(CONTENT_DIR, blob)
+    entry = {"blob": blob, "size": size, "uploaded": time.strftime("%Y-%m-%d %H:%M:%S")}
+    with _lock:
+        duplicate = os.path.exists(blob_path)
+        if duplicate:
+            os.remove(tmp)
+        else:
+            os.replace(tmp, blob_path)
+        catalog = _load(mutable=True)
+        previous = catalog["lessons"].get(name)
+        catalog["lessons"][name] = entry
+        catalog["blobs"].setdefault(blob, {"size": size, "status": "queued"})
+        if previous and previous["blob"] != blob:
+            _drop_unreferenced(catalog, previous["blob"])
+        data_store.write_json(CATALOG_FILE, catalog)
+        if process:
+            _submit(blob)
+    return entry, duplicate
+
+
+def _drop_unreferenced(catalog, blob):
+    if any(entry["blob"] == blob for entry in catalog["lessons"].values()):
+        return
+    catalog["blobs"].pop(blob, None)
+    try:
+        os.remove(os.path.join(CONTENT_DIR, blob))
+    except OSError:
+        pass
+
+
+def _submit(blob):
+    with _lock:
+        job = _jobs.get(blob)
+        if job is not None and not job.done():
+            # Indexing the new name waits for a follow-up run; the text is cached by then
+            _again.add(blob)
+            return job
+        _stages[blob] = "queued"
+        _jobs[blob] = job = _pool.submit(_postprocess, blob)
+        return job
+
+
+def _postprocess(blob):
+    """Worker: extract the text of a blob, count its pages and words and index its names."""
+    import lesson_index
+    from pdf_text import extract_pages
+
+    blob_path = os.path.join(CONTENT_DIR, blob)
+    started = time.perf_counter()
+    try:
+        _stages[blob] = "extracting text"
+        pages = extract_pages(blob_path)
+        result = {"status": "ready", "pages": len(pages), "words": sum(len(p.split()) for p in pages)}
+        _stages[blob] = "indexing"
+        for name, entry in _load()["lessons"].items():
+            if entry["blob"] == blob:
+                lesson_index.index_lesson_async(blob_path, name=name).result()
+    except Exception as e:
+        result = {"status": "failed", "error": str(e)}
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    with _lock:
+        _stages.pop(blob, None)
+        _jobs.pop(blob, None)
+        catalog = _load(mutable=True)
+        # The blob may have been replaced or reset while it was processed
+        if blob in catalog["blobs"]:
+            catalog["blobs"][blob].update(result)
+            data_store.write_json(CATALOG_FILE, catalog)
+        if blob in _again:
+            _again.discard(blob)
+            _submit(blob)
+
+
+def status(selected=None):
+    """
+    Post-processing state of the selected lessons (default: all) as rows of
+    {"Lesson", "Status", "Pages", "Words", "Size (KB)", "Same content as"}.
+    """
+    catalog = _load()
+    by_blob = {}
+    for name, entry in catalog["lessons"].items():
+        by_blob.setdefault(entry["blob"], []).append(name)
+    rows = []
+    for name in selected if selected is not None else sorted(catalog["lessons"], key=str.lower):
+        entry = catalog["lessons"].get(name)
+        if entry is None:
+            continue
+        info = catalog["blobs"].get(entry["blob"], {})
+        state = _stages.get(entry["blob"]) or info.get("status", "queued")
+        rows.append({
+            "Lesson": name,
+            "Status": f"failed: {info.get('error', '')}" if state == "failed" else state,
+            "Pages": info.get("pages"),
+            "Words": info.get("words"),
+            "Size (KB)": round(entry["size"] / 1024, 1),
+            "Same content as": ", ".join(n for n in by_blob[entry["blob"]] if n != name),
+        })
+    return rows
+
+
+def wait():
+    """Block until all queued post-processing has finished (for scripts and benchmarks)."""
+    while True:
+        with _lock:
+            pending = [job for job in _jobs.values() if not job.done()]
+        if not pending:
+            return
+        wait_futures(pending)
+
+
+def clear():
+    """Delete every lesson and the catalog."""
+    with _lock:
+        shutil.rmtree(CONTENT_DIR, ignore_errors=True)
+        os.makedirs(CONTENT_DIR, exist_ok=True)
+        data_store.remove(CATALOG_FILE)
@@ -0,0 +1,267 @@
+import math
+import os
+import re
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import lesson_catalog
+import store_utils
+from pdf_text import cached_pages, extract_pages, file_sha256
+from quiz_generator import WORD_RE, tokenize
+
+# ---------------- Lesson search index config ----------------
+INDEX_DB = "lesson_index.db"
+CONTENT_DIR = lesson_catalog.CONTENT_DIR
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 160
+
+# One writer thread keeps index updates serialized and off the script thread
+_indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lesson-index")
+_synced = False
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    sha TEXT NOT NULL,
+    n_pages INTEGER NOT NULL,
+    n_tokens INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    page_len INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, doc_id, page)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+
+def _connect(db=INDEX_DB):
+    return store_utils.connect(db, SCHEMA)
+
+
+def _drop_doc(conn, doc_id):
+    conn.execute(
+        "UPDATE terms SET df = df - (SELECT COUNT(*) FROM postings p WHERE p.term = terms.term AND p.doc_id = ?) "
+        "WHERE term IN (SELECT DISTINCT term FROM postings WHERE doc_id = ?)",
+        (doc_id, doc_id),
+    )
+    conn.execute("DELETE FROM terms WHERE df <= 0")
+    conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+    conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+
+def index_lesson(path, db=INDEX_DB, name=None):
+    """(Re)index one lesson file under name (default: its file name). Skips the work when its content hash is unchanged."""
+    name = name or os.path.basename(path)
+    sha = file_sha256(path)
+    conn = _connect(db)
+    row = conn.execute("SELECT doc_id, sha FROM docs WHERE name = ?", (name,)).fetchone()
+    if row and row[1] == sha:
+        return False
+    pages = extract_pages(path)
+
+    rows = []
+    n_tokens = 0
+    for page_no, page_text in enumerate(pages, start=1):
+        positions = defaultdict(lambda: array("I"))
+        tokens = tokenize(page_text)
+        for pos, term in enumerate(tokens):
+            positions[term].append(pos)
+        n_tokens += len(tokens)
+        for term, pos_list in positions.items():
+            rows.append((term, page_no, len(pos_list), len(tokens), pos_list.tobytes()))
+
+    with conn:
+        if row:
+            _drop_doc(conn, row[0])
+        cur = conn.execute(
+            "INSERT INTO docs (name, sha, n_pages, n_tokens) VALUES (?, ?, ?, ?)",
+            (name, sha, len(pages), n_tokens),
+        )
+        doc_id = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO postings (term, doc_id, page, tf, page_len, positions) VALUES (?, ?, ?, ?, ?, ?)",
+            [(term, doc_id, page, tf, page_len, blob) for term, page, tf, page_len, blob in rows],
+        )
+        df = defaultdict(int)
+        for term, *_ in rows:
+            df[term] += 1
+        conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+            list(df.items()),
+        )
+    return True
+
+
+def remove_lesson(name, db=INDEX_DB):
+    """Drop a lesson from the index."""
+    conn = _connect(db)
+    row = conn.execute("SELECT doc_id FROM docs WHERE name = ?", (name,)).fetchone()
+    if row:
+        with conn:
+            _drop_doc(conn, row[0])
+
+
+def sync(content_dir=CONTENT_DIR, db=INDEX_DB):
+    """Index new or changed lessons of the catalog and drop deleted ones."""
+    names = set(lesson_catalog.lessons())
+    for name in names:
+        path = lesson_catalog.path(name, content_dir)
+        if os.path.isfile(path):
+            index_lesson(path, db, name)
+    for (name,) in _connect(db).execute("SELECT name FROM docs").fetchall():
+        if name not in names:
+            remove_lesson(name, db)
+
+
+def index_lesson_async(path, db=INDEX_DB, name=None):
+    """Queue a lesson for (re)indexing on the background indexer thread."""
+    return _indexer.submit(index_lesson, path, db, name)
+
+
+def sync_async(content_dir=CONTENT_DIR, db=INDEX_DB):
+    """Queue a full sync on the background indexer thread."""
+    return _indexer.submit(sync, content_dir, db)
+
+
+def ensure_synced(content_dir=CONTENT_DIR, db=INDEX_DB):
+    """Queue one full sync per process so lessons added outside the app get indexed too."""
+    global _synced
+    if not _synced:
+        _synced = True
+        sync_async(content_dir, db)
+
+
+def parse_query(query):
+    """Split a query into phrases (double-quoted) and loose keywords, tokenized like the quiz."""
+    phrases = [tokenize(p) for p in re.findall(r'"([^"]+)"', query)]
+    phrases = [p for p in phrases if p]
+    keywords = tokenize(re.sub(r'"[^"]*"', " ", query))
+    return phrases, keywords
+
+
+def _phrase_at(position_lists):
+    """True if the position arrays contain a run p, p+1, ..., p+n-1."""
+    first, rest = position_lists[0], [set(p) for p in position_lists[1:]]
+    return any(all(p + i + 1 in s for i, s in enumerate(rest)) for p in first)
+
+
+def _snippet(name, page, terms, content_dir):
+    path = lesson_catalog.path(name, content_dir)
+    if path is None:
+        return ""
+    try:
+        pages = cached_pages(path)
+    except OSError:
+        return ""
+    if not pages or page > len(pages):
+        return ""
+    text = " ".join(pages[page - 1].split())
+    start = 0
+    for m in WORD_RE.finditer(text):
+        if m.group(0).lower() in terms:
+            start = max(m.start() - SNIPPET_CHARS // 4, 0)
+            break
+    return text[start:start + SNIPPET_CHARS]
+
+
+def search(query, limit=20, db=INDEX_DB, content_dir=CONTENT_DIR, snippets=True):
+    """
+    Ranked search over all indexed lessons. Every keyword and quoted phrase must match
+    on the same page. Returns [{"lesson", "score", "pages": [{"page", "score", "snippet"}]}].
+    """
+    phrases, keywords = parse_query(query)
+    terms = list(dict.fromkeys(keywords + [t for p in phrases for t in p]))
+    if not terms:
+        return []
+    conn = _connect(db)
+    n_pages, n_tokens = conn.execute("SELECT COALESCE(SUM(n_pages), 0), COALESCE(SUM(n_tokens), 0) FROM docs").fetchone()
+    if not n_pages:
+        return []
+    avg_len = n_tokens / n_pages
+
+    placeholders = ",".join("?" * len(terms))
+    df = dict(conn.execute(f"SELECT term, df FROM terms WHERE term IN ({placeholders})", terms).fetchall())
+    if len(df) < len(terms):
+        return []
+    # Rarest term first: it bounds the candidate pages every other term is looked up in
+    terms.sort(key=lambda t: df[t])
+    need_positions = bool(phrases)
+
+    candidates = None  # (doc_id, page) -> {term: (tf, page_len, positions)}
+    for term in terms:
+        if candidates is None:
+            rows = conn.execute(
+                "SELECT doc_id, page, tf, page_len, positions FROM postings WHERE term = ?", (term,)
+            ).fetchall()
+        else:
+            doc_ids = sorted({doc_id for doc_id, _ in candidates})
+            rows = []
+            for i in range(0, len(doc_ids), 500):
+                batch = doc_ids[i:i + 500]
+                rows.extend(conn.execute(
+                    f"SELECT doc_id, page, tf, page_len, positions FROM postings "
+                    f"WHERE term = ? AND doc_id IN ({','.join('?' * len(batch))})",
+                    [term, *batch],
+                ).fetchall())
+        found = {}
+        for doc_id, page, tf, page_len, blob in rows:
+            key = (doc_id, page)
+            if candidates is None or key in candidates:
+                entry = {} if candidates is None else candidates[key]
+                entry[term] = (tf, page_len, blob if need_positions else None)
+                found[key] = entry
+        candidates = found
+        if not candidates:
+            return []
+
+    hits = defaultdict(list)
+    for (doc_id, page), entry in candidates.items():
+        if phrases:
+            positions = {t: array("I", entry[t][2]) for t in entry}
+            if not all(_phrase_at([positions[t] for t in phrase]) for phrase in phrases):
+                continue
+        score = 0.0
+        for term, (tf, page_len, _) in entry.items():
+            idf = math.log(1 + (n_pages - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * page_len / avg_len))
+        if phrases:
+            score *= 1 + len(phrases)
+        hits[doc_id].append((score, page))
+
+    if not hits:
+        return []
+    names = dict(conn.execute(
+        f"SELECT doc_id, name FROM docs WHERE doc_id IN ({','.join('?' * len(hits))})", list(hits)
+    ).fetchall())
+    results = []
+    for doc_id, pages in hits.items():
+        pages.sort(reverse=True)
+        # Lesson score: best page plus a small bonus for every other matching page
+        score = pages[0][0] + 0.1 * sum(s for s, _ in pages[1:])
+        results.append({"lesson": names[doc_id], "score": score, "pages": pages})
+    results.sort(key=lambda r: r["score"], reverse=True)
+    results = results[:limit]
+    for rank, result in enumerate(results):
+        # Snippets re-read cached page text, so only the best page of the top lessons gets one
+        result["pages"] = [
+            {
+                "page": page,
+                "score": round(score, 3),
+                "snippet": _snippet(result["lesson"], page, set(terms), content_dir) if snippets and rank < 5 and i == 0 else "",
+            }
+            for i, (score, page) in enumerate(result["pages"])
+        ]
+        result["score"] = round(result["score"], 3)
+    return results
@@ -0,0 +1,199 @@
+import csv
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import lesson_catalog
+import metrics
+import store_utils
+
+# ---------------- Lesson progress config ----------------
+# Completed lessons as one bitset per student: every lesson name gets a stable integer ID the
+# first time it is seen (IDs are never reused), and bit ID of a student's bitset is set once
+# the lesson is done. Marking and checking a lesson touch one row of at most lessons/8 bytes,
+# repeat clicks change nothing, and the completion share against the catalog is a popcount of
+# the bitset ANDed with the catalog's (cached) bitset.
+PROGRESS_DB = "lesson_progress.db"
+LEGACY_FILE = "student_progress.csv"  # header-less "student,lesson" append log it replaces
+MIGRATED_SUFFIX = ".migrated"  # the legacy log is renamed, not deleted, once imported
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completions (
+    student TEXT PRIMARY KEY,
+    bits BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+_catalog_bits = {}  # db -> (lesson_catalog.lessons() dict it was built from, bitset)
+_legacy_checked = False
+
+
+def _connect(db=PROGRESS_DB):
+    # Autocommit mode: _write() opens its own IMMEDIATE transactions
+    return store_utils.connect(db, SCHEMA, isolation_level=None)
+
+
+@contextmanager
+def _write(db=PROGRESS_DB):
+    """A write transaction that holds the database lock from its first read, so concurrent marks never lose a bit."""
+    conn = _connect(db)
+    with _lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _to_bytes(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def _bits(conn, student):
+    row = conn.execute("SELECT bits FROM completions WHERE student = ?", (str(student),)).fetchone()
+    if row:
+        metrics.record_io("read", len(row[0]))
+    return int.from_bytes(row[0], "little") if row else 0
+
+
+def _ids(bits):
+    """Set bit positions (lesson IDs) of a bitset, ascending."""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+def _lesson_ids(conn, names):
+    """Stable IDs of lesson names, assigning new ones to names never seen before; the caller holds a write transaction."""
+    names = [str(n) for n in dict.fromkeys(names)]
+    conn.executemany("INSERT OR IGNORE INTO lessons (name) VALUES (?)", [(n,) for n in names])
+    ids = {}
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        ids.update(conn.execute(f"SELECT name, id FROM lessons WHERE name IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+    return ids
+
+
+def _import_legacy(db=PROGRESS_DB):
+    """
+    Once per process: fold the old student_progress.csv log into the bitsets (dropping its
+    duplicates) and rename it to student_progress.csv.migrated. Marking is idempotent, so
+    processes racing through the import do no harm.
+    """
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    try:
+        with open(LEGACY_FILE, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+    except FileNotFoundError:
+        _legacy_checked = True
+        return
+    # Unquoted commas in a lesson file name are folded back into it
+    pairs = [(r[0], ",".join(r[1:])) for r in rows if len(r) >= 2]
+    skipped = [r for r in rows if len(r) < 2 and any(r)]
+    if skipped:
+        # e.g. lesson-only lines from versions that did not record the student
+        logger.warning("%s: skipped %d line(s) without a student and lesson, kept in %s%s: %s",
+                       LEGACY_FILE, len(skipped), LEGACY_FILE, MIGRATED_SUFFIX, skipped[:5])
+    mark_many(pairs, db)
+    try:
+        os.replace(LEGACY_FILE, LEGACY_FILE + MIGRATED_SUFFIX)
+    except FileNotFoundError:
+        pass  # another process finished the import first
+    _legacy_checked = True
+
+
+def mark_many(pairs, db=PROGRESS_DB):
+    """Mark (student, lesson) pairs done in one transaction. Returns the pairs that were not done before."""
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    by_student = {}
+    with _write(db) as conn:
+        ids = _lesson_ids(conn, (lesson for _, lesson in pairs))
+        for student, lesson in pairs:
+            by_student.setdefault(str(student), []).append(lesson)
+        new = []
+        rows = []
+        for student, lessons in by_student.items():
+            bits = before = _bits(conn, student)
+            for lesson in lessons:
+                bit = 1 << ids[str(lesson)]
+                if not bits & bit:
+                    bits |= bit
+                    new.append((student, lesson))
+            if bits != before:
+                rows.append((student, _to_bytes(bits)))
+        conn.executemany("INSERT OR REPLACE INTO completions (student, bits) VALUES (?, ?)", rows)
+    metrics.record_io("write", sum(len(b) for _, b in rows))
+    return new
+
+
+def mark_done(student, lesson, db=PROGRESS_DB):
+    """Mark one lesson done for a student. Returns True if it was not done already."""
+    _import_legacy(db)
+    return bool(mark_many([(student, lesson)], db))
+
+
+def is_done(student, lesson, db=PROGRESS_DB):
+    """True if the student has completed the lesson."""
+    _import_legacy(db)
+    conn = _connect(db)
+    row = conn.execute("SELECT id FROM lessons WHERE name = ?", (str(lesson),)).fetchone()
+    return bool(row) and bool(_bits(conn, student) >> row[0] & 1)
+
+
+def completed(student, db=PROGRESS_DB):
+    """Names of the lessons a student has completed, in the order the lessons were first seen."""
+    _import_legacy(db)
+    conn = _connect(db)
+    ids = _ids(_bits(conn, student))
+    names = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        names.update(conn.execute(f"SELECT id, name FROM lessons WHERE id IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+    return [names[i] for i in ids if i in names]
+
+
+def _catalog(db=PROGRESS_DB):
+    """Bitset of the lessons currently in the catalog, rebuilt only when the catalog changes."""
+    lessons = lesson_catalog.lessons()  # the same shared dict until lesson_catalog.json changes
+    cached = _catalog_bits.get(db)
+    if cached is not None and cached[0] is lessons:
+        return cached[1]
+    with _write(db) as conn:
+        bits = 0
+        for i in _lesson_ids(conn, lessons).values():
+            bits |= 1 << i
+    _catalog_bits[db] = (lessons, bits)
+    return bits
+
+
+def completion(student, db=PROGRESS_DB):
+    """(completed, total) lessons of the current catalog for a student."""
+    _import_legacy(db)
+    catalog = _catalog(db)
+    return (_bits(_connect(db), student) & catalog).bit_count(), catalog.bit_count()
+
+
+def clear(db=PROGRESS_DB):
+    """Forget all completions and lesson IDs (and the legacy log, if it was never imported)."""
+    with _write(db) as conn:
+        conn.execute("DELETE FROM completions")
+        conn.execute("DELETE FROM lessons")
+    _catalog_bits.pop(db, None)
+    if os.path.exists(LEGACY_FILE):
+        os.remove(LEGACY_FILE)
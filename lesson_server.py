@@ -0,0 +1,290 @@
+import base64
+import hashlib
+import hmac
+import ipaddress
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import lesson_catalog
+import metrics
+
+# ---------------- Lesson server config ----------------
+CONTENT_DIR = lesson_catalog.CONTENT_DIR
+# Local only by default: browsers on other machines then get the data-URI embed. Set
+# LESSON_SERVER_HOST=0.0.0.0 (with LESSON_SERVER_PORT reachable) or a proxy via LESSON_BASE_URL
+# to serve them from the lesson server too.
+LESSON_SERVER_HOST = os.environ.get("LESSON_SERVER_HOST", "127.0.0.1")
+LESSON_SERVER_PORT = int(os.environ.get("LESSON_SERVER_PORT", "8502"))
+# Public URL prefix when the lesson server sits behind a proxy, e.g. "https://school.example/lessons"
+LESSON_BASE_URL = os.environ.get("LESSON_BASE_URL", "").rstrip("/")
+LESSON_CACHE_BYTES = int(os.environ.get("LESSON_CACHE_MB", "64")) * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+# The server has no session of its own: lesson_url() hands a logged-in page a link signed with
+# LESSON_URL_SECRET that expires within LESSON_URL_TTL seconds, and every request must carry one.
+# Expiries are rounded to whole TTL periods so a lesson's URL (and the browser cache) stays
+# stable for a while. Without the environment variable each process signs with its own secret.
+LESSON_URL_SECRET = os.environ.get("LESSON_URL_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+LESSON_URL_TTL = int(os.environ.get("LESSON_URL_TTL", "3600"))
+MIME_TYPES = {".pdf": "application/pdf", ".txt": "text/plain; charset=utf-8", ".png": "image/png"}
+
+
+class LessonCache:
+    """Process-wide LRU of file bytes, bounded by total size and keyed by path + mtime/size."""
+
+    def __init__(self, max_bytes=LESSON_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, data, etag)
+        self._b64 = {}  # path -> (mtime_ns, size, encoded)
+        self._lock = threading.Lock()
+
+    def stat(self, path):
+        """Return (mtime_ns, size, etag) for path."""
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size, f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+    def get(self, path):
+        """Return (bytes, etag) for path, reading it from disk only when not cached or changed."""
+        mtime_ns, size, etag = self.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == mtime_ns and entry[1] == size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2], entry[3]
+        with open(path, "rb") as f:
+            data = f.read()
+        metrics.record_io("read", len(data))
+        with self._lock:
+            self.misses += 1
+            self._put(path, (mtime_ns, size, data, etag))
+        return data, etag
+
+    def get_base64(self, path):
+        """Return the base64 text of path, encoding it once per file version."""
+        mtime_ns, size, _ = self.stat(path)
+        with self._lock:
+            entry = self._b64.get(path)
+            if entry and entry[0] == mtime_ns and entry[1] == size:
+                return entry[2]
+        data, _ = self.get(path)
+        encoded = base64.b64encode(data).decode("utf-8")
+        with self._lock:
+            # Only memoize encodings of files the LRU holds, so eviction bounds both
+            if path in self._entries:
+                self._b64[path] = (mtime_ns, size, encoded)
+        return encoded
+
+    def _put(self, path, entry):
+        old = self._entries.pop(path, None)
+        if old:
+            self.total_bytes -= old[1]
+        self._b64.pop(path, None)
+        # Files that would take over the cache are served straight from disk instead
+        if entry[1] > self.max_bytes // 2:
+            return
+        self._entries[path] = entry
+        self.total_bytes += entry[1]
+        while self.total_bytes > self.max_bytes and self._entries:
+            evicted_path, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted[1]
+            self._b64.pop(evicted_path, None)
+
+
+lesson_cache = LessonCache()
+metrics.register_collector(lambda: [
+    ("lms_cache_requests_total", {"cache": "lessons", "result": "hit"}, lesson_cache.hits),
+    ("lms_cache_requests_total", {"cache": "lessons", "result": "miss"}, lesson_cache.misses),
+    ("lms_cache_bytes", {"cache": "lessons"}, lesson_cache.total_bytes),
+])
+
+
+def resolve_lesson_path(name, content_dir=CONTENT_DIR):
+    """Map a lesson name to a file inside content_dir, or None if it escapes it or is missing."""
+    root = os.path.realpath(content_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root or not os.path.isfile(path):
+        return None
+    return path
+
+
+def sign(name, expires, secret=LESSON_URL_SECRET):
+    """Signature of a lesson name valid until the unix time expires."""
+    return hmac.new(secret, f"{name}\n{expires}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def check_signature(name, query, secret=LESSON_URL_SECRET, now=None):
+    """True when the query string carries an unexpired signature of name."""
+    params = parse_qs(query)
+    try:
+        expires = int(params["expires"][0])
+        signature = params["sig"][0]
+    except (KeyError, ValueError):
+        return False
+    if expires < (now if now is not None else time.time()):
+        return False
+    return hmac.compare_digest(signature, sign(name, expires, secret))
+
+
+def parse_range(header, size):
+    """Parse a single 'bytes=start-end' Range header into (start, end) inclusive, or None if unsatisfiable."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start, _, end = spec.strip().partition("-")
+    try:
+        if start:
+            start = int(start)
+            end = int(end) if end else size - 1
+        else:
+            # Suffix range: last N bytes
+            length = int(end)
+            if length <= 0:
+                return None
+            start, end = max(size - length, 0), size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+class LessonRequestHandler(BaseHTTPRequestHandler):
+    """Serves files from CONTENT_DIR with Range and ETag support."""
+
+    content_dir = CONTENT_DIR
+    cache = lesson_cache
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        url = urlsplit(self.path)
+        name = unquote(url.path.lstrip("/"))
+        if not check_signature(name, url.query):
+            self.send_error(403, "Missing or expired lesson link")
+            return
+        path = resolve_lesson_path(name, self.content_dir)
+        if path is None:
+            self.send_error(404, "Lesson not found")
+            return
+        mtime_ns, size, etag = self.cache.stat(path)
+        mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start, end, status = 0, size - 1, 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            byte_range = parse_range(range_header, size)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", mime)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        # Content-addressed lesson files never change under their name; only the browser may keep them
+        self.send_header("Cache-Control", "private, max-age=31536000, immutable" if lesson_catalog.is_blob(name) else "private, max-age=300")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        try:
+            if size <= self.cache.max_bytes // 2:
+                data, _ = self.cache.get(path)
+                self.wfile.write(memoryview(data)[start:end + 1])
+            else:
+                with open(path, "rb") as f:
+                    f.seek(start)
+                    remaining = end - start + 1
+                    while remaining > 0:
+                        chunk = f.read(min(CHUNK_SIZE, remaining))
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # Viewers routinely abort range requests while scrolling
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def ensure_server(host=LESSON_SERVER_HOST, port=LESSON_SERVER_PORT):
+    """Start the lesson server once per process. Returns the bound port, or None if it could not start."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), LessonRequestHandler)
+            except OSError:
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="lesson-server", daemon=True).start()
+        return _server.server_address[1]
+
+
+def signed_path(name, now=None):
+    """'<name>?expires=..&sig=..' valid for at least LESSON_URL_TTL seconds."""
+    expires = (int(now if now is not None else time.time()) // LESSON_URL_TTL + 2) * LESSON_URL_TTL
+    return f"{quote(name)}?expires={expires}&sig={sign(name, expires)}"
+
+
+def is_loopback(hostname):
+    """True for localhost and loopback addresses."""
+    if hostname == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        return False
+
+
+def lesson_url(name, request_host=None):
+    """
+    Return the signed browser URL of a lesson, or None when the browser cannot reach the lesson
+    server: it is not running, or it only listens on loopback and the app was opened from
+    another machine (request_host is the Host header the browser sent to Streamlit).
+    """
+    if LESSON_BASE_URL:
+        return f"{LESSON_BASE_URL}/{signed_path(name)}"
+    hostname = urlsplit(f"//{request_host or ''}").hostname
+    if not hostname or (is_loopback(LESSON_SERVER_HOST) and not is_loopback(hostname)):
+        return None
+    port = ensure_server()
+    if port is None:
+        return None
+    if is_loopback(LESSON_SERVER_HOST):
+        hostname = LESSON_SERVER_HOST  # the address actually bound, whichever loopback name the browser used
+    if ":" in hostname:
+        hostname = f"[{hostname}]"
+    return f"//{hostname}:{port}/{signed_path(name)}"
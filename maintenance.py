@@ -0,0 +1,44 @@
+import logging
+import os
+import threading
+import time
+
+# ---------------- Maintenance config ----------------
+# Housekeeping such as attendance retention runs on one background thread per process:
+# shortly after startup and then every MAINTENANCE_INTERVAL seconds, never on a script rerun.
+MAINTENANCE_DELAY = float(os.environ.get("MAINTENANCE_DELAY", "5"))  # let the first page render first
+MAINTENANCE_INTERVAL = float(os.environ.get("MAINTENANCE_INTERVAL", str(6 * 3600)))
+
+_tasks = {}  # name -> callable
+logger = logging.getLogger(__name__)
+_lock = threading.Lock()
+_thread = None
+
+
+def run_now():
+    """Run every registered task once; a failing task does not stop the others."""
+    with _lock:
+        tasks = list(_tasks.items())
+    for name, task in tasks:
+        try:
+            task()
+        except Exception:
+            logger.exception("maintenance task %r failed", name)
+
+
+def _loop(delay, interval):
+    time.sleep(delay)
+    while True:
+        run_now()
+        time.sleep(interval)
+
+
+def start(tasks, delay=MAINTENANCE_DELAY, interval=MAINTENANCE_INTERVAL):
+    """Register tasks ({name: callable}) and start the scheduler; only the first call per process does anything."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _tasks.update(tasks)
+        _thread = threading.Thread(target=_loop, args=(delay, interval), name="maintenance", daemon=True)
+        _thread.start()
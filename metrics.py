@@ -0,0 +1,237 @@
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ---------------- Metrics config ----------------
+# Process-wide counters for script reruns and file I/O. Every rerun updates the aggregates
+# (a handful of dict additions); only a sampled share also produces a detailed JSONL event.
+# A background thread appends the buffered events to metrics/metrics.jsonl (rotated by
+# size) and rewrites metrics/metrics.prom in Prometheus text format, e.g. for the
+# node_exporter textfile collector.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+METRICS_DIR = os.environ.get("METRICS_DIR", "metrics")
+SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", "0.1"))
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "15"))
+ROTATE_BYTES = 5 * 1024 * 1024
+KEEP_FILES = 5  # metrics.jsonl.1 .. .5
+MAX_PENDING_EVENTS = 10_000  # oldest sampled events are dropped if the flusher falls behind
+RERUN_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BACKGROUND = "(background)"  # page label for I/O outside a script rerun
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters = {}  # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+_collectors = []  # callables returning [(name, labels dict, value)] at export time
+_events = deque(maxlen=MAX_PENDING_EVENTS)
+_flusher = None
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _add(key, value):
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def inc(name, value=1, **labels):
+    """Add value to a counter."""
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        _add((name, _labels(labels)), value)
+
+
+def observe(name, value, **labels):
+    """Add value to a histogram with RERUN_BUCKETS."""
+    if not METRICS_ENABLED:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(RERUN_BUCKETS) + 2)
+        for i, bound in enumerate(RERUN_BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+        hist[-2] += 1
+        hist[-1] += value
+
+
+def register_collector(func):
+    """func() -> [(name, labels dict, value)] sampled whenever the Prometheus file is written."""
+    with _lock:
+        _collectors.append(func)
+
+
+# ---------- per-rerun accounting ----------
+def _io_totals():
+    totals = getattr(_local, "io", None)
+    if totals is None:
+        totals = _local.io = {}
+    return totals
+
+
+def record_io(op, nbytes):
+    """Count one file read or written ("read"/"write") by the current rerun (or the background)."""
+    if not METRICS_ENABLED:
+        return
+    if getattr(_local, "page", None) is None:
+        with _lock:
+            _add(("lms_io_files_total", (("op", op), ("page", BACKGROUND))), 1)
+            _add(("lms_io_bytes_total", (("op", op), ("page", BACKGROUND))), nbytes)
+        return
+    totals = _io_totals()
+    totals[f"{op}_files"] = totals.get(f"{op}_files", 0) + 1
+    totals[f"{op}_bytes"] = totals.get(f"{op}_bytes", 0) + nbytes
+
+
+@contextmanager
+def parse_timer(kind):
+    """Time a parse (e.g. CSV to DataFrame) and charge it to the current rerun."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if getattr(_local, "page", None) is None:
+            inc("lms_parse_seconds_total", elapsed, kind=kind, page=BACKGROUND)
+        else:
+            parse = _io_totals().setdefault("parse_seconds", {})
+            parse[kind] = parse.get(kind, 0.0) + elapsed
+
+
+def begin_rerun():
+    """Mark the start of a script run; call first thing in app.py."""
+    _local.started = time.perf_counter()
+    _local.io = {}
+    _local.page = "(startup)"
+
+
+@contextmanager
+def page(name):
+    """Attribute the rest of the script run to a page and record it when the run ends."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    _local.page = name
+    started = getattr(_local, "started", None) or time.perf_counter()
+    try:
+        yield
+    finally:
+        # Also reached through st.rerun()/st.stop(), which unwind the script with an exception
+        _finish_rerun(name, time.perf_counter() - started)
+
+
+def _finish_rerun(name, seconds):
+    totals = _io_totals()
+    _local.page = None
+    _local.io = {}
+    parse = totals.pop("parse_seconds", {})
+    observe("lms_rerun_seconds", seconds, page=name)
+    with _lock:
+        for op in ("read", "write"):
+            _add(("lms_io_files_total", (("op", op), ("page", name))), totals.get(f"{op}_files", 0))
+            _add(("lms_io_bytes_total", (("op", op), ("page", name))), totals.get(f"{op}_bytes", 0))
+        for kind, elapsed in parse.items():
+            _add(("lms_parse_seconds_total", (("kind", kind), ("page", name))), elapsed)
+        if random.random() < SAMPLE_RATE:
+            _events.append({"ts": round(time.time(), 3), "page": name, "seconds": round(seconds, 6),
+                            **totals, "parse_seconds": {k: round(v, 6) for k, v in parse.items()}})
+    _ensure_flusher()
+
+
+# ---------- export ----------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        collectors = list(_collectors)
+    for func in collectors:
+        try:
+            for name, labels, value in func():
+                counters[(name, _labels(labels))] = value
+        except Exception:
+            pass
+    lines, seen = [], set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), hist in sorted(histograms.items()):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        for bound, count in zip(RERUN_BUCKETS, hist):
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {count}")
+        lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {hist[-2]}")
+        lines.append(f"{name}_count{_format_labels(labels)} {hist[-2]}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {hist[-1]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def _rotate(path):
+    for i in range(KEEP_FILES - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+
+def flush(metrics_dir=None):
+    """Append pending events to metrics.jsonl and rewrite metrics.prom."""
+    metrics_dir = metrics_dir or METRICS_DIR
+    os.makedirs(metrics_dir, exist_ok=True)
+    with _lock:
+        events = list(_events)
+        _events.clear()
+    if events:
+        path = os.path.join(metrics_dir, "metrics.jsonl")
+        if os.path.exists(path) and os.path.getsize(path) > ROTATE_BYTES:
+            _rotate(path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, separators=(",", ":")) + "\n" for e in events)
+    prom = os.path.join(metrics_dir, "metrics.prom")
+    with open(prom + ".tmp", "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(prom + ".tmp", prom)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+            _flusher.start()
+            atexit.register(flush)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+# ---------------- Text extraction config ----------------
+TEXT_CACHE_DIR = ".text_cache"
+PAGES_PER_TASK = 16
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_process_pool = None
+_coordinator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-extract")
+_pending = {}  # sha256 -> Future of the page list
+_failed = {}  # sha256 -> failed Future, kept so unreadable content is not extracted again
+_hash_memo = {}  # path -> (mtime_ns, size, sha256)
+_lock = threading.Lock()
+
+
+def _get_process_pool():
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            # spawn, not fork: the Streamlit server process is full of threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def file_sha256(path):
+    """Content hash of a file, recomputed only when its mtime or size changes."""
+    st = os.stat(path)
+    memo = _hash_memo.get(path)
+    if memo and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    _hash_memo[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def _cache_path(sha):
+    return os.path.join(TEXT_CACHE_DIR, f"{sha}.json")
+
+
+def _read_cache(sha):
+    try:
+        with open(_cache_path(sha), "r", encoding="utf-8") as f:
+            return json.load(f)["pages"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache(sha, source, pages):
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    tmp = _cache_path(sha) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(source), "pages": pages}, f)
+    os.replace(tmp, _cache_path(sha))
+
+
+def _extract_page_range(path, start, stop):
+    """Worker: extract text of pages [start, stop) from a PDF."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    pages = []
+    for i in range(start, stop):
+        try:
+            pages.append(reader.pages[i].extract_text() or "")
+        except Exception:
+            # A single broken page should not lose the whole lesson
+            pages.append("")
+    return pages
+
+
+def _extract(path, sha):
+    """Extract all pages of a lesson, fanning PDF page ranges out over the process pool."""
+    if path.lower().endswith(".txt"):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages = [f.read()]
+    else:
+        from PyPDF2 import PdfReader
+
+        page_count = len(PdfReader(path).pages)
+        pool = _get_process_pool()
+        chunks = [
+            pool.submit(_extract_page_range, path, start, min(start + PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PAGES_PER_TASK)
+        ]
+        pages = []
+        for chunk in chunks:
+            pages.extend(chunk.result())
+    _write_cache(sha, path, pages)
+    return pages
+
+
+def cached_pages(path):
+    """Return the list of page texts for a lesson if already extracted, else None."""
+    return _read_cache(file_sha256(path))
+
+
+def _finished(sha, future):
+    with _lock:
+        _pending.pop(sha, None)
+        if not future.cancelled() and future.exception() is not None:
+            _failed[sha] = future
+
+
+def extract_async(path):
+    """
+    Start (or join) extraction of a lesson and return a Future of its page texts.
+    Never blocks on parsing; concurrent callers for the same content share one job, and
+    content that failed to extract returns the same failed Future until it changes.
+    """
+    sha = file_sha256(path)
+    pages = _read_cache(sha)
+    if pages is not None:
+        done = Future()
+        done.set_result(pages)
+        return done
+    with _lock:
+        future = _failed.get(sha) or _pending.get(sha)
+        if future is not None:
+            return future
+        future = _coordinator.submit(_extract, path, sha)
+        _pending[sha] = future
+    # Outside the lock: a job that already finished runs the callback right here
+    future.add_done_callback(lambda f, key=sha: _finished(key, f))
+    return future
+
+
+def extract_pages(path):
+    """Blocking variant of extract_async for scripts and background jobs."""
+    return extract_async(path).result()
+
+
+def lesson_text(pages, first_page=1, last_page=None):
+    """Join page texts for a 1-based inclusive page range."""
+    last_page = len(pages) if last_page is None else last_page
+    return "\n".join(pages[max(first_page, 1) - 1:last_page])
@@ -0,0 +1,115 @@
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+
+import data_store
+import quiz_results_store
+
+# ---------------- Quiz catalog config ----------------
+# quizzes/index.json lists every quiz (id, title, section, window, question count); the
+# questions live in quizzes/<id>/questions.json and are only read when that quiz is opened.
+# Each quiz's results go to their own results partition ("quiz-<id>").
+QUIZ_DIR = "quizzes"
+INDEX_FILE = os.path.join(QUIZ_DIR, "index.json")
+LEGACY_QUIZ_FILE = "custom_quiz.json"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_lock = threading.RLock()
+
+
+def _questions_path(quiz_id):
+    return os.path.join(QUIZ_DIR, quiz_id, "questions.json")
+
+
+def results_kind(quiz_id):
+    """Results partition of one quiz in quiz_results_store."""
+    return f"quiz-{quiz_id}"
+
+
+def is_open(entry, now=None):
+    """Whether a catalog entry is inside its availability window (missing bounds are open)."""
+    now = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+    return (not entry.get("opens") or entry["opens"] <= now) and (not entry.get("closes") or now <= entry["closes"])
+
+
+def list_quizzes(open_only=False, section=None, now=None):
+    """Catalog entries (newest first) from the index only; no questions are loaded."""
+    migrate_legacy()
+    entries = data_store.read_json(INDEX_FILE, {"quizzes": []})["quizzes"]
+    return [
+        e for e in reversed(entries)
+        if (not open_only or is_open(e, now)) and (section is None or e.get("section", "") == section)
+    ]
+
+
+def get_entry(quiz_id):
+    for entry in list_quizzes():
+        if entry["id"] == quiz_id:
+            return entry
+    return None
+
+
+def get_questions(quiz_id):
+    """Questions of one quiz, or None if it was deleted."""
+    return data_store.read_json(_questions_path(quiz_id))
+
+
+def create_quiz(title, questions, section="", opens=None, closes=None, quiz_id=None):
+    """Store a new quiz and add it to the index. opens/closes are datetimes or None. Returns its id."""
+    quiz_id = quiz_id or uuid.uuid4().hex[:10]
+    os.makedirs(os.path.dirname(_questions_path(quiz_id)), exist_ok=True)
+    data_store.write_json(_questions_path(quiz_id), questions)
+    entry = {
+        "id": quiz_id,
+        "title": title,
+        "section": section,
+        "opens": opens.strftime(TIMESTAMP_FORMAT) if opens else None,
+        "closes": closes.strftime(TIMESTAMP_FORMAT) if closes else None,
+        "n_questions": len(questions),
+        "created": datetime.now().strftime(TIMESTAMP_FORMAT),
+    }
+    with _lock:
+        index = data_store.read_json(INDEX_FILE, {"quizzes": []}, mutable=True)
+        index["quizzes"].append(entry)
+        data_store.write_json(INDEX_FILE, index)
+    return quiz_id
+
+
+def update_questions(quiz_id, questions):
+    """Replace a quiz's questions, e.g. after fixing its answer key."""
+    data_store.write_json(_questions_path(quiz_id), questions)
+
+
+def delete_quiz(quiz_id):
+    """Remove a quiz from the catalog. Its results partition is kept."""
+    with _lock:
+        index = data_store.read_json(INDEX_FILE, {"quizzes": []}, mutable=True)
+        index["quizzes"] = [e for e in index["quizzes"] if e["id"] != quiz_id]
+        data_store.write_json(INDEX_FILE, index)
+    shutil.rmtree(os.path.join(QUIZ_DIR, quiz_id), ignore_errors=True)
+
+
+def clear():
+    """Remove every quiz (results are kept)."""
+    with _lock:
+        shutil.rmtree(QUIZ_DIR, ignore_errors=True)
+        data_store.remove(LEGACY_QUIZ_FILE)
+
+
+def result_kinds():
+    """Results partitions of assigned quizzes: the pre-catalog one plus one per quiz that has results."""
+    kinds = [quiz_results_store.CUSTOM] if quiz_results_store.has_results(quiz_results_store.CUSTOM) else []
+    return kinds + [k for k in quiz_results_store.partitions() if k.startswith("quiz-")]
+
+
+def migrate_legacy():
+    """Turn the single old custom_quiz.json into a catalog entry (results stay in the 'custom' partition)."""
+    if not os.path.exists(LEGACY_QUIZ_FILE):
+        return
+    with _lock:
+        quiz = data_store.read_json(LEGACY_QUIZ_FILE)
+        if isinstance(quiz, dict) and quiz.get("questions"):
+            create_quiz(quiz.get("title", "Quiz"), quiz["questions"])
+        data_store.remove(LEGACY_QUIZ_FILE)
@@ -1,33 +1,136 @@
+import heapq
 import random
 import re
 
-def generate_quiz(text):
-    # Basic stopwords list
-    stop_words = {
-        "the", "and", "is", "in", "to", "of", "a", "an", "for", "on", "with", "as", "by",
-        "this", "that", "it", "from", "at", "are", "be", "was", "were", "or", "which", "has"
+# Basic stopwords list
+STOP_WORDS = {
+    "the", "and", "is", "in", "to", "of", "a", "an", "for", "on", "with", "as", "by",
+    "this", "that", "it", "from", "at", "are", "be", "was", "were", "or", "which", "has"
+}
+WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+ANY_WORD_RE = re.compile(r'\b\w+\b')
+SENTENCE_END_RE = re.compile(r'[.?!]\s*')
+BLANK = "_____"
+MIN_KEYWORDS = 4
+# With a corpus distractor index the wrong answers no longer come from the sentence itself
+MIN_KEYWORDS_WITH_INDEX = 2
+# Longer runs without punctuation are page furniture (tables, headers), not sentences
+MAX_SENTENCE_CHARS = 600
+
+def tokenize(text):
+    """Lowercased keywords of text, using the same word and stopword rules as the quiz."""
+    return [w for w in (word.lower() for word in WORD_RE.findall(text)) if w not in STOP_WORDS]
+
+def blank_out(sentence, answer):
+    """Replace every whole-word, case-insensitive occurrence of answer with a blank."""
+    target = answer.lower()
+    return WORD_RE.sub(lambda m: BLANK if m.group(0).lower() == target else m.group(0), sentence)
+
+def iter_sentences(chunks):
+    """
+    Yield sentences from a string or any iterable of text chunks (pages, file lines, ...).
+    Only the current partial sentence is buffered, so memory stays constant. Chunks are
+    joined with a newline (as pdf_text.lesson_text joins pages), so words never run together.
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    buf = ""
+    for chunk in chunks:
+        buf += "\n" + chunk if buf else chunk
+        parts = SENTENCE_END_RE.split(buf)
+        buf = parts.pop()
+        for part in parts:
+            part = part.strip()
+            if part and len(part) <= MAX_SENTENCE_CHARS:
+                yield part
+        if len(buf) > MAX_SENTENCE_CHARS:
+            buf = ""
+    buf = buf.strip()
+    if buf and len(buf) <= MAX_SENTENCE_CHARS:
+        yield buf
+
+def unique_keywords(sentence):
+    """Keywords of a sentence in order, first spelling kept, case-insensitive duplicates dropped."""
+    seen = {}
+    for word in WORD_RE.findall(sentence):
+        lower = word.lower()
+        if lower not in STOP_WORDS and lower not in seen:
+            seen[lower] = word
+    return list(seen.values())
+
+def score_sentence(sentence, min_keywords=MIN_KEYWORDS):
+    """Keyword density of a sentence, or None if it has too few keywords to make a question."""
+    keywords = unique_keywords(sentence)
+    if len(keywords) < min_keywords:
+        return None, keywords
+    return len(keywords) / len(ANY_WORD_RE.findall(sentence)), keywords
+
+def top_sentences(sentences, num_questions=5, rng=None, min_keywords=MIN_KEYWORDS):
+    """Keep the num_questions best sentences by keyword density in a bounded min-heap."""
+    rng = rng or random.Random()
+    heap = []
+    in_heap = set()
+    for sentence in sentences:
+        if sentence in in_heap:
+            continue
+        score, keywords = score_sentence(sentence, min_keywords)
+        if score is None:
+            continue
+        # Random tiebreak so equally dense sentences are not always taken from the start
+        item = (score, rng.random(), sentence, keywords)
+        if len(heap) < num_questions:
+            heapq.heappush(heap, item)
+            in_heap.add(sentence)
+        elif item > heap[0]:
+            in_heap.discard(heapq.heapreplace(heap, item)[2])
+            in_heap.add(sentence)
+    return [item[2:] for item in sorted(heap, reverse=True)]
+
+def make_question(sentence, keywords, rng=random, distractors=None):
+    if distractors is not None:
+        # Prefer answers the index knows, and wrong answers of similar shape from the whole corpus
+        known = [w for w in keywords if w in distractors] or keywords
+        correct_answer = rng.choice(known)
+        wrong_answers = distractors.suggest(correct_answer, 3, exclude=keywords, rng=rng)
+        others = [w for w in keywords if w != correct_answer]
+        wrong_answers += rng.sample(others, min(3 - len(wrong_answers), len(others)))
+        if len(wrong_answers) < 3:
+            return None
+    else:
+        correct_answer = rng.choice(keywords)
+        wrong_answers = rng.sample([w for w in keywords if w != correct_answer], 3)
+    options = wrong_answers + [correct_answer]
+    rng.shuffle(options)
+    return {
+        "question": blank_out(sentence, correct_answer),
+        "options": options,
+        "answer": correct_answer
     }
 
-    # Simple sentence splitter
-    sentences = re.split(r'[.?!]\s*', text.strip())
+def generate_ranked_quiz(source, num_questions=5, seed=None, distractors=None):
+    """
+    Build a quiz from the num_questions most keyword-dense sentences of source,
+    which may be a string or an iterable of text chunks of any total size.
+    The same source and seed always give the same quiz. With a distractor index
+    (see distractor_index.get_index) wrong answers are drawn from the whole corpus.
+    """
+    rng = random.Random(seed)
+    min_keywords = MIN_KEYWORDS if distractors is None else MIN_KEYWORDS_WITH_INDEX
     quiz = []
+    for sentence, keywords in top_sentences(iter_sentences(source), num_questions, rng, min_keywords):
+        question = make_question(sentence, keywords, rng, distractors)
+        if question:
+            quiz.append(question)
+    return quiz
 
-    for sentence in sentences:
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', sentence)
-        keywords = [word for word in words if word.lower() not in stop_words]
-
-        if len(keywords) >= 4:
-            correct_answer = random.choice(keywords)
-            wrong_answers = random.sample([w for w in keywords if w != correct_answer], 3)
-            options = wrong_answers + [correct_answer]
-            random.shuffle(options)
-
-            blanked_sentence = re.sub(rf'\b{correct_answer}\b', "_____", sentence, flags=re.IGNORECASE)
-            quiz.append({
-                "question": blanked_sentence,
-                "options": options,
-                "answer": correct_answer
-            })
+def generate_quiz(text):
+    quiz = []
+
+    for sentence in SENTENCE_END_RE.split(text.strip()):
+        keywords = unique_keywords(sentence)
+
+        if len(keywords) >= MIN_KEYWORDS:
+            quiz.append(make_question(sentence, keywords))
 
         if len(quiz) >= 5:
             break
@@ -0,0 +1,424 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import data_store
+import metrics
+import student_index
+
+# ---------------- Quiz results config ----------------
+# Typed, columnar quiz results: results/<kind>/part-*.parquet. Each save appends a small
+# part file; parts are merged once there are more than COMPACT_PARTS of them.
+# Rows from before the last HOT_DAYS days are moved by archive() into compressed segments
+# per calendar year, results/<kind>/archive/<YYYY>.parquet, listed with their min/max
+# timestamps in results/<kind>/archive/manifest.json. Reads cover both tiers; a read with `since` only
+# opens the segments that can hold rows that recent, and compaction only rewrites hot rows.
+RESULTS_DIR = "results"
+LOCAL = "local"    # auto-generated quizzes (legacy quiz_results.csv)
+CUSTOM = "custom"  # teacher-assigned quizzes (legacy custom_quiz_results.csv)
+LEGACY_CSV = {LOCAL: "quiz_results.csv", CUSTOM: "custom_quiz_results.csv"}
+LEGACY_QUIZ_COLUMN = {LOCAL: "Lesson Name", CUSTOM: "Quiz Title"}
+UNMIGRATED_SUFFIX = ".unmigrated"  # legacy CSVs that failed to convert are renamed, never deleted
+COMPACT_PARTS = 32
+HOT_DAYS = int(os.environ.get("RESULTS_HOT_DAYS", "120"))  # about one term
+ARCHIVE_COMPRESSION = "zstd"
+# Each file opened costs about a millisecond whatever its size, so segments are coarse
+ARCHIVE_SEGMENT_FORMAT = "%Y"
+COLUMNS = ["student", "quiz", "correct", "total", "timestamp"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = pa.schema([
+    ("student", pa.dictionary(pa.int32(), pa.string())),
+    ("quiz", pa.dictionary(pa.int32(), pa.string())),
+    ("correct", pa.int32()),
+    ("total", pa.int32()),
+    ("timestamp", pa.timestamp("s")),
+    # Chosen option index per question (-1 = unanswered); null for results saved without it
+    ("answers", pa.list_(pa.int8())),
+])
+
+logger = logging.getLogger(__name__)
+_lock = threading.RLock()
+_cache = {}  # (results_dir, kind, columns) -> (signature, DataFrame)
+
+
+def _kind_dir(kind, results_dir=RESULTS_DIR):
+    return os.path.join(results_dir, kind)
+
+
+def _parts(kind, results_dir=RESULTS_DIR):
+    path = _kind_dir(kind, results_dir)
+    if not os.path.isdir(path):
+        return []
+    return sorted(os.path.join(path, n) for n in os.listdir(path) if n.startswith("part-") and n.endswith(".parquet"))
+
+
+def _archive_dir(kind, results_dir=RESULTS_DIR):
+    return os.path.join(_kind_dir(kind, results_dir), "archive")
+
+
+def _manifest_path(kind, results_dir=RESULTS_DIR):
+    return os.path.join(_archive_dir(kind, results_dir), "manifest.json")
+
+
+def _segments(kind, since=None, results_dir=RESULTS_DIR):
+    """
+    Archive segments of a partition, oldest first; with since, only those with rows at or
+    after it. Entries whose file is gone (an interrupted rewrite) are skipped.
+    """
+    manifest = data_store.read_json(_manifest_path(kind, results_dir), {})
+    since = None if since is None else pd.Timestamp(since).strftime(TIMESTAMP_FORMAT)
+    paths = [
+        os.path.join(_archive_dir(kind, results_dir), name) for name, meta in sorted(manifest.items())
+        if since is None or meta["max"] >= since
+    ]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def has_archive(kind, results_dir=RESULTS_DIR):
+    """True when some rows of the partition have been moved to archive segments."""
+    return bool(_segments(kind, results_dir=results_dir))
+
+
+def hot_since(hot_days=HOT_DAYS):
+    """Start of the window archive() keeps hot (midnight): reads from here on skip every segment."""
+    return pd.Timestamp.now().normalize() - pd.Timedelta(days=hot_days)
+
+
+def partitions(results_dir=RESULTS_DIR):
+    """Names of all result partitions on disk."""
+    migrate_legacy(results_dir=results_dir)
+    if not os.path.isdir(results_dir):
+        return []
+    return sorted(n for n in os.listdir(results_dir) if n != "index" and os.path.isdir(os.path.join(results_dir, n)))
+
+
+def _to_table(rows):
+    """rows: iterable of dicts with student, quiz, correct, total, timestamp and optionally answers."""
+    df = pd.DataFrame(list(rows), columns=SCHEMA.names)
+    # The schema stores whole seconds; Arrow refuses to truncate finer timestamps itself
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce").dt.floor("s")
+    df["answers"] = pd.Series([a if isinstance(a, (list, tuple)) else None for a in df["answers"]], dtype=object)
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+def _fsync_dir(path):
+    """Make a rename in path durable (not supported on Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_part(kind, table, results_dir, durable=False):
+    path = _kind_dir(kind, results_dir)
+    os.makedirs(path, exist_ok=True)
+    name = os.path.join(path, f"part-{time.time_ns():020d}-{os.getpid()}.parquet")
+    tmp = name + ".tmp"
+    with open(tmp, "wb") as f:
+        pq.write_table(table, f)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.record_io("write", f.tell())
+    os.replace(tmp, name)
+    if durable:
+        _fsync_dir(path)
+    return name
+
+
+def _index_dir(results_dir):
+    """Per-student index of every partition: results/index/<kind>/..."""
+    return os.path.join(results_dir, "index")
+
+
+def _index_rows(df):
+    """Table rows in the JSON form kept by the per-student index."""
+    return [
+        {"student": s, "quiz": q, "correct": int(c), "total": int(t), "timestamp": ts.strftime(TIMESTAMP_FORMAT) if pd.notna(ts) else None}
+        for s, q, c, t, ts in zip(df["student"], df["quiz"], df["correct"], df["total"], df["timestamp"])
+    ]
+
+
+def append(kind, rows, results_dir=RESULTS_DIR, durable=False):
+    """
+    Append result rows ({student, quiz, correct, total, timestamp}) to a results partition
+    and to the per-student index (if it has been built; otherwise it is built on first read).
+    With durable=True the part file is fsynced before returning.
+    """
+    table = _to_table(rows)
+    if not table.num_rows:
+        return
+    with _lock:
+        migrate_legacy(results_dir=results_dir)
+        _write_part(kind, table, results_dir, durable)
+        index_dir = _index_dir(results_dir)
+        if student_index.watermark(kind, index_dir) is not None:
+            student_index.append(kind, _index_rows(table.to_pandas()), index_dir=index_dir)
+        if len(_parts(kind, results_dir)) > COMPACT_PARTS:
+            compact(kind, results_dir)
+
+
+def compact(kind, results_dir=RESULTS_DIR):
+    """Merge all hot part files of a partition into one."""
+    with _lock:
+        parts = _parts(kind, results_dir)
+        if len(parts) < 2:
+            return
+        _replace_parts(kind, parts, _read_paths(parts, SCHEMA.names), results_dir)
+
+
+def _replace_parts(kind, parts, table, results_dir):
+    # The new part must be on disk before the parts it replaces are removed
+    if table.num_rows:
+        _write_part(kind, table.combine_chunks(), results_dir, durable=True)
+    for p in parts:
+        os.remove(p)
+
+
+def _oldest(path):
+    """Smallest timestamp in a part file from its row group statistics (None if unknown)."""
+    metadata = pq.ParquetFile(path).metadata
+    try:
+        column = metadata.schema.names.index("timestamp")
+    except ValueError:
+        return None
+    oldest = None
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        oldest = stats.min if oldest is None else min(oldest, stats.min)
+    return oldest
+
+
+def archive(kind, hot_days=HOT_DAYS, results_dir=RESULTS_DIR):
+    """
+    Move the rows of a partition from before hot_since(hot_days) out of its hot part files
+    into the compressed archive segments. Returns the number of rows moved.
+    """
+    cutoff = pa.scalar(hot_since(hot_days), pa.timestamp("s"))
+    with _lock:
+        parts = _parts(kind, results_dir)
+        # The parts' column statistics usually show there is nothing to move without reading them
+        oldest = [_oldest(p) for p in parts]
+        if all(t is not None and t >= cutoff.as_py() for t in oldest):
+            return 0
+        table = _read_paths(parts, SCHEMA.names)
+        old = pc.fill_null(pc.less(table.column("timestamp"), cutoff), False)
+        moved = table.filter(old)
+        if not moved.num_rows:
+            return 0
+        manifest = data_store.read_json(_manifest_path(kind, results_dir), {}, mutable=True)
+        periods = pc.strftime(moved.column("timestamp"), format=ARCHIVE_SEGMENT_FORMAT)
+        os.makedirs(_archive_dir(kind, results_dir), exist_ok=True)
+        for period in sorted(set(periods.to_pylist())):
+            name = f"{period}.parquet"
+            path = os.path.join(_archive_dir(kind, results_dir), name)
+            rows = moved.filter(pc.equal(periods, period))
+            if name in manifest:
+                rows = pa.concat_tables([_read_part(path, SCHEMA.names), rows]).unify_dictionaries()
+            rows = rows.sort_by("timestamp").combine_chunks()
+            with open(path + ".tmp", "wb") as f:
+                pq.write_table(rows, f, compression=ARCHIVE_COMPRESSION)
+                f.flush()
+                os.fsync(f.fileno())
+                metrics.record_io("write", f.tell())
+            os.replace(path + ".tmp", path)
+            low, high = pc.min_max(rows.column("timestamp")).values()
+            manifest[name] = {"min": low.as_py().strftime(TIMESTAMP_FORMAT), "max": high.as_py().strftime(TIMESTAMP_FORMAT),
+                              "rows": rows.num_rows}
+        data_store.write_json(_manifest_path(kind, results_dir), manifest)
+        # Segments and manifest are on disk before the hot rows go (a crash repeats rows, never loses them)
+        _replace_parts(kind, parts, table.filter(pc.invert(old)), results_dir)
+        return moved.num_rows
+
+
+def archive_all(hot_days=HOT_DAYS, results_dir=RESULTS_DIR):
+    """archive() every partition (maintenance task)."""
+    return sum(archive(kind, hot_days, results_dir) for kind in partitions(results_dir))
+
+
+def rewrite(kind, transform, results_dir=RESULTS_DIR):
+    """
+    Replace a whole partition with transform(table) (e.g. re-graded scores) while holding the
+    store lock, so no submission lands in between. The per-student index is rebuilt on next read.
+    """
+    with _lock:
+        parts = _parts(kind, results_dir)
+        segments = _segments(kind, results_dir=results_dir)
+        if not parts and not segments:
+            return
+        # Archived rows come back into the hot tier; the next archive() run moves them out again.
+        # New part, then the manifest, then the old files: a crash never leaves the manifest
+        # listing segments that are already deleted
+        table = transform(read_table(kind, results_dir=results_dir))
+        if table.num_rows:
+            _write_part(kind, table.combine_chunks(), results_dir, durable=True)
+        data_store.remove(_manifest_path(kind, results_dir))
+        for p in parts + segments:
+            os.remove(p)
+        student_index.clear(kind, _index_dir(results_dir))
+
+
+def _read_part(path, columns):
+    """Read columns of one part; columns the part predates come back as nulls."""
+    present = set(pq.read_schema(path).names)
+    metrics.record_io("read", os.path.getsize(path))
+    with metrics.parse_timer("parquet"):
+        table = pq.read_table(path, columns=[c for c in columns if c in present])
+    arrays = [
+        table.column(c).cast(SCHEMA.field(c).type) if c in present else pa.nulls(table.num_rows, SCHEMA.field(c).type)
+        for c in columns
+    ]
+    return pa.Table.from_arrays(arrays, schema=pa.schema([SCHEMA.field(c) for c in columns]))
+
+
+def _read_paths(paths, columns):
+    if not paths:
+        return _to_table([]).select(columns)
+    return pa.concat_tables(_read_part(p, columns) for p in paths).unify_dictionaries()
+
+
+def read_table(kind, columns=None, results_dir=RESULTS_DIR, since=None):
+    """
+    Uncached pyarrow Table of one partition (all schema columns by default), archived rows
+    first. With since, only rows at or after it, and only the segments that can hold them are read.
+    """
+    columns = list(columns or SCHEMA.names)
+    paths = _segments(kind, since, results_dir) + _parts(kind, results_dir)
+    if since is None:
+        return _read_paths(paths, columns)
+    table = _read_paths(paths, list(dict.fromkeys(columns + ["timestamp"])))
+    keep = pc.fill_null(pc.greater_equal(table.column("timestamp"), pa.scalar(pd.Timestamp(since), pa.timestamp("s"))), False)
+    return table.filter(keep).select(columns)
+
+
+def read(kind, columns=None, results_dir=RESULTS_DIR, since=None):
+    """
+    Results of one partition as a DataFrame with typed columns (categorical student/quiz,
+    int correct/total, datetime timestamp), optionally only those at or after since. Only
+    the requested columns are read from disk, and archive segments only when they overlap.
+    The DataFrame is cached and shared: filter or copy it, never modify it in place.
+    """
+    migrate_legacy(results_dir=results_dir)
+    columns = tuple(columns or COLUMNS)
+    since = None if since is None else pd.Timestamp(since)
+    parts = _segments(kind, since, results_dir) + _parts(kind, results_dir)
+    signature = tuple((p, os.path.getsize(p)) for p in parts)
+    key = (results_dir, kind, columns, since)
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[0] == signature:
+            metrics.inc("lms_cache_requests_total", cache="quiz_results", result="hit")
+            return entry[1]
+    metrics.inc("lms_cache_requests_total", cache="quiz_results", result="miss")
+    table = read_table(kind, columns, results_dir, since)
+    with metrics.parse_timer("arrow_to_pandas"):
+        df = table.to_pandas()
+    with _lock:
+        _cache[key] = (signature, df)
+    return df
+
+
+def student_results(kind, student, results_dir=RESULTS_DIR):
+    """
+    One student's rows of a partition in write order, read from that student's shard of
+    the per-student index, so the cost does not depend on how many results the school has.
+    """
+    index_dir = _index_dir(results_dir)
+    if student_index.watermark(kind, index_dir) is None:
+        with _lock:
+            student_index.ensure_built(kind, lambda: _index_rows(read(kind, results_dir=results_dir)), index_dir)
+    df = pd.DataFrame(student_index.read(kind, student, index_dir), columns=COLUMNS)
+    return df.astype({"student": "category", "quiz": "category", "correct": "int32", "total": "int32"}).assign(
+        timestamp=pd.to_datetime(df["timestamp"], format=TIMESTAMP_FORMAT, errors="coerce").astype("datetime64[s]")
+    )
+
+
+def student_totals(student, kinds=None, results_dir=RESULTS_DIR):
+    """(correct, total) summed over one student's rows of the given partitions (default: all)."""
+    correct = total = 0
+    for kind in (kinds if kinds is not None else partitions(results_dir)):
+        df = student_results(kind, student, results_dir)
+        correct += int(df["correct"].sum())
+        total += int(df["total"].sum())
+    return correct, total
+
+
+def display_frame(df, kind):
+    """Human-facing columns matching the old CSV headers plus typed score columns."""
+    out = pd.DataFrame({
+        "Student Name": df["student"],
+        LEGACY_QUIZ_COLUMN.get(kind, "Quiz Title"): df["quiz"],
+        "Correct": df["correct"],
+        "Total": df["total"],
+        "Score %": (100.0 * df["correct"] / df["total"].where(df["total"] > 0)).round(1),
+        "Date": df["timestamp"],
+    })
+    return out.reset_index(drop=True)
+
+
+def to_csv(kind, results_dir=RESULTS_DIR, since=None):
+    """CSV export of a partition (display columns plus the legacy 'correct/total' Score)."""
+    df = read(kind, results_dir=results_dir, since=since)
+    out = display_frame(df, kind)
+    out.insert(4, "Score", df["correct"].astype(str).values + "/" + df["total"].astype(str).values)
+    out["Date"] = out["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return out.to_csv(index=False)
+
+
+def has_results(kind, results_dir=RESULTS_DIR):
+    migrate_legacy(results_dir=results_dir)
+    return bool(_parts(kind, results_dir) or _segments(kind, results_dir=results_dir))
+
+
+def clear(kind, results_dir=RESULTS_DIR):
+    with _lock:
+        for p in _parts(kind, results_dir):
+            os.remove(p)
+        shutil.rmtree(_archive_dir(kind, results_dir), ignore_errors=True)
+        data_store.invalidate(_manifest_path(kind, results_dir))
+        student_index.clear(kind, _index_dir(results_dir))
+        if kind in LEGACY_CSV and os.path.exists(LEGACY_CSV[kind]):
+            os.remove(LEGACY_CSV[kind])
+
+
+def migrate_legacy(results_dir=RESULTS_DIR):
+    """Convert the old quiz_results.csv / custom_quiz_results.csv ('1/5' scores) into partitions once."""
+    for kind, csv_path in LEGACY_CSV.items():
+        if not os.path.exists(csv_path):
+            continue
+        with _lock:
+            if not os.path.exists(csv_path):
+                continue
+            try:
+                df = pd.read_csv(csv_path, dtype=str).dropna(subset=["Score"])
+                score = df["Score"].str.extract(r"^\s*(\d+)\s*/\s*(\d+)\s*$").dropna()
+                df = df.loc[score.index]
+                table = _to_table({
+                    "student": s, "quiz": q, "correct": int(c), "total": int(t), "timestamp": d,
+                } for s, q, c, t, d in zip(df["Student Name"], df[LEGACY_QUIZ_COLUMN[kind]], score[0], score[1], df["Date"]))
+                if table.num_rows:
+                    _write_part(kind, table, results_dir, durable=True)
+                    # Rebuilt from the partition (including these rows) on the next read
+                    student_index.clear(kind, _index_dir(results_dir))
+            except Exception:
+                # Keep the scores for a manual fix; the renamed file is not picked up again
+                logger.exception("could not migrate %s; kept as %s%s", csv_path, csv_path, UNMIGRATED_SUFFIX)
+                os.replace(csv_path, csv_path + UNMIGRATED_SUFFIX)
+                continue
+            os.remove(csv_path)
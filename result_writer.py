@@ -0,0 +1,141 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import quiz_results_store
+
+# ---------------- Result writer config ----------------
+# Quiz submissions go through one background thread that group-commits whatever has queued
+# up (one fsynced Parquet part per batch and partition) instead of every session appending
+# on its own. A submission is acknowledged once its batch is durable.
+QUEUE_SIZE = int(os.environ.get("RESULT_QUEUE_SIZE", "2000"))
+MAX_BATCH = 500
+# After the first submission arrives, wait this long for more to share the fsync
+BATCH_WINDOW = 0.02
+SUBMIT_TIMEOUT = 10.0  # seconds a submitter blocks on a full queue before WriterBusy
+ACK_TIMEOUT = 30.0
+STOP_POLL = 0.1  # seconds between checks for close() while the queue is empty
+
+_STOP = object()  # wakes an idle writer after close(); the stop itself is an Event
+
+
+class WriterBusy(Exception):
+    """Raised when the submission queue stays full for longer than the submit timeout."""
+
+
+class ResultWriter:
+    """Bounded queue + single writer thread in front of quiz_results_store.append."""
+
+    def __init__(self, results_dir=quiz_results_store.RESULTS_DIR, queue_size=QUEUE_SIZE,
+                 max_batch=MAX_BATCH, batch_window=BATCH_WINDOW):
+        self.results_dir = results_dir
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._stopping = threading.Event()
+        self.stats = {"batches": 0, "rows": 0, "largest_batch": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, row, timeout=SUBMIT_TIMEOUT):
+        """
+        Queue one result row for partition kind. Returns a Future that resolves to True once
+        the row is durable. Blocks while the queue is full (backpressure) and raises
+        WriterBusy if no room frees up within timeout.
+        """
+        if self._closed:
+            raise RuntimeError("result writer is closed")
+        ack = Future()
+        try:
+            self._queue.put((kind, row, ack), timeout=timeout)
+        except queue.Full:
+            raise WriterBusy("Too many submissions in progress, please try again.") from None
+        return ack
+
+    def write(self, kind, row, timeout=ACK_TIMEOUT):
+        """submit() and wait for the acknowledgement."""
+        return self.submit(kind, row).result(timeout)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        """Wait for the next batch; None once close() was called and the queue is drained."""
+        while True:
+            try:
+                first = self._queue.get(timeout=STOP_POLL)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return None
+                continue
+            if first is not _STOP:
+                break
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                continue
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            by_kind = {}
+            for kind, row, ack in batch:
+                by_kind.setdefault(kind, []).append((row, ack))
+            for kind, items in by_kind.items():
+                try:
+                    quiz_results_store.append(kind, [row for row, _ in items], self.results_dir, durable=True)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    for _, ack in items:
+                        ack.set_exception(e)
+                    continue
+                for _, ack in items:
+                    ack.set_result(True)
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(batch)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+    def close(self, timeout=ACK_TIMEOUT):
+        """Stop accepting submissions and flush everything already queued."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass  # the writer is busy draining and stops once the queue is empty
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Process-wide writer shared by every session; flushed at interpreter exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ResultWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def write_result(kind, row, timeout=ACK_TIMEOUT):
+    """Queue a result with the shared writer and wait until it is durable."""
+    return get_writer().write(kind, row, timeout)
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes this process's writers
+    fcntl = None
+
+# ---------------- Shared store helpers ----------------
+# The file-backed stores (feeds, activity log, alerts, user directory, lesson index and
+# progress) serialize writers with an in-process lock plus an flock on a lock file, and
+# keep one SQLite connection per thread and database file.
+SQLITE_TIMEOUT = 30
+SQLITE_PRAGMAS = ("journal_mode=WAL", "synchronous=NORMAL")
+
+_local = threading.local()
+
+
+@contextmanager
+def exclusive(lock, lock_path):
+    """Hold lock (a threading lock) and, where flock exists, an exclusive flock on lock_path."""
+    with lock:
+        os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+        with open(lock_path, "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def connect(db, schema, isolation_level="", pragmas=SQLITE_PRAGMAS):
+    """
+    This thread's connection to the SQLite file db, opened with pragmas (WAL mode by default)
+    and schema applied on first use. isolation_level=None gives an autocommit connection for
+    explicit BEGINs.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db)
+    if conn is None:
+        conn = sqlite3.connect(db, timeout=SQLITE_TIMEOUT, isolation_level=isolation_level)
+        for pragma in pragmas:
+            conn.execute(f"PRAGMA {pragma}")
+        conn.executescript(schema)
+        conns[db] = conn
+    return conn
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import metrics
+
+# ---------------- Student index config ----------------
+# Per-student shards of the quiz results so a parent's dashboard reads one small file per
+# dataset instead of filtering the whole school's history:
+#   student_index/<dataset>/<2-hex shard>/<sha1(student)>.jsonl
+# Each dataset has a meta.json recording how far its source has been indexed.
+INDEX_DIR = "student_index"
+
+_lock = threading.RLock()
+
+
+def _dataset_dir(dataset, index_dir=INDEX_DIR):
+    return os.path.join(index_dir, dataset)
+
+
+def _student_path(dataset, student, index_dir=INDEX_DIR):
+    digest = hashlib.sha1(str(student).encode("utf-8")).hexdigest()
+    return os.path.join(index_dir, dataset, digest[:2], f"{digest}.jsonl")
+
+
+def _meta_path(dataset, index_dir=INDEX_DIR):
+    return os.path.join(index_dir, dataset, "meta.json")
+
+
+def watermark(dataset, index_dir=INDEX_DIR):
+    """How far the dataset's source has been indexed, or None if it was never built."""
+    try:
+        with open(_meta_path(dataset, index_dir)) as f:
+            return json.load(f)["watermark"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def set_watermark(dataset, value, index_dir=INDEX_DIR):
+    os.makedirs(_dataset_dir(dataset, index_dir), exist_ok=True)
+    tmp = _meta_path(dataset, index_dir) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"watermark": value}, f)
+    os.replace(tmp, _meta_path(dataset, index_dir))
+
+
+def append(dataset, rows, key="student", index_dir=INDEX_DIR):
+    """Append rows (dicts) to the shard of each row's student; one open per student touched."""
+    by_student = {}
+    for row in rows:
+        by_student.setdefault(str(row[key]), []).append(row)
+    with _lock:
+        for student, student_rows in by_student.items():
+            path = _student_path(dataset, student, index_dir)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                start = f.tell()
+                f.writelines(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in student_rows)
+                metrics.record_io("write", f.tell() - start)
+
+
+def read(dataset, student, index_dir=INDEX_DIR):
+    """All indexed rows of one student, in write order."""
+    try:
+        with open(_student_path(dataset, student, index_dir), encoding="utf-8") as f:
+            metrics.record_io("read", os.fstat(f.fileno()).st_size)
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def clear(dataset, index_dir=INDEX_DIR):
+    with _lock:
+        shutil.rmtree(_dataset_dir(dataset, index_dir), ignore_errors=True)
+
+
+def ensure_built(dataset, load_rows, index_dir=INDEX_DIR):
+    """Build the dataset from load_rows() once (e.g. for data written before the index existed)."""
+    if watermark(dataset, index_dir) is not None:
+        return
+    with _lock:
+        if watermark(dataset, index_dir) is not None:
+            return
+        clear(dataset, index_dir)
+        append(dataset, load_rows(), index_dir=index_dir)
+        set_watermark(dataset, True, index_dir)
@@ -0,0 +1,294 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import store_utils
+
+# ---------------- User directory config ----------------
+USERS_DB = "users.db"
+ROLES = ("teacher", "student", "parent")
+# PBKDF2-SHA256 work factor for new hashes; raise it as hardware gets faster.
+# Existing hashes are upgraded transparently on the next successful login.
+HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "100000"))
+# At most this many hashes run at once (hashing releases the GIL), the rest queue
+MAX_CONCURRENT_HASHES = int(os.environ.get("MAX_CONCURRENT_HASHES", str(os.cpu_count() or 1)))
+# A login that cannot start hashing within this many seconds is told to retry
+LOGIN_QUEUE_TIMEOUT = float(os.environ.get("LOGIN_QUEUE_TIMEOUT", "10"))
+LOOKUP_CACHE_SIZE = 20000
+VERIFIED_TTL = 600  # seconds a successful login can be re-checked without re-hashing
+# Bulk provisioning: generated initial passwords are long random tokens, so they are
+# stored with a cheap work factor and upgraded to HASH_ITERATIONS on first login.
+PROVISION_HASH_ITERATIONS = int(os.environ.get("PROVISION_HASH_ITERATIONS", "1000"))
+GENERATED_PASSWORD_BYTES = 12  # 16 url-safe characters
+MAX_USERNAME_LENGTH = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    role TEXT NOT NULL,
+    username TEXT NOT NULL,
+    salt BLOB NOT NULL,
+    hash BLOB NOT NULL,
+    iterations INTEGER NOT NULL,
+    created TEXT NOT NULL,
+    PRIMARY KEY (role, username)
+) WITHOUT ROWID;
+"""
+
+
+class DirectoryBusy(Exception):
+    """Raised when too many logins are already waiting for a hashing slot."""
+
+
+_hash_slots = threading.BoundedSemaphore(MAX_CONCURRENT_HASHES)
+_lookup = OrderedDict()  # (db, role, username) -> (salt, hash, iterations)
+_verified = {}  # (db, role, username) -> (keyed digest of the password, expiry)
+_session_key = secrets.token_bytes(32)
+_cache_lock = threading.Lock()
+_migrated = set()
+
+
+def _connect(db=USERS_DB):
+    conn = store_utils.connect(db, SCHEMA)
+    with _cache_lock:
+        first = db not in _migrated
+        _migrated.add(db)
+    if first:
+        migrate_json_users(db)
+    return conn
+
+
+def hash_password(password, salt=None, iterations=HASH_ITERATIONS):
+    """Return (salt, digest) for password using PBKDF2-SHA256."""
+    salt = salt or secrets.token_bytes(16)
+    return salt, hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def _hash_with_slot(password, salt, iterations):
+    if not _hash_slots.acquire(timeout=LOGIN_QUEUE_TIMEOUT):
+        raise DirectoryBusy("Too many logins in progress, please try again.")
+    try:
+        return hash_password(password, salt, iterations)[1]
+    finally:
+        _hash_slots.release()
+
+
+def _remember(key, value):
+    with _cache_lock:
+        _lookup[key] = value
+        _lookup.move_to_end(key)
+        while len(_lookup) > LOOKUP_CACHE_SIZE:
+            _lookup.popitem(last=False)
+
+
+def _forget(key):
+    with _cache_lock:
+        _lookup.pop(key, None)
+        _verified.pop(key, None)
+
+
+def get_user(role, username, db=USERS_DB):
+    """Return (salt, hash, iterations) for a user or None, served from the in-memory cache when possible."""
+    key = (db, role, username)
+    with _cache_lock:
+        if key in _lookup:
+            _lookup.move_to_end(key)
+            return _lookup[key]
+    row = _connect(db).execute(
+        "SELECT salt, hash, iterations FROM users WHERE role = ? AND username = ?", (role, username)
+    ).fetchone()
+    # Misses are not cached: the user may be created by another process at any time
+    if row is not None:
+        _remember(key, row)
+    return row
+
+
+def user_exists(role, username, db=USERS_DB):
+    return get_user(role, username, db) is not None
+
+
+def create_user(role, username, password, db=USERS_DB, iterations=HASH_ITERATIONS):
+    """Atomically add a user. Returns False if the username is already taken for that role."""
+    salt, digest = hash_password(password, iterations=iterations)
+    conn = _connect(db)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO users (role, username, salt, hash, iterations, created) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(role, username) DO NOTHING",
+            (role, username, salt, digest, iterations, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+    _forget((db, role, username))
+    return cur.rowcount == 1
+
+
+def set_password(role, username, password, db=USERS_DB):
+    salt, digest = hash_password(password)
+    conn = _connect(db)
+    with conn:
+        conn.execute(
+            "UPDATE users SET salt = ?, hash = ?, iterations = ? WHERE role = ? AND username = ?",
+            (salt, digest, HASH_ITERATIONS, role, username),
+        )
+    _forget((db, role, username))
+
+
+def verify_user(role, username, password, db=USERS_DB):
+    """
+    Check a login. Raises DirectoryBusy if no hashing slot frees up within LOGIN_QUEUE_TIMEOUT,
+    so latency under a login storm stays bounded instead of growing with the queue.
+    """
+    key = (db, role, username)
+    quick = hmac.new(_session_key, password.encode("utf-8"), "sha256").digest()
+    with _cache_lock:
+        verified = _verified.get(key)
+    if verified and verified[1] > time.monotonic() and hmac.compare_digest(verified[0], quick):
+        return True
+    row = get_user(role, username, db)
+    if row is None:
+        # Spend the same work as a real check so usernames can't be probed by timing
+        _hash_with_slot(password, b"\0" * 16, HASH_ITERATIONS)
+        return False
+    salt, stored, iterations = row
+    if not hmac.compare_digest(_hash_with_slot(password, salt, iterations), stored):
+        return False
+    if iterations < HASH_ITERATIONS:
+        set_password(role, username, password, db)
+    with _cache_lock:
+        _verified[key] = (quick, time.monotonic() + VERIFIED_TTL)
+    return True
+
+
+def generate_password():
+    return secrets.token_urlsafe(GENERATED_PASSWORD_BYTES)
+
+
+def provision_users(role, entries, db=USERS_DB, workers=None):
+    """
+    Create many accounts in one transaction. entries is an iterable of usernames or
+    (username, password) pairs; a missing password is generated. Returns
+    {"created": [(username, password)], "errors": [(row, username, reason)], "seconds", "per_second"}
+    where row is the 1-based position in entries. Existing accounts are left untouched.
+    """
+    started = time.perf_counter()
+    errors, pending, seen = [], [], set()
+    for row, entry in enumerate(entries, start=1):
+        username, password = (entry, None) if isinstance(entry, str) else (entry[0], entry[1])
+        username = str(username or "").strip()
+        if not username:
+            errors.append((row, username, "empty username"))
+        elif len(username) > MAX_USERNAME_LENGTH:
+            errors.append((row, username, f"username longer than {MAX_USERNAME_LENGTH} characters"))
+        elif username in seen:
+            errors.append((row, username, "duplicate in upload"))
+        else:
+            seen.add(username)
+            pending.append((row, username, password or None))
+
+    conn = _connect(db)
+    existing = _existing(conn, role, [p[1] for p in pending])
+    errors += [(row, username, "already exists") for row, username, _ in pending if username in existing]
+    pending = [p for p in pending if p[1] not in existing]
+
+    def prepare(item):
+        row, username, password = item
+        iterations = HASH_ITERATIONS if password else PROVISION_HASH_ITERATIONS
+        password = password or generate_password()
+        salt, digest = hash_password(password, iterations=iterations)
+        return row, username, password, salt, digest, iterations
+
+    # pbkdf2_hmac releases the GIL, so the pool hashes on every core
+    with ThreadPoolExecutor(max_workers=workers or MAX_CONCURRENT_HASHES) as pool:
+        prepared = list(pool.map(prepare, pending, chunksize=64))
+
+    created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-check under the write lock: someone may have registered meanwhile
+        taken = _existing(conn, role, [p[1] for p in prepared])
+        rows = [p for p in prepared if p[1] not in taken]
+        conn.executemany(
+            "INSERT INTO users (role, username, salt, hash, iterations, created) VALUES (?, ?, ?, ?, ?, ?)",
+            [(role, username, salt, digest, iterations, created) for _, username, _, salt, digest, iterations in rows],
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    errors += [(row, username, "already exists") for row, username, *_ in prepared if username in taken]
+    errors.sort()
+    for _, username, *_ in rows:
+        _forget((db, role, username))
+    seconds = time.perf_counter() - started
+    return {
+        "created": [(username, password) for _, username, password, *_ in rows],
+        "errors": errors,
+        "seconds": seconds,
+        "per_second": len(rows) / seconds if seconds else 0.0,
+    }
+
+
+def _existing(conn, role, usernames, chunk=500):
+    """Subset of usernames already present for role."""
+    found = set()
+    for i in range(0, len(usernames), chunk):
+        part = usernames[i:i + chunk]
+        found.update(u for (u,) in conn.execute(
+            f"SELECT username FROM users WHERE role = ? AND username IN ({','.join('?' * len(part))})", (role, *part)
+        ))
+    return found
+
+
+def list_users(role, db=USERS_DB):
+    """{username: {"created": ...}} for a role; password material is never returned."""
+    rows = _connect(db).execute("SELECT username, created FROM users WHERE role = ? ORDER BY username", (role,))
+    return {username: {"created": created} for username, created in rows}
+
+
+def delete_user(role, username, db=USERS_DB):
+    conn = _connect(db)
+    with conn:
+        conn.execute("DELETE FROM users WHERE role = ? AND username = ?", (role, username))
+    _forget((db, role, username))
+
+
+def migrate_json_users(db=USERS_DB, roles=ROLES):
+    """
+    Import the old plaintext {role}s.json / {role}_users.json files once, hashing each
+    password, then delete them so no plaintext credentials stay on disk.
+    """
+    conn = sqlite3.connect(db, timeout=30)
+    try:
+        for role in roles:
+            for file in (f"{role}s.json", f"{role}_users.json"):
+                if not os.path.exists(file):
+                    continue
+                try:
+                    with open(file, "r") as f:
+                        users = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                rows = []
+                for username, entry in users.items():
+                    password = entry.get("password") if isinstance(entry, dict) else entry
+                    if isinstance(password, str):
+                        salt, digest = hash_password(password)
+                        rows.append((role, username, salt, digest, HASH_ITERATIONS, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO users (role, username, salt, hash, iterations, created) VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(role, username) DO NOTHING",
+                        rows,
+                    )
+                try:
+                    os.remove(file)
+                except OSError:
+                    pass
+    finally:
+        conn.close()
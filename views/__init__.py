@@ -0,0 +1,48 @@
+import importlib
+
+# ---------------- Page registry ----------------
+# Sidebar menu entry -> module in views/ with a render() function. A page module (and the
+# heavy libraries it imports, e.g. pandas or altair) is only imported the first time the
+# page is opened; after that Python's module cache makes it free on every rerun.
+# "Login/Register" is handled by views.login for every role.
+PAGES = {
+    "Teacher": {
+        "Upload Lessons": "views.teacher.upload_lessons",
+        "Post Announcement": "views.teacher.post_announcement",
+        "Create Custom Quiz": "views.teacher.create_quiz",
+        "Manage Quiz": "views.teacher.manage_quiz",
+        "View Quiz Results": "views.teacher.quiz_results",
+        "Manage Announcements": "views.teacher.manage_announcements",
+        "View Parent Messages": "views.teacher.parent_messages",
+        "Upload Class Roster": "views.teacher.class_roster",
+        "Mark Attendance": "views.teacher.mark_attendance",
+        "View Attendance Report": "views.teacher.attendance_report",
+        "Reset App Data": "views.teacher.reset",
+    },
+    "Student": {
+        "View Announcements": "views.student.announcements",
+        "View Lessons": "views.student.lessons",
+        "Generate Local Quiz": "views.student.local_quiz",
+        "Take Assigned Quiz": "views.student.assigned_quiz",
+        "Completed Lessons": "views.student.completed",
+    },
+    "Parent": {
+        "View Progress Dashboard": "views.parent.progress",
+        "Activity Timeline": "views.parent.timeline",
+        "Curriculum Overview": "views.parent.curriculum",
+        "Notifications & Alerts": "views.parent.notifications",
+        "Communication Tools": "views.parent.communication",
+        "Goal Setting & Rewards": "views.parent.goals",
+        "Parental Controls": "views.parent.controls",
+        "Analytics & Insights": "views.parent.insights",
+    },
+}
+
+
+def menu(role):
+    """Sidebar menu entries of a role, in display order."""
+    return ["Login/Register"] + list(PAGES[role])
+
+
+def render(role, page):
+    importlib.import_module(PAGES[role][page]).render()
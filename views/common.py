@@ -0,0 +1,223 @@
+import streamlit as st
+
+import activity_log
+import data_store
+import lesson_progress
+import user_directory
+from feed import get_feed
+
+# Shared by the page modules in views/. pandas and the attendance/results stores are
+# imported inside the helpers that need them, so pages that don't use them never load them.
+
+# ---------------- Attendance helpers & config ----------------
+RETENTION_DAYS = 31  # keep approximately 1 month (31 days)
+ROSTER_FILE = "class_roster.csv"
+PARENT_CSV = "parent_student_map.csv"
+PARENT_JSON = "parent_student_mapping.json"
+PARENT_SUFFIX = "_parent"  # placeholder parent account created for each provisioned student
+
+def cleanup_attendance(retention_days=RETENTION_DAYS):
+    """Drop whole day partitions older than retention_days (no rewrite of recent data)."""
+    import attendance_store
+
+    attendance_store.drop_expired(retention_days)
+
+def append_attendance_records(records):
+    """Upsert list of dict records [{'Date': 'YYYY-MM-DD', 'Student': 'Name', 'Status': 'Present'}] by (date, student)."""
+    if not records:
+        return
+    import attendance_store
+
+    attendance_store.upsert_records(records)
+    activity_log.emit_many({"student_name": r["Student"], "activity": f"Attendance marked {r['Status']} for {str(r['Date'])[:10]}",
+                            "kind": "attendance", "date": str(r["Date"])[:10], "status": r["Status"]} for r in records)
+    # retention only ever removes whole old partitions
+    cleanup_attendance()
+
+def save_attendance_changes(date_str, desired):
+    """
+    Upsert only the students whose desired status differs from what is already saved for
+    date_str ({student: status}). Returns the number of records sent to the store.
+    """
+    import attendance_store
+
+    saved = attendance_store.read_day(date_str)
+    records = [{"Date": date_str, "Student": s, "Status": v} for s, v in desired.items() if saved.get(s) != v]
+    append_attendance_records(records)
+    return len(records)
+
+def load_attendance_df(start=None, end=None, students=None):
+    import attendance_store
+
+    return attendance_store.load_df(start, end, students)
+
+def get_parent_student_mapping():
+    """
+    Returns a dict mapping parent_username -> student_name.
+    Checks CSV first (PARENT_CSV), then JSON fallback.
+    """
+    mapping = {}
+    try:
+        df = data_store.read_csv(PARENT_CSV, dtype=str)
+        if df is not None and "parent_username" in df.columns and "student_name" in df.columns:
+            mapping = dict(zip(df["parent_username"].astype(str), df["student_name"].astype(str)))
+            return mapping
+    except Exception:
+        pass
+    try:
+        mapping = data_store.read_json(PARENT_JSON, {}, mutable=True)
+    except Exception:
+        mapping = {}
+    return mapping
+
+def save_parent_student_mapping(mapping):
+    """
+    Save mapping to JSON and CSV (overwrite CSV with current mapping).
+    mapping: dict parent_username -> student_name
+    """
+    import pandas as pd
+
+    # Save JSON
+    data_store.write_json(PARENT_JSON, mapping)
+    # Save CSV
+    try:
+        df = pd.DataFrame(list(mapping.items()), columns=["parent_username", "student_name"])
+        data_store.write_csv(PARENT_CSV, df)
+    except Exception:
+        pass
+
+def save_roster_from_upload(uploaded_file):
+    """
+    Accepts a file-like object from Streamlit uploader and writes to ROSTER_FILE.
+    Expected columns: Student OR at least first column is student name.
+    """
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(uploaded_file)
+    except Exception:
+        # try reading as simple newline list
+        uploaded_file.seek(0)
+        txt = uploaded_file.read().decode("utf-8")
+        lines = [ln.strip() for ln in txt.splitlines() if ln.strip()]
+        df = pd.DataFrame({"Student": lines})
+    # Normalize column name
+    if "Student" not in df.columns:
+        df.columns = [str(c).strip() for c in df.columns]
+        df.rename(columns={df.columns[0]: "Student"}, inplace=True)
+    df = df[["Student"]].dropna()
+    df["Student"] = df["Student"].astype(str).str.strip()
+    data_store.write_csv(ROSTER_FILE, df)
+
+def provision_accounts(students, passwords=None, with_parents=True):
+    """
+    Bulk-create student accounts (and placeholder parent accounts linked to them) in one
+    batch per role. Returns (credentials DataFrame, errors DataFrame, stats dict).
+    """
+    import pandas as pd
+
+    passwords = passwords or {}
+    students = [str(s or "").strip() for s in students]  # as provision_users() will store them
+    result = user_directory.provision_users("student", [(s, passwords.get(s)) for s in students])
+    creds = [("student", u, p, "") for u, p in result["created"]]
+    errors = [("student", row, u, reason) for row, u, reason in result["errors"]]
+    total_seconds, total_created = result["seconds"], len(result["created"])
+    if with_parents and result["created"]:
+        linked = [u for u, _ in result["created"]]
+        parents = user_directory.provision_users("parent", [f"{u}{PARENT_SUFFIX}" for u in linked])
+        mapping = get_parent_student_mapping()
+        for username, password in parents["created"]:
+            student = username[:-len(PARENT_SUFFIX)]
+            mapping.setdefault(username, student)
+            creds.append(("parent", username, password, student))
+        save_parent_student_mapping(mapping)
+        errors += [("parent", row, u, reason) for row, u, reason in parents["errors"]]
+        total_seconds += parents["seconds"]
+        total_created += len(parents["created"])
+    stats = {
+        "created": total_created,
+        "errors": len(errors),
+        "seconds": total_seconds,
+        "per_second": total_created / total_seconds if total_seconds else 0.0,
+    }
+    return (
+        pd.DataFrame(creds, columns=["Role", "Username", "Initial Password", "Linked Student"]),
+        pd.DataFrame(errors, columns=["Role", "Row", "Username", "Error"]),
+        stats,
+    )
+
+def mark_lesson_done(student, lesson):
+    """Record a completed lesson; returns False (and records nothing) if it was already done."""
+    if not lesson_progress.mark_done(student, lesson):
+        return False
+    activity_log.emit(student, f"Completed lesson: {lesson}", kind="lesson_done", lesson=lesson)
+    return True
+
+def completed_lessons(student):
+    """One student's completed lessons, decoded from their completion bitset."""
+    import pandas as pd
+
+    return pd.DataFrame({"Completed Lessons": lesson_progress.completed(student)})
+
+def completion_caption(student):
+    """'X of Y lessons completed (Z%)' against the current lesson catalog, or None without lessons."""
+    done, total = lesson_progress.completion(student)
+    return f"{done} of {total} lessons completed ({100 * done / total:.0f}%)" if total else None
+
+def save_quiz_result(kind, result):
+    """Hand a result to the shared writer and wait until it is durable. Returns True when saved."""
+    import result_writer
+
+    try:
+        saved = result_writer.write_result(kind, result)
+        if saved:
+            activity_log.emit(result["student"], f"Submitted quiz: {result['quiz']} ({result['correct']}/{result['total']})",
+                              kind="quiz_submitted", results=kind, quiz=result["quiz"], correct=result["correct"], total=result["total"])
+        return saved
+    except result_writer.WriterBusy:
+        st.warning("⏳ Many quizzes are being submitted right now, please submit again in a moment.")
+    except Exception as e:
+        st.error(f"Could not save your result: {str(e)}")
+    return False
+
+def announcements_feed():
+    return get_feed("announcements", legacy_json="announcements.json")
+
+def messages_feed():
+    return get_feed("parent_messages", legacy_json="parent_teacher_messages.json")
+
+def feed_page(feed, key, page_size=20):
+    """
+    Current page of a feed for this session, newest first, with Newer/Older buttons.
+    The session keeps a stack of cursors so paging never re-reads older posts.
+    """
+    cursors = st.session_state.setdefault(f"{key}_cursors", [None])
+    items, next_cursor = feed.page(cursors[-1], page_size)
+    if not items and len(cursors) > 1:
+        # The page emptied under us (deletes); fall back to the newest posts
+        cursors[:] = [None]
+        items, next_cursor = feed.page(None, page_size)
+    c1, c2, c3 = st.columns([1, 2, 1])
+    if c1.button("‹ Newer", key=f"{key}_newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    c2.caption(f"Page {len(cursors)}")
+    if c3.button("Older ›", key=f"{key}_older", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+    return items
+
+def load_roster():
+    """Return list of student names from roster if it exists, else empty list."""
+    try:
+        df = data_store.read_csv(ROSTER_FILE, dtype=str)
+        if df is None:
+            return []
+        if "Student" in df.columns:
+            return [s.strip() for s in df["Student"].dropna().astype(str).tolist()]
+        else:
+            # fallback: use first column
+            first_col = df.columns[0]
+            return [s.strip() for s in df[first_col].dropna().astype(str).tolist()]
+    except Exception:
+        return []
@@ -0,0 +1,57 @@
+import streamlit as st
+
+from auth import login_user, register_user
+from views.common import get_parent_student_mapping, save_parent_student_mapping
+
+HEADINGS = {
+    "teacher": "🧑‍🏫 Teacher Login/Register",
+    "student": "🧑‍🎓 Student Login/Register",
+    "parent": "👨‍👩‍👧‍👦 Parent Login/Register",
+}
+
+
+def _link(parent_username, student_username):
+    mapping = get_parent_student_mapping()
+    mapping[parent_username] = student_username
+    save_parent_student_mapping(mapping)
+    st.session_state.linked_student = student_username
+    st.success(f"✅ Successfully linked to student: {student_username}")
+
+
+def render(role):
+    st.markdown(f"<h2 style='text-align:center;'>{HEADINGS[role]}</h2>", unsafe_allow_html=True)
+    mode = st.radio("Choose:", ["Login", "Register"], key=f"{role}_mode")
+    if role != "parent":
+        if mode == "Login":
+            login_user(role)
+        else:
+            register_user(role)
+    elif mode == "Login":
+        login_user("parent")
+        if st.session_state.get("parent_logged_in"):
+            mapping = get_parent_student_mapping()
+            parent_username = st.session_state.get("parent_username")
+            if parent_username in mapping:
+                st.session_state.linked_student = mapping[parent_username]
+                st.success(f"✅ Linked to student: {st.session_state.linked_student}")
+            else:
+                link_student()
+    else:
+        # Register flow: ask for child's username to link at registration time
+        student_username = st.text_input("Enter your child's username to link:")
+        if student_username:
+            register_user("parent")
+            if st.session_state.get("parent_logged_in"):
+                _link(st.session_state.get("parent_username"), student_username)
+        else:
+            st.warning("Please enter your child's username to register.")
+
+
+def link_student():
+    """Form linking the logged-in parent to a student account."""
+    student_username = st.text_input("Enter your child's username to link:")
+    if st.button("Link Student"):
+        if student_username:
+            _link(st.session_state.get("parent_username"), student_username)
+        else:
+            st.warning("Please enter a valid student username.")
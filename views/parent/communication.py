@@ -0,0 +1,18 @@
+from datetime import datetime
+
+import streamlit as st
+
+from views.common import messages_feed
+
+
+def render():
+    st.subheader("🗣️ Communicate with Teachers")
+    message = st.text_area("Write a message to the teacher:")
+    if st.button("Send Message"):
+        msg_log = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "student_name": st.session_state.linked_student,
+            "message": message.strip()
+        }
+        messages_feed().post(msg_log)
+        st.success("✅ Message sent to teacher.")
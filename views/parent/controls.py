@@ -0,0 +1,20 @@
+from datetime import datetime
+
+import streamlit as st
+
+import data_store
+
+
+def render():
+    st.subheader(f"🔒 Parental Controls for {st.session_state.linked_student}")
+    max_screen_time = st.slider("Set maximum screen time per day (minutes)", 0, 300, 60)
+    restricted_access = st.text_area("Restricted content keywords (comma separated):")
+    if st.button("Save Parental Controls"):
+        controls = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "student_name": st.session_state.linked_student,
+            "max_screen_time": max_screen_time,
+            "restricted_keywords": [kw.strip() for kw in restricted_access.split(",")]
+        }
+        data_store.write_json("parental_controls.json", controls)
+        st.success("✅ Parental controls saved.")
@@ -0,0 +1,15 @@
+import streamlit as st
+
+
+def render():
+    st.subheader("📚 Curriculum Overview")
+    curriculum = {
+        "Subjects": ["Mathematics", "Science", "History", "Languages"],
+        "Learning Goals": [
+            "Understand basic algebra",
+            "Learn fundamentals of physics",
+            "Explore major historical events",
+            "Improve language comprehension"
+        ]
+    }
+    st.table(curriculum)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import streamlit as st
+
+import data_store
+
+
+def render():
+    st.subheader(f"🎯 Set Learning Goals & Rewards for {st.session_state.linked_student}")
+    goal = st.text_input("Set a learning goal for your child:")
+    reward = st.text_input("Define a reward for goal achievement:")
+    if st.button("Save Goal & Reward"):
+        goal_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "student_name": st.session_state.linked_student,
+            "goal": goal.strip(),
+            "reward": reward.strip()
+        }
+        goals = data_store.read_json("parent_goals.json", [], mutable=True)
+        goals.append(goal_data)
+        data_store.write_json("parent_goals.json", goals)
+        st.success("✅ Goal and reward saved.")
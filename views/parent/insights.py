@@ -0,0 +1,24 @@
+import streamlit as st
+
+import lesson_progress
+import quiz_results_store
+
+
+def render():
+    st.subheader(f"📈 AI-driven Insights for {st.session_state.linked_student}")
+    if any(quiz_results_store.has_results(k) for k in quiz_results_store.partitions()):
+        total_correct, total_quizzes = quiz_results_store.student_totals(st.session_state.linked_student)
+        if total_quizzes > 0:
+            performance = (total_correct / total_quizzes) * 100
+            st.info(f"Based on performance trends, {st.session_state.linked_student} has a {performance:.2f}% correct answer rate in quizzes.")
+        else:
+            st.info("No quiz performance data available.")
+        # Distinct lessons of the current catalog, so repeat clicks and removed lessons don't count
+        lesson_count, total_lessons = lesson_progress.completion(st.session_state.linked_student)
+        if total_lessons:
+            if lesson_count < 3:
+                st.info(f"{st.session_state.linked_student} has completed {lesson_count} of {total_lessons} lessons and may need encouragement to complete more.")
+            else:
+                st.info(f"{st.session_state.linked_student} is doing well with {lesson_count} of {total_lessons} lessons completed.")
+    else:
+        st.info("No performance data available for insights.")                                                      
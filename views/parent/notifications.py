@@ -0,0 +1,15 @@
+import streamlit as st
+
+import alerts
+
+
+def render():
+    st.subheader("📩 Notifications & Alerts")
+    # Only activity logged since the last evaluation is read (see alerts.py)
+    alerts.evaluate()
+    student_notifications = alerts.student_alerts(st.session_state.linked_student)
+    if student_notifications:
+        for note in student_notifications:
+            st.warning(f"{note['timestamp']}: {note['message']}")
+    else:
+        st.info("No notifications available for this student.")
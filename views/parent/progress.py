@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+import attendance_store
+import quiz_catalog
+import quiz_results_store
+from views.common import RETENTION_DAYS, completed_lessons, completion_caption
+
+
+def render():
+    st.subheader(f"📊 {st.session_state.linked_student}'s Progress Dashboard")
+    # Existing progress and quiz displays
+    student_progress = completed_lessons(st.session_state.linked_student)
+    if not student_progress.empty:
+        caption = completion_caption(st.session_state.linked_student)
+        if caption:
+            st.caption(caption)
+        st.dataframe(student_progress)
+    else:
+        st.info("No progress data available for this student.")
+    if quiz_results_store.has_results(quiz_results_store.LOCAL):
+        student_quiz_df = quiz_results_store.student_results(quiz_results_store.LOCAL, st.session_state.linked_student)
+        if not student_quiz_df.empty:
+            st.markdown("### 📝 Local Quiz Scores")
+            st.dataframe(quiz_results_store.display_frame(student_quiz_df, quiz_results_store.LOCAL))
+        else:
+            st.info("No local quiz results available for this student.")
+    else:
+        st.info("No quiz results available.")
+    assigned_kinds = quiz_catalog.result_kinds()
+    if assigned_kinds:
+        student_custom_quiz_df = pd.concat(
+            [quiz_results_store.display_frame(quiz_results_store.student_results(k, st.session_state.linked_student), k)
+             for k in assigned_kinds], ignore_index=True
+        ).sort_values("Date", kind="stable")
+        if not student_custom_quiz_df.empty:
+            st.markdown("### 🧪 Assigned Quiz Scores")
+            st.dataframe(student_custom_quiz_df, hide_index=True)
+        else:
+            st.info("No assigned quiz results available for this student.")
+    else:
+        st.info("No assigned quiz results available.")
+
+    # Parent Attendance: Full date-wise attendance table (Option B)
+    st.subheader("📅 Full Attendance (last 31 days)")
+    if attendance_store.has_data():
+        att_matrix = attendance_store.matrix()
+        today = datetime.today().date()
+        student_att = att_matrix.student_records(st.session_state.linked_student, today - timedelta(days=RETENTION_DAYS - 1), today)
+        if student_att.empty:
+            st.info("No attendance data available for this student in the last 31 days.")
+        else:
+            # sort descending by date
+            student_att = student_att.sort_values(by="Date", ascending=False).reset_index(drop=True)
+            # display table
+            st.dataframe(student_att[["Date", "Status"]])
+            # show pie chart summary
+            counts = student_att["Status"].value_counts().reset_index()
+            counts.columns = ["Status", "Count"]
+            pie_chart = alt.Chart(counts).mark_arc().encode(
+                theta=alt.Theta(field="Count", type="quantitative"),
+                color=alt.Color(field="Status", type="nominal"),
+                tooltip=['Status', 'Count']
+            ).properties(title="Attendance distribution (last 31 days)")
+            st.altair_chart(pie_chart, use_container_width=True)
+            # allow download of student's attendance
+            csv = student_att.to_csv(index=False).encode("utf-8")
+            st.download_button(
+                label="⬇️ Download student's attendance (CSV)",
+                data=csv,
+                file_name=f"{st.session_state.linked_student}_attendance_last31days.csv",
+                mime="text/csv"
+            )
+    else:
+        st.info("No attendance data available.")
@@ -0,0 +1,16 @@
+import streamlit as st
+
+import activity_log
+from views.common import feed_page
+
+
+def render():
+    student = st.session_state.linked_student
+    st.subheader(f"🕒 {student}'s Learning Activity Timeline")
+    # Pages come from the student's own event index, newest first
+    logs = feed_page(activity_log.StudentTimeline(student), f"timeline_{student}")
+    if logs:
+        for log in logs:
+            st.info(f"{log['timestamp']}: {log['activity']}")
+    else:
+        st.info("No activity logs available for this student.")
@@ -0,0 +1,13 @@
+import streamlit as st
+
+from views.common import announcements_feed, feed_page
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📢 Announcements</h2>", unsafe_allow_html=True)
+    feed = announcements_feed()
+    if not feed.is_empty():
+        for ann in feed_page(feed, "student_ann"):
+            st.info(f"📅 {ann['timestamp']}\n\n{ann['message']}")
+    else:
+        st.info("No announcements yet.")
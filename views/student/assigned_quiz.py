@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import streamlit as st
+
+import grading
+import quiz_catalog
+from views.common import save_quiz_result
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>🧪 Take Teacher Quiz</h2>", unsafe_allow_html=True)
+    # The list comes from the catalog index; questions are loaded for the chosen quiz only
+    open_quizzes = quiz_catalog.list_quizzes(open_only=True)
+    sections = sorted({q["section"] for q in open_quizzes if q.get("section")})
+    if sections:
+        section = st.selectbox("Section", ["All"] + sections)
+        if section != "All":
+            open_quizzes = [q for q in open_quizzes if q.get("section") in ("", section)]
+    entries = {q["id"]: q for q in open_quizzes}
+    labels = {q["id"]: f"{q['title']} ({q['n_questions']} questions" + (f", closes {q['closes']})" if q.get("closes") else ")")
+              for q in open_quizzes}
+    quiz_id = st.selectbox("Choose a quiz", list(labels), format_func=labels.get) if labels else None
+    questions = quiz_catalog.get_questions(quiz_id) if quiz_id else None
+    if questions:
+        quiz_data = {"title": entries[quiz_id]["title"], "questions": questions}
+        if st.session_state.get("student_quiz_id") != quiz_id:
+            st.session_state.student_quiz_id = quiz_id
+            st.session_state.student_answers = {}
+            st.session_state.student_quiz_submitted = False
+        if "student_answers" not in st.session_state:
+            st.session_state.student_answers = {}
+        for i, q in enumerate(quiz_data["questions"]):
+            index = (
+                q["options"].index(st.session_state.student_answers[i])
+                if i in st.session_state.student_answers and st.session_state.student_answers[i] in q["options"]
+                else 0
+            )
+            selected = st.radio(
+                f"Q{i+1}. {q['question']}", q["options"], index=index, key=f"custom_q_{quiz_id}_{i}",
+                disabled=st.session_state.get("student_quiz_submitted", False)
+            )
+            st.session_state.student_answers[i] = selected
+        if st.button("✅ Submit Quiz"):
+            answers = grading.encode_answers(quiz_data["questions"], st.session_state.student_answers)
+            correct = grading.grade(answers, grading.answer_key(quiz_data["questions"])[0])[0]
+            total = len(quiz_data["questions"])
+            st.success(f"🎯 You scored {correct}/{total}")
+            result = {
+                "student": st.session_state.get("student_username", "Anonymous"),
+                "quiz": quiz_data["title"],
+                "correct": int(correct),
+                "total": total,
+                "timestamp": datetime.now().replace(microsecond=0),
+                "answers": answers,
+            }
+            if save_quiz_result(quiz_catalog.results_kind(quiz_id), result):
+                st.session_state.student_quiz_submitted = True
+                st.success("✅ Submitted to teacher!")
+                del st.session_state.student_answers
+    else:
+        st.info("No assigned quiz available.")
@@ -0,0 +1,16 @@
+import streamlit as st
+
+from views.common import completed_lessons, completion_caption
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📈 Completed Lessons</h2>", unsafe_allow_html=True)
+    student = st.session_state.get("student_username", "Anonymous")
+    student_progress = completed_lessons(student)
+    if not student_progress.empty:
+        caption = completion_caption(student)
+        if caption:
+            st.caption(caption)
+        st.dataframe(student_progress)
+    else:
+        st.info("No completed lessons yet.")
@@ -0,0 +1,63 @@
+import html
+import os
+
+import streamlit as st
+
+import activity_log
+import lesson_catalog
+import lesson_progress
+from lesson_index import ensure_synced, search
+from lesson_server import lesson_cache, lesson_url
+from views.common import mark_lesson_done
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📚 View Lessons</h2>", unsafe_allow_html=True)
+    files = lesson_catalog.names()
+    if not files:
+        st.info("No lessons available.")
+    else:
+        ensure_synced()
+        query = st.text_input("🔎 Search lessons (use \"quotes\" for phrases):").strip()
+        page_hint = {}
+        if query:
+            results = search(query)
+            if results:
+                st.markdown(f"**{len(results)} matching lesson(s)**")
+                for r in results:
+                    pages = ", ".join(str(p["page"]) for p in r["pages"][:10])
+                    st.markdown(f"- **{r['lesson']}** — pages {pages}")
+                    if r["pages"][0]["snippet"]:
+                        st.caption(f"p.{r['pages'][0]['page']}: …{r['pages'][0]['snippet']}…")
+                    page_hint[r["lesson"]] = r["pages"][0]["page"]
+                files = [r["lesson"] for r in results]
+            else:
+                st.info("No lessons match your search.")
+        selected_file = st.selectbox("Select a file:", files)
+        path = lesson_catalog.path(selected_file)
+        if path is None or not os.path.exists(path):
+            # Replaced or reset since the list above was read
+            st.warning("This lesson is no longer available.")
+            return
+        student = st.session_state.get('student_username', 'Anonymous')
+        # One event per lesson opened, not one per rerun while it stays open
+        if st.session_state.get("viewed_lesson") != selected_file:
+            st.session_state.viewed_lesson = selected_file
+            activity_log.emit(student, f"Viewed lesson: {selected_file}", kind="lesson_viewed", lesson=selected_file)
+        if path.endswith(".txt"):
+            with open(path, "r", encoding="utf-8") as f:
+                st.text_area("Lesson Content", f.read(), height=300)
+        else:
+            # Point the viewer at the lesson server instead of inlining the whole PDF on every rerun
+            headers = getattr(getattr(st, "context", None), "headers", None) or {}
+            pdf_src = lesson_url(os.path.basename(path), headers.get("Host"))
+            if pdf_src is None:
+                pdf_src = f"data:application/pdf;base64,{lesson_cache.get_base64(path)}"
+            elif selected_file in page_hint:
+                pdf_src += f"#page={page_hint[selected_file]}"
+            st.markdown(f'<embed src="{html.escape(pdf_src)}" type="application/pdf" width="100%" height="700px"/>', unsafe_allow_html=True)
+        if lesson_progress.is_done(student, selected_file):
+            st.success("✅ You have completed this lesson.")
+        elif st.button("✅ Mark as Done"):
+            mark_lesson_done(student, selected_file)
+            st.success("Lesson marked as done.")
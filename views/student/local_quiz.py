@@ -0,0 +1,88 @@
+import os
+from datetime import datetime
+
+import streamlit as st
+
+import activity_log
+from distractor_index import get_index as get_distractor_index
+import lesson_catalog
+from pdf_text import extract_async
+from quiz_generator import generate_ranked_quiz
+import quiz_results_store
+from views.common import save_quiz_result
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>🧠 Generate Quiz From Text</h2>", unsafe_allow_html=True)
+    source = st.radio("Quiz source", ["Paste text", "From a lesson"], horizontal=True)
+    text_input = ""
+    lesson_name = "Pasted Content"
+    if source == "Paste text":
+        text_input = st.text_area("Paste your lesson text here:")
+    else:
+        files = lesson_catalog.names()
+        if not files:
+            st.info("No lessons available.")
+        else:
+            lesson_name = st.selectbox("Select a lesson:", files)
+            path = lesson_catalog.path(lesson_name)
+            # Extraction runs in a background process pool; the script only polls it
+            extraction = extract_async(path) if path is not None and os.path.exists(path) else None
+            if extraction is None:
+                # Replaced or reset since the list above was read
+                st.error("This lesson is no longer available.")
+            elif not extraction.done():
+                st.info("⏳ Extracting lesson text in the background, this may take a moment for long modules.")
+                st.button("🔄 Refresh")
+            elif extraction.exception():
+                st.error(f"Could not read lesson text: {extraction.exception()}")
+            else:
+                pages = extraction.result()
+                if len(pages) > 1:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        first_page = st.number_input("From page", 1, len(pages), 1)
+                    with col2:
+                        last_page = st.number_input("To page", 1, len(pages), len(pages))
+                else:
+                    first_page, last_page = 1, len(pages)
+                # Pages are streamed into the generator; the lesson is never joined into one string
+                text_input = pages[int(first_page) - 1:int(last_page)]
+    num_questions = st.number_input("Number of questions", 1, 50, 5)
+    if st.button("Generate Quiz"):
+        if not any(chunk.strip() for chunk in ([text_input] if isinstance(text_input, str) else text_input)):
+            st.warning("Please enter content.")
+        else:
+            # Corpus-wide distractors once the index for the current lessons is ready
+            st.session_state.quiz = generate_ranked_quiz(text_input, int(num_questions), distractors=get_distractor_index())
+            st.session_state.quiz_lesson = lesson_name
+            st.session_state.quiz_submitted = False
+            st.session_state.quiz_result_saved = False
+            st.session_state.selected_options = {}
+            activity_log.emit(st.session_state.get("student_username", "Anonymous"), f"Generated a quiz from {lesson_name}",
+                              kind="quiz_generated", lesson=lesson_name, questions=len(st.session_state.quiz))
+    if st.session_state.get("quiz"):
+        st.subheader("📝 Quiz Time")
+        for i, item in enumerate(st.session_state.quiz):
+            selected = st.radio(f"Q{i+1}. {item['question']}", item['options'], key=f"q_{i}",
+                                disabled=st.session_state.get("quiz_submitted", False))
+            st.session_state.selected_options[i] = selected
+        if not st.session_state.get("quiz_submitted", False):
+            if st.button("Submit Answers"):
+                st.session_state.quiz_submitted = True
+        if st.session_state.get("quiz_submitted", False):
+            correct = sum(st.session_state.selected_options[i] == item["answer"]
+                          for i, item in enumerate(st.session_state.quiz))
+
+            st.success(f"🎯 You scored {correct}/{len(st.session_state.quiz)}")
+            result = {
+                "student": st.session_state.get("student_username", "Anonymous"),
+                "quiz": st.session_state.get("quiz_lesson", "Pasted Content"),
+                "correct": int(correct),
+                "total": len(st.session_state.quiz),
+                "timestamp": datetime.now().replace(microsecond=0),
+            }
+            # Save once per submission, not on every rerun that shows the score
+            if st.session_state.get("quiz_result_saved") or save_quiz_result(quiz_results_store.LOCAL, result):
+                st.session_state.quiz_result_saved = True
+                st.success("✅ Your result has been saved!")
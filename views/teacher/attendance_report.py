@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+import attendance_store
+from views.common import cleanup_attendance
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📊 Attendance Report</h2>", unsafe_allow_html=True)
+    # Retention cleanup only drops expired partitions, so it is cheap to run here
+    cleanup_attendance()
+
+    if attendance_store.has_data():
+        # Default date range -> last 30 days
+        today = datetime.today().date()
+        default_start = today - timedelta(days=29)
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("Start date", default_start)
+        with col2:
+            end_date = st.date_input("End date", today)
+
+        # Student filter
+        student_filter = st.text_input("Filter by student name (partial match):").strip()
+
+        # Status filter
+        status_options = st.multiselect("Status (choose to filter)", ["Present", "Absent"], default=["Present", "Absent"])
+
+        # Validate date range
+        if start_date > end_date:
+            st.error("Start date must be before or equal to End date.")
+        else:
+            # Range queries run on the packed student x day matrix, not on the CSV partitions
+            att_matrix = attendance_store.matrix()
+            student_mask = None
+            if student_filter:
+                # case-insensitive partial match over the student list only
+                student_mask = pd.Series(att_matrix.students, dtype=str).str.contains(student_filter, case=False, regex=False).to_numpy()
+            df_filtered = att_matrix.records(start_date, end_date, student_mask, status_options) if status_options else None
+
+            if df_filtered is None or df_filtered.empty:
+                st.info("No attendance records match the selected filters.")
+            else:
+                # show summary counts
+                counts = df_filtered["Status"].value_counts().reset_index()
+                counts.columns = ["Status", "Count"]
+
+                # Pie chart
+                pie_chart = alt.Chart(counts).mark_arc().encode(
+                    theta=alt.Theta(field="Count", type="quantitative"),
+                    color=alt.Color(field="Status", type="nominal"),
+                    tooltip=['Status', 'Count']
+                ).properties(
+                    title=f"Attendance from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+                )
+                st.altair_chart(pie_chart, use_container_width=True)
+
+                # show table (sorted)
+                df_display = df_filtered.sort_values(by=["Date", "Student"], ascending=[False, True])
+                st.dataframe(df_display.reset_index(drop=True))
+
+                # Latest attendance per student (if requested)
+                if st.checkbox("Show latest attendance status per student"):
+                    latest = att_matrix.summary(start_date, end_date, student_mask)
+                    st.markdown("### Latest status and attendance % per student (within selected range)")
+                    st.dataframe(latest.rename(columns={"Latest Date": "Date", "Latest Status": "Status"}))
+
+                # Download filtered CSV
+                csv = df_display.to_csv(index=False).encode("utf-8")
+                st.download_button(
+                    label="⬇️ Download filtered results as CSV",
+                    data=csv,
+                    file_name=f"attendance_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
+    else:
+        st.info("No attendance data available.")
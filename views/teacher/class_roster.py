@@ -0,0 +1,63 @@
+import pandas as pd
+import streamlit as st
+
+from views.common import PARENT_SUFFIX, save_roster_from_upload, provision_accounts, load_roster
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📥 Upload Class Roster</h2>", unsafe_allow_html=True)
+    st.info("Upload a CSV with a column named `Student` (or with student names in the first column).")
+    roster_file = st.file_uploader("Upload roster CSV", type=["csv"])
+    if roster_file:
+        try:
+            save_roster_from_upload(roster_file)
+            st.success("✅ Roster uploaded and saved.")
+        except Exception as e:
+            st.error(f"Upload failed: {str(e)}")
+    # Show current roster if exists
+    roster = load_roster()
+    if roster:
+        st.markdown("### Current Roster (first 200 shown)")
+        st.dataframe(pd.DataFrame({"Student": roster[:200]}))
+    else:
+        st.info("No roster uploaded yet. Teachers can still mark attendance manually.")
+
+    st.markdown("### 👥 Create Student Accounts")
+    st.caption("Creates an account with a generated initial password for every student that doesn't have one yet. "
+               "Use the current roster, or a CSV with a `Student` column and an optional `Password` column.")
+    accounts_file = st.file_uploader("Accounts CSV (optional, defaults to the current roster)", type=["csv"], key="accounts_csv")
+    with_parents = st.checkbox(f"Also create a linked parent account for each student (`<student>{PARENT_SUFFIX}`)", value=True)
+    if st.button("Create Accounts"):
+        students, passwords = roster, {}
+        if accounts_file:
+            try:
+                acc_df = pd.read_csv(accounts_file, dtype=str)
+                name_col = "Student" if "Student" in acc_df.columns else acc_df.columns[0]
+                # Stripped once, so a name's password is found under the username it gets
+                names = acc_df[name_col].fillna("").str.strip()
+                students = names.tolist()
+                if "Password" in acc_df.columns:
+                    passwords = dict(zip(names, acc_df["Password"].fillna("")))
+            except Exception as e:
+                st.error(f"Could not read accounts CSV: {str(e)}")
+                students = []
+        if not students:
+            st.warning("No students to create accounts for.")
+        else:
+            with st.spinner(f"Creating accounts for {len(students)} students..."):
+                creds_df, errors_df, stats = provision_accounts(students, passwords, with_parents)
+            st.session_state.provisioned = (creds_df.to_csv(index=False), errors_df, stats)
+    if st.session_state.get("provisioned"):
+        creds_csv, errors_df, stats = st.session_state.provisioned
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Accounts created", stats["created"])
+        c2.metric("Rows with errors", stats["errors"])
+        c3.metric("Throughput", f"{stats['per_second']:.0f}/s", f"{stats['seconds']:.2f}s total", delta_color="off")
+        st.download_button("⬇️ Download initial credentials (CSV)", creds_csv,
+                           file_name="initial_credentials.csv", mime="text/csv")
+        st.warning("This is the only time the generated passwords are shown. Share them securely.")
+        if not errors_df.empty:
+            st.markdown("#### Error summary")
+            st.dataframe(errors_df.groupby(["Role", "Error"]).size().reset_index(name="Rows"))
+            with st.expander("Rows with errors"):
+                st.dataframe(errors_df)
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+import quiz_catalog
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>🧑‍🏫 Create Custom Quiz</h2>", unsafe_allow_html=True)
+    quiz_title = st.text_input("Quiz Title")
+    if "teacher_custom_quiz" not in st.session_state:
+        st.session_state.teacher_custom_quiz = []
+    c1, c2 = st.columns(2)
+    quiz_section = c1.text_input("Section (optional)", help="e.g. 10-A; students can filter the quiz list by section")
+    set_window = c2.checkbox("Limit availability window")
+    opens = closes = None
+    if set_window:
+        w1, w2, w3, w4 = st.columns(4)
+        opens = datetime.combine(w1.date_input("Opens on", datetime.today()), w2.time_input("at", datetime.now().replace(second=0, microsecond=0).time()))
+        closes = datetime.combine(w3.date_input("Closes on", datetime.today() + timedelta(days=7)), w4.time_input("at ", datetime.strptime("23:59", "%H:%M").time()))
+    with st.form("custom_quiz_form"):
+        q = st.text_input("Enter a question")
+        o1, o2, o3 = st.text_input("Option 1"), st.text_input("Option 2"), st.text_input("Option 3")
+        ans = st.selectbox("Correct Answer", [o1, o2, o3])
+        add_question = st.form_submit_button("➕ Add Question")
+        if add_question and all([q, o1, o2, o3, ans]):
+            st.session_state.teacher_custom_quiz.append({"question": q, "options": [o1, o2, o3], "answer": ans})
+            st.success("✅ Question added!")
+    if st.session_state.teacher_custom_quiz:
+        st.markdown("### Preview Questions")
+        for i, q in enumerate(st.session_state.teacher_custom_quiz):
+            st.markdown(f"**Q{i+1}: {q['question']}**")
+            st.markdown(f"Options: {', '.join(q['options'])} | ✅ Answer: {q['answer']}")
+        if st.button("📢 Publish Quiz to Students"):
+            if not quiz_title.strip():
+                st.warning("Please enter a quiz title.")
+            elif opens and closes and closes <= opens:
+                st.warning("The closing time must be after the opening time.")
+            else:
+                quiz_catalog.create_quiz(quiz_title.strip(), st.session_state.teacher_custom_quiz,
+                                         section=quiz_section.strip(), opens=opens, closes=closes)
+                st.success("✅ Quiz published!")
+                st.session_state.teacher_custom_quiz = []
@@ -0,0 +1,18 @@
+import streamlit as st
+
+from views.common import announcements_feed, feed_page
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>🗑️ Manage Announcements</h2>", unsafe_allow_html=True)
+    feed = announcements_feed()
+    if not feed.is_empty():
+        for ann in feed_page(feed, "manage_ann"):
+            with st.expander(f"📅 {ann['timestamp']}"):
+                st.markdown(ann["message"])
+                if st.button("❌ Delete", key=f"del_ann_{ann['id']}"):
+                    feed.delete(ann["id"])
+                    st.success("Deleted.")
+                    st.rerun()
+    else:
+        st.info("No announcements found.")
@@ -0,0 +1,21 @@
+import pandas as pd
+import streamlit as st
+
+import quiz_catalog
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>🗑️ Manage Published Quizzes</h2>", unsafe_allow_html=True)
+    quizzes = quiz_catalog.list_quizzes()
+    if quizzes:
+        catalog_df = pd.DataFrame(quizzes)
+        catalog_df["status"] = ["Open" if quiz_catalog.is_open(q) else "Closed" for q in quizzes]
+        st.dataframe(catalog_df[["title", "section", "n_questions", "opens", "closes", "status", "created"]], hide_index=True)
+        labels = {q["id"]: f"{q['title']} ({q['section'] or 'all sections'}, {q['created']})" for q in quizzes}
+        to_delete = st.selectbox("Quiz", list(labels), format_func=labels.get)
+        if st.button("❌ Delete Quiz"):
+            quiz_catalog.delete_quiz(to_delete)
+            st.success("🗑️ Quiz deleted. Its results are kept.")
+            st.rerun()
+    else:
+        st.info("No quizzes published yet.")
@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+import attendance_store
+from views.common import append_attendance_records, save_attendance_changes, load_roster
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📅 Mark Student Attendance</h2>", unsafe_allow_html=True)
+    st.info("You can either use the uploaded roster (recommended) or paste names manually (comma/newline).")
+    roster = load_roster()
+    col1, col2 = st.columns([2,1])
+    with col1:
+        attendance_date = st.date_input("Select Date", datetime.today())
+        st.write("Select marking mode:")
+        mode = st.radio("Mode", ["Roster grid (bulk edit)", "Roster (checkboxes)", "Manual entry (comma/newline)"])
+        status_default = st.radio("Default status for unmarked/selected", ["Present", "Absent"])
+    with col2:
+        st.write("Quick actions")
+        if st.button("Mark All Present (roster)"):
+            # quick action only if roster exists
+            if roster:
+                date_str = attendance_date.strftime("%Y-%m-%d")
+                records = [{"Date": date_str, "Student": s, "Status": "Present"} for s in roster]
+                append_attendance_records(records)
+                st.success(f"✅ Marked {len(records)} students as Present for {date_str}")
+            else:
+                st.warning("No roster available to mark all present.")
+        if st.button("Mark All Absent (roster)"):
+            if roster:
+                date_str = attendance_date.strftime("%Y-%m-%d")
+                records = [{"Date": date_str, "Student": s, "Status": "Absent"} for s in roster]
+                append_attendance_records(records)
+                st.success(f"✅ Marked {len(records)} students as Absent for {date_str}")
+            else:
+                st.warning("No roster available to mark all absent.")
+
+    if mode == "Roster grid (bulk edit)":
+        if not roster:
+            st.info("No roster uploaded. Please upload a roster first or switch to manual entry.")
+        else:
+            date_str = attendance_date.strftime("%Y-%m-%d")
+            if st.session_state.get("att_flash"):
+                st.success(st.session_state.pop("att_flash"))
+            saved = attendance_store.read_day(date_str)
+            # Edits not yet saved, per date; the grid itself only round-trips on form submit
+            pending = st.session_state.setdefault("att_pending", {}).setdefault(date_str, {})
+            current = {s: pending.get(s, saved.get(s, status_default)) for s in roster}
+            unsaved = sum(1 for s, v in current.items() if saved.get(s) != v)
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Present", sum(v == "Present" for v in current.values()))
+            m2.metric("Absent", sum(v == "Absent" for v in current.values()))
+            m3.metric("Unsaved changes", unsaved)
+            query = st.text_input("🔍 Filter students", key="att_grid_filter",
+                                  help="Ticks not yet applied or saved are dropped when the filter changes.").strip().lower()
+            view = [s for s in roster if query in s.lower()] if query else roster
+            grid = pd.DataFrame(
+                {"Student": view, "Present": [current[s] == "Present" for s in view]},
+                index=pd.RangeIndex(1, len(view) + 1, name="Row"),
+            )
+            version = st.session_state.setdefault("att_grid_version", 0)
+            with st.form("att_grid_form"):
+                # Editor deltas are row positions, so a different filter gets a fresh editor
+                # rather than applying unsubmitted toggles to whichever students now sit in those rows
+                edited = st.data_editor(
+                    grid, key=f"att_grid_{date_str}_{version}_{query}", disabled=["Student"],
+                    height=420, width="stretch",
+                )
+                r1, r2, r3 = st.columns(3)
+                first_row = r1.number_input("From row", min_value=1, max_value=max(len(view), 1), value=1)
+                last_row = r2.number_input("To row", min_value=1, max_value=max(len(view), 1), value=max(len(view), 1))
+                range_status = r3.selectbox("Set rows to", ["Present", "Absent"])
+                b1, b2 = st.columns(2)
+                apply_range = b1.form_submit_button("↕️ Apply to row range")
+                save_grid = b2.form_submit_button("✅ Save changes")
+            if apply_range or save_grid:
+                # Only rows the user actually toggled come back as differences
+                toggled = edited[edited["Present"] != grid["Present"]]
+                for student, present in zip(toggled["Student"], toggled["Present"]):
+                    pending[student] = "Present" if present else "Absent"
+                if apply_range:
+                    for student in view[int(first_row) - 1:int(last_row)]:
+                        pending[student] = range_status
+                else:
+                    current.update(pending)
+                    n = save_attendance_changes(date_str, current)
+                    pending.clear()
+                    st.session_state.att_flash = f"✅ Saved {n} changed record(s) for {date_str}"
+                st.session_state.att_grid_version = version + 1
+                st.rerun()
+
+    elif mode == "Roster (checkboxes)":
+        if not roster:
+            st.info("No roster uploaded. Please upload a roster first or switch to manual entry.")
+        else:
+            st.markdown("### Select students who are PRESENT (unselected will be marked as Absent if you choose so)")
+            present_selection = {}
+            # Show checklist in columns to avoid long single column
+            cols = st.columns(4)
+            for i, student in enumerate(roster):
+                c = cols[i % 4]
+                present_selection[student] = c.checkbox(student, value=(status_default=="Present"), key=f"pres_{i}")
+            if st.button("✅ Save Roster Attendance"):
+                date_str = attendance_date.strftime("%Y-%m-%d")
+                # Build records: if checkbox True -> Present else -> Absent
+                records = []
+                for student, present in present_selection.items():
+                    st_status = "Present" if present else "Absent"
+                    records.append({"Date": date_str, "Student": student, "Status": st_status})
+                append_attendance_records(records)
+                st.success(f"✅ Saved attendance for {len(records)} students on {date_str}")
+
+    else:  # Manual entry
+        students_input = st.text_area("Enter Student Name(s) (comma or newline separated):", height=150)
+        status = st.radio("Attendance Status for entered names", ["Present", "Absent"], index=0 if status_default=="Present" else 1)
+        if st.button("✅ Mark Manual Attendance"):
+            names = []
+            for chunk in str(students_input).splitlines():
+                for name in chunk.split(","):
+                    n = name.strip()
+                    if n:
+                        names.append(n)
+            if not names:
+                st.warning("Please enter at least one student name.")
+            else:
+                date_str = attendance_date.strftime("%Y-%m-%d")
+                records = [{"Date": date_str, "Student": n, "Status": status} for n in names]
+                append_attendance_records(records)
+                st.success(f"✅ Attendance marked for {len(names)} student(s) on {date_str} as {status}.")
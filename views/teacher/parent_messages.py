@@ -0,0 +1,18 @@
+import streamlit as st
+
+from views.common import messages_feed, feed_page
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📩 Messages from Parents</h2>", unsafe_allow_html=True)
+    feed = messages_feed()
+    if not feed.is_empty():
+        for msg in feed_page(feed, "parent_msgs"):
+            with st.expander(f"📅 {msg['timestamp']} (Student: {msg['student_name']})"):
+                st.markdown(msg["message"])
+                if st.button("❌ Delete", key=f"del_msg_{msg['id']}"):
+                    feed.delete(msg["id"])
+                    st.success("Deleted.")
+                    st.rerun()
+    else:
+        st.info("No messages from parents found.")
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+import streamlit as st
+
+from views.common import announcements_feed
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📢 Post Announcement</h2>", unsafe_allow_html=True)
+    announcement = st.text_area("Enter your message:")
+    if st.button("📬 Post Announcement"):
+        # A single append: concurrent posts from several teachers are all kept
+        announcements_feed().post({"message": announcement.strip(), "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+        st.success("✅ Announcement posted!")
+        st.rerun()
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import streamlit as st
+
+import grading
+import quiz_catalog
+import quiz_results_store
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📊 Quiz Results from Students</h2>", unsafe_allow_html=True)
+    # Only the selected quiz's partition is read
+    choices = {quiz_catalog.results_kind(q["id"]): f"{q['title']} ({q['section'] or 'all sections'}, {q['created']})"
+               for q in quiz_catalog.list_quizzes()}
+    if quiz_results_store.has_results(quiz_results_store.CUSTOM):
+        choices[quiz_results_store.CUSTOM] = "Earlier results (before multiple quizzes)"
+    kind = st.selectbox("Quiz", list(choices), format_func=choices.get) if choices else None
+    if kind and quiz_results_store.has_results(kind):
+        since = None
+        # Older results live in compressed archive segments that this term's view never opens
+        if quiz_results_store.has_archive(kind):
+            period = st.radio("Period", ["This term", "All history"], horizontal=True)
+            if period == "This term":
+                since = quiz_results_store.hot_since()
+        results_df = quiz_results_store.read(kind, since=since)
+        st.dataframe(quiz_results_store.display_frame(results_df, kind))
+        st.download_button("⬇️ Download results (CSV)", quiz_results_store.to_csv(kind, since=since),
+                           file_name=f"{kind}_results.csv", mime="text/csv")
+        quiz_id = kind[len("quiz-"):] if kind.startswith("quiz-") else None
+        questions = quiz_catalog.get_questions(quiz_id) if quiz_id else None
+        if questions:
+            key, n_options = grading.answer_key(questions)
+            rows, responses = grading.response_matrix(kind, len(questions))
+            st.markdown("### 📈 Item Analysis")
+            if len(rows):
+                st.caption(f"{len(rows)} submission(s) with recorded answers. Difficulty is the share answering "
+                           "correctly; discrimination compares the top and bottom 27% of scorers.")
+                st.dataframe(grading.item_statistics(responses, key, n_options), hide_index=True)
+            else:
+                st.info("No submissions with recorded answers yet.")
+            with st.expander("🔑 Fix answer key and re-grade"):
+                with st.form(f"answer_key_{quiz_id}"):
+                    fixed = []
+                    for i, q in enumerate(questions):
+                        answer = st.selectbox(f"Q{i+1}. {q['question']}", q["options"],
+                                              index=q["options"].index(q["answer"]) if q["answer"] in q["options"] else 0)
+                        fixed.append({**q, "answer": answer})
+                    if st.form_submit_button("💾 Save key & re-grade"):
+                        started = datetime.now()
+                        quiz_catalog.update_questions(quiz_id, fixed)
+                        changed = grading.regrade(kind, fixed)
+                        elapsed = (datetime.now() - started).total_seconds() * 1000
+                        st.success(f"✅ Re-graded {len(rows)} submission(s) in {elapsed:.0f} ms; {changed} score(s) changed.")
+    else:
+        st.info("No results yet.")
@@ -0,0 +1,32 @@
+import shutil
+
+import streamlit as st
+
+import activity_log
+import alerts
+import attendance_store
+import data_store
+import lesson_catalog
+from lesson_index import sync_async
+import lesson_progress
+import quiz_catalog
+import quiz_results_store
+from views.common import PARENT_CSV, PARENT_JSON, ROSTER_FILE, messages_feed
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>⚠️ Reset App Data</h2>", unsafe_allow_html=True)
+    if st.button("Reset Everything"):
+        lesson_catalog.clear()
+        shutil.rmtree(attendance_store.ATT_DIR, ignore_errors=True)
+        quiz_results_store.clear(quiz_results_store.LOCAL)
+        lesson_progress.clear()
+        quiz_catalog.clear()
+        for file in ["lesson_metadata.json", PARENT_CSV, PARENT_JSON, "parent_teacher_messages.json", attendance_store.LEGACY_ATT_FILE, ROSTER_FILE]:
+            data_store.remove(file)
+        messages_feed().clear()
+        activity_log.clear()
+        alerts.clear()
+        # Drop the removed lessons from the search index
+        sync_async()
+        st.success("✅ All data cleared!")
@@ -0,0 +1,34 @@
+import streamlit as st
+
+from distractor_index import get_index as get_distractor_index
+import lesson_catalog
+
+
+def render():
+    st.markdown("<h2 style='text-align:center;'>📤 Upload Lesson Notes</h2>", unsafe_allow_html=True)
+    uploaded_files = st.file_uploader("Upload PDF or Text Files", type=["pdf", "txt"], accept_multiple_files=True)
+    # The uploader keeps its files across reruns; each one is stored once per session
+    stored = st.session_state.setdefault("stored_uploads", {})  # file_id -> display name
+    new_content = False
+    for uploaded_file in uploaded_files or []:
+        if uploaded_file.file_id in stored:
+            continue
+        # Chunked copy into content-addressed storage; extraction and indexing run in the background
+        _, duplicate = lesson_catalog.store(uploaded_file, uploaded_file.name)
+        stored[uploaded_file.file_id] = uploaded_file.name
+        if duplicate:
+            st.info(f"♻️ {uploaded_file.name} has the same content as an existing lesson and is stored only once.")
+        else:
+            new_content = True
+            st.success(f"✅ Uploaded: {uploaded_file.name}")
+    if new_content:
+        get_distractor_index()
+
+    uploads = list(dict.fromkeys(stored.values()))
+    if uploads:
+        rows = lesson_catalog.status(uploads)
+        done = sum(row["Status"] == "ready" or row["Status"].startswith("failed") for row in rows)
+        st.progress(done / len(rows) if rows else 1.0, text=f"Processed {done} of {len(rows)} upload(s)")
+        st.dataframe(rows, hide_index=True)
+        if done < len(rows):
+            st.button("🔄 Refresh")